@@ -0,0 +1,262 @@
+"""
+Stage 1 Backtest — Walk-Forward NTI Replay
+
+Replays NTI synthesis over a long local price history. The history
+is loaded once (from the persistent PriceCache) and walked forward
+day by day; every date's NTI reproduces what runner.main would have
+computed on that date's trailing analysis window, without
+re-ingesting or recomputing windows from scratch.
+
+Incremental state:
+- Per-asset observation counts over the trailing window come from
+  one prefix sum over the whole history (O(1) per date)
+- Regime validity (5d / 20d / 60d) follows directly from those counts
+- The topology correlation matrix is a RollingCorrelation over the
+  window's return rows, updated in O(N²) per date
+
+Each NTI resolution bucket holds a single regime window, so the
+multi-resolution agreement gate reduces to regime validity; asset
+levels and penalties are therefore computed for all dates at once.
+
+Topology is built over assets observed on every date of the window.
+This is exact whenever the eligible universe is fully populated over
+the window; with ragged listings the live run drops dates instead.
+
+NLP history is not replayed: a single NLP result (default: the
+deterministic run_nlp_analysis output) gates every date.
+
+Usage:
+    python -m stage1.backtest [--tickers AAA,BBB] [--out backtest.csv]
+"""
+
+from typing import Dict, List, Optional, Sequence
+import argparse
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from stage1.ingestion.price_cache import PriceCache
+from stage1.ingestion.price_panel import PricePanel
+from stage1.nlp.nlp_engine import run_nlp_analysis
+from stage1.quant.correlation_breakdown import RollingCorrelation
+from stage1.quant.quant_engine import WINDOWS
+from stage1.quant.topology import TOPOLOGY_THRESHOLD
+from stage1.synthesis.nti import THRESHOLDS_CONFIG, nti_scores, trigger_level
+from utils.io import load_yaml_config
+from utils.math import run_length
+
+LOGGER = logging.getLogger("stage1-backtest")
+
+# Trading days in the live ANALYSIS_PERIOD ("6mo")
+BACKTEST_LOOKBACK = 126
+
+# compute_nti penalty weights
+_PENALTY_BUCKET = 0.5
+_PENALTY_INCOHERENT = 1.0
+_PENALTY_MISSING = 2.0
+
+
+def load_history(
+    tickers: Optional[Sequence[str]] = None,
+    cache: Optional[PriceCache] = None,
+) -> PricePanel:
+    """
+    Full cached close history as one panel (loaded once).
+
+    Args:
+        tickers: Tickers to load (default: every cached ticker)
+        cache: Price store (default: PriceCache())
+    """
+    cache = cache or PriceCache()
+    if tickers is None:
+        tickers = sorted(p.stem for p in cache.root.glob("*.close"))
+
+    closes = {}
+    for ticker in tickers:
+        series = cache.load(ticker)
+        if series is not None and len(series):
+            closes[ticker] = series
+
+    if not closes:
+        raise RuntimeError("Backtest found no cached price history")
+
+    return PricePanel.from_series(closes)
+
+
+def _window_counts(mask: np.ndarray, lookback: int) -> np.ndarray:
+    """
+    (T, N) observations per asset in the trailing `lookback` rows
+    ending at each date.
+    """
+    prefix = np.vstack([np.zeros((1, mask.shape[1]), dtype=np.int64), np.cumsum(mask, axis=0)])
+    ends = np.arange(1, len(mask) + 1)
+    starts = np.maximum(ends - lookback, 0)
+    return prefix[ends] - prefix[starts]
+
+
+def _asset_levels(
+    counts: np.ndarray,
+    has_nlp: np.ndarray,
+    coherent: np.ndarray,
+    windows: List[int],
+) -> Dict[str, np.ndarray]:
+    """
+    Per-date resolution levels and penalties (compute_nti's per-asset
+    loop, evaluated for every date at once).
+    """
+    eligible = counts >= max(windows)
+    return_counts = np.maximum(counts - 1, 0)
+
+    scored = eligible & has_nlp & coherent
+    levels = {}
+    penalties = np.zeros(len(counts))
+
+    for bucket, w in zip(("short", "medium", "long"), sorted(windows)):
+        valid = return_counts >= w
+        levels[bucket] = (scored & valid).sum(axis=1).astype(np.float64)
+        penalties += _PENALTY_BUCKET * (scored & ~valid).sum(axis=1)
+
+    penalties += _PENALTY_INCOHERENT * (eligible & has_nlp & ~coherent).sum(axis=1)
+    penalties += _PENALTY_MISSING * (eligible & ~has_nlp).sum(axis=1)
+
+    levels["penalties"] = penalties
+    return levels
+
+
+def _topology_bonus(
+    panel: PricePanel,
+    counts: np.ndarray,
+    lookback: int,
+    windows: List[int],
+    threshold: float,
+) -> np.ndarray:
+    """
+    Per-date topology bonus: assets linked to at least one other asset
+    with |corr| > threshold (the total size of all clusters).
+    """
+    returns = np.nan_to_num(panel.returns())
+    T, N = returns.shape
+
+    rolling = RollingCorrelation(N, max(lookback - 1, 1))
+    bonus = np.zeros(T)
+
+    for t in range(T):
+        if t > 0:
+            rolling.update(returns[t])
+
+        length = min(t + 1, lookback)
+        eligible = counts[t] >= max(windows)
+        complete = eligible & (counts[t] == length)
+        if length < 3 or complete.sum() < 2 or eligible.sum() < 2:
+            continue
+
+        idx = np.nonzero(complete)[0]
+        corr = rolling.matrix()[np.ix_(idx, idx)]
+        np.fill_diagonal(corr, 0.0)
+
+        # A node with any edge belongs to a component of size >= 2
+        linked = (np.abs(corr) > threshold).any(axis=1)
+        bonus[t] = float(linked.sum())
+
+    return bonus
+
+
+def run_backtest(
+    panel: PricePanel,
+    nlp_results: Optional[Dict] = None,
+    lookback: int = BACKTEST_LOOKBACK,
+    windows: List[int] = WINDOWS,
+    threshold: float = TOPOLOGY_THRESHOLD,
+    required_persistence: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Walk forward over every date of the panel.
+
+    Args:
+        panel: Full price history
+        nlp_results: run_nlp_analysis-shaped result gating every date
+        lookback: Trailing analysis window in rows (live: 6 months)
+        windows: Regime windows
+        threshold: Topology edge threshold
+        required_persistence: Consecutive trigger dates for "persistent"
+            (default: nt_thresholds.yaml required_persistence)
+
+    Returns:
+        DataFrame indexed by date with nti, nti_short, nti_medium,
+        nti_long, delta, delta2, confidence, trigger,
+        cross_asset_coherent, penalized, persistence, persistent
+    """
+    if required_persistence is None:
+        required_persistence = int(
+            load_yaml_config(THRESHOLDS_CONFIG)["required_persistence"]
+        )
+
+    if nlp_results is None:
+        nlp_results = run_nlp_analysis([{"ticker": t} for t in panel.tickers])
+
+    started = time.perf_counter()
+
+    nlp = nlp_results["per_asset"]
+    has_nlp = np.array([t in nlp for t in panel.tickers])
+    coherent = np.array([bool(nlp.get(t, {}).get("coherent")) for t in panel.tickers])
+
+    counts = _window_counts(panel.mask, lookback)
+    levels = _asset_levels(counts, has_nlp, coherent, windows)
+    bonus = _topology_bonus(panel, counts, lookback, windows, threshold)
+
+    scores = nti_scores(
+        levels["short"],
+        levels["medium"],
+        levels["long"],
+        levels["penalties"],
+        bonus,
+        trigger_level(),
+    )
+
+    trigger = np.asarray(scores["trigger"], dtype=bool)
+    persistence = run_length(trigger)
+
+    frame = pd.DataFrame(
+        {
+            key: np.round(np.asarray(scores[key], dtype=np.float64), 4)
+            for key in (
+                "nti", "nti_short", "nti_medium", "nti_long",
+                "delta", "delta2", "confidence",
+            )
+        },
+        index=pd.Index(panel.dates, name="date"),
+    )
+    frame["trigger"] = trigger
+    frame["cross_asset_coherent"] = np.asarray(scores["cross_asset_coherent"], dtype=bool)
+    frame["penalized"] = np.asarray(scores["penalized"], dtype=bool)
+    frame["persistence"] = persistence
+    frame["persistent"] = persistence >= required_persistence
+
+    elapsed = time.perf_counter() - started
+    LOGGER.info(
+        "Backtested %d dates x %d assets in %.2fs",
+        len(panel.dates),
+        len(panel),
+        elapsed,
+    )
+    return frame
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="stage1.backtest")
+    parser.add_argument("--tickers", help="Comma-separated tickers (default: all cached)")
+    parser.add_argument("--lookback", type=int, default=BACKTEST_LOOKBACK)
+    parser.add_argument("--out", default="backtest.csv")
+    args = parser.parse_args(argv)
+
+    tickers = args.tickers.split(",") if args.tickers else None
+    frame = run_backtest(load_history(tickers), lookback=args.lookback)
+    frame.to_csv(args.out)
+    LOGGER.info("Wrote %s", args.out)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,211 @@
+"""
+Stage 1 DAG Executor — Concurrent Independent Stages
+
+A small dependency-graph executor for the Stage 1 runner. Each stage
+declares the named results it consumes; a stage is submitted as soon
+as its inputs exist, so independent stages overlap (e.g. NLP runs
+while the network-bound price download is in flight).
+
+Stages run on a thread pool (I/O-bound or GIL-releasing NumPy work)
+or a process pool (GIL-bound Python work; the function, inputs and
+result must be picklable). Failures are never swallowed: the first
+stage error cancels pending stages and is re-raised.
+
+Every run records per-stage start/end times and the critical path:
+the dependency chain with the largest summed stage duration, which
+bounds the wall time no amount of concurrency can remove.
+"""
+
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import multiprocessing
+import time
+
+THREAD = "thread"
+PROCESS = "process"
+
+
+def _timed(fn: Callable[..., Any], args: Tuple) -> Tuple[Any, float, float]:
+    """
+    Run one stage and stamp it (perf_counter is system-wide monotonic,
+    so stamps from worker processes are comparable).
+    """
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, start, time.perf_counter()
+
+
+class Stage:
+    """
+    One node of the graph.
+
+    Attributes:
+        name: Result name
+        fn: Callable receiving the input results positionally
+        inputs: Names of the results consumed
+        kind: "thread" or "process"
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        inputs: Sequence[str] = (),
+        kind: str = THREAD,
+    ):
+        if kind not in (THREAD, PROCESS):
+            raise ValueError(f"Unknown stage kind for {name}: {kind}")
+        self.name = name
+        self.fn = fn
+        self.inputs = list(inputs)
+        self.kind = kind
+
+
+class StageGraph:
+    """
+    Dependency graph of stages with a concurrent executor.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Stage] = {}
+
+    def add(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        inputs: Sequence[str] = (),
+        kind: str = THREAD,
+    ) -> "StageGraph":
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        self.stages[name] = Stage(name, fn, inputs, kind)
+        return self
+
+    # -------------------------
+    # Validation
+    # -------------------------
+
+    def order(self, provided: Sequence[str] = ()) -> List[str]:
+        """
+        Topological order of the stages.
+
+        Raises:
+            ValueError on unknown inputs or cycles
+        """
+        known = set(provided) | set(self.stages)
+        for stage in self.stages.values():
+            missing = [i for i in stage.inputs if i not in known]
+            if missing:
+                raise ValueError(f"Stage {stage.name} has unknown inputs: {missing}")
+
+        done = set(provided)
+        order: List[str] = []
+        pending = list(self.stages)
+        while pending:
+            ready = [n for n in pending if all(i in done for i in self.stages[n].inputs)]
+            if not ready:
+                raise ValueError(f"Stage graph has a cycle among: {pending}")
+            order.extend(ready)
+            done.update(ready)
+            pending = [n for n in pending if n not in done]
+        return order
+
+    # -------------------------
+    # Execution
+    # -------------------------
+
+    def run(
+        self,
+        provided: Optional[Dict[str, Any]] = None,
+        max_workers: Optional[int] = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Execute every stage, overlapping those whose inputs are ready.
+
+        Args:
+            provided: Initial named results (e.g. the universe)
+            max_workers: Pool size per executor kind (default: stage count)
+
+        Returns:
+            (results by name, report {stages, critical_path, critical_path_s, wall_s})
+        """
+        results: Dict[str, Any] = dict(provided or {})
+        self.order(list(results))
+
+        workers = max_workers or max(len(self.stages), 1)
+        pools: Dict[str, Any] = {THREAD: ThreadPoolExecutor(workers)}
+        if any(s.kind == PROCESS for s in self.stages.values()):
+            # spawn: forking while thread stages run can deadlock
+            pools[PROCESS] = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+
+        stamps: Dict[str, Tuple[float, float]] = {}
+        running: Dict[Future, str] = {}
+        waiting = dict(self.stages)
+        origin = time.perf_counter()
+
+        try:
+            while waiting or running:
+                for name in [n for n, s in waiting.items() if all(i in results for i in s.inputs)]:
+                    stage = waiting.pop(name)
+                    args = tuple(results[i] for i in stage.inputs)
+                    running[pools[stage.kind].submit(_timed, stage.fn, args)] = name
+
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    results[name], start, end = future.result()
+                    stamps[name] = (start, end)
+        finally:
+            for future in running:
+                future.cancel()
+            for pool in pools.values():
+                pool.shutdown(wait=True, cancel_futures=True)
+
+        wall = time.perf_counter() - origin
+        return results, self._report(stamps, origin, wall)
+
+    def _report(
+        self,
+        stamps: Dict[str, Tuple[float, float]],
+        origin: float,
+        wall: float,
+    ) -> Dict[str, Any]:
+        """
+        Stage timings and the critical path (longest duration chain).
+        """
+        durations = {n: end - start for n, (start, end) in stamps.items()}
+
+        finish: Dict[str, float] = {}
+        via: Dict[str, Optional[str]] = {}
+        for name in self.order([i for s in self.stages.values() for i in s.inputs if i not in self.stages]):
+            parents = [i for i in self.stages[name].inputs if i in self.stages]
+            before = max(parents, key=finish.__getitem__, default=None)
+            via[name] = before
+            finish[name] = durations[name] + (finish[before] if before else 0.0)
+
+        path: List[str] = []
+        node = max(finish, key=finish.__getitem__, default=None)
+        while node is not None:
+            path.append(node)
+            node = via[node]
+
+        return {
+            "stages": {
+                n: {
+                    "kind": self.stages[n].kind,
+                    "start_s": round(start - origin, 4),
+                    "end_s": round(end - origin, 4),
+                    "duration_s": round(end - start, 4),
+                }
+                for n, (start, end) in stamps.items()
+            },
+            "critical_path": path[::-1],
+            "critical_path_s": round(finish[path[0]], 4) if path else 0.0,
+            "wall_s": round(wall, 4),
+        }
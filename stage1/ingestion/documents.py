@@ -0,0 +1,77 @@
+"""
+Document Ingestion — Run Inbox into the Corpus Store
+
+Stage 1 does not fetch headlines itself. The headline source
+(config/nlp.yaml: sources) drops each run's documents as JSON lines
+into the inbox file, one object per document:
+
+    {"id": "...", "timestamp": "2024-01-02T13:30:00Z", "text": "..."}
+
+`id` is optional; stored ids are skipped on re-ingestion. The runner
+links the documents to the universe, appends them to the corpus
+store (near-duplicates collapsed) and passes their texts to NLP.
+
+Canon reference:
+- Deterministic, missing data excluded (no inbox ⇒ no documents)
+"""
+
+from pathlib import Path
+from typing import Dict, List, Sequence, Union
+import json
+import logging
+import os
+
+from stage1.nlp.corpus_store import CorpusStore
+from stage1.nlp.entity_linker import get_linker
+
+LOGGER = logging.getLogger("stage1-documents")
+
+DEFAULT_DOCUMENTS_PATH = os.getenv("FIA_DOCUMENTS", ".cache/nlp/documents.jsonl")
+
+
+def load_documents(path: Union[str, Path] = DEFAULT_DOCUMENTS_PATH) -> List[Dict]:
+    """
+    Documents of the run inbox (empty when there is none).
+
+    Records without text or timestamp are dropped and logged.
+    """
+    path = Path(path)
+    if not path.exists():
+        LOGGER.info("No document inbox at %s", path)
+        return []
+
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if not record.get("text") or not record.get("timestamp"):
+                LOGGER.warning("Dropping document %d of %s: missing text or timestamp", n, path)
+                continue
+            records.append(record)
+    return records
+
+
+def ingest_documents(
+    corpus: CorpusStore,
+    universe: Sequence[Dict[str, str]],
+    records: Sequence[Dict],
+) -> int:
+    """
+    Link records to the universe and append them to the corpus store.
+
+    Returns:
+        Documents written
+    """
+    if not records:
+        return 0
+
+    texts = [r["text"] for r in records]
+    ids = [r.get("id") for r in records]
+    return corpus.append(
+        texts,
+        [r["timestamp"] for r in records],
+        get_linker(universe).link(texts),
+        ids if all(i is not None for i in ids) else None,
+    )
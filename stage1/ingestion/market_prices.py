@@ -4,14 +4,48 @@ Market Price Ingestion
 Loads full price series.
 Never silently drops assets.
 Accepts structured universe entries or raw tickers.
+
+Tickers are fetched in grouped multi-ticker requests (one
+round-trip per batch) and split back into per-ticker records,
+alongside a date-aligned PricePanel of every successful ticker.
 """
 
-from typing import Dict, List, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 import logging
+import time
+
+import numpy as np
+import pandas as pd
 import yfinance as yf
 
+from stage1.ingestion.price_cache import PriceCache
+from stage1.ingestion.price_panel import PricePanel
+
 LOGGER = logging.getLogger("market-ingestion")
 
+DEFAULT_BATCH_SIZE = 50
+
+DOWNLOAD_KWARGS = {
+    "interval": "1d",
+    "progress": False,
+    "auto_adjust": True,
+}
+
+# Analysis lookback handed to the quant layer
+ANALYSIS_PERIOD = "6mo"
+ANALYSIS_LOOKBACK = pd.DateOffset(months=6)
+
+# History seeded into an empty cache entry
+CACHE_SEED_PERIOD = "max"
+
+# Incremental fetches re-read this many calendar days of cached bars
+# to detect re-adjusted history (splits / dividends)
+CACHE_OVERLAP_DAYS = 10
+ADJUSTMENT_RTOL = 1e-5
+
+# "stale": cached history served after its incremental refresh failed
+USABLE_STATUSES = ("ok", "stale")
+
 
 def _extract_ticker(asset: Union[str, dict]) -> str:
     if isinstance(asset, str):
@@ -23,50 +57,297 @@ def _extract_ticker(asset: Union[str, dict]) -> str:
     raise RuntimeError(f"Invalid universe entry: {asset}")
 
 
-def load_market_prices(universe: List[Union[str, dict]]) -> Dict[str, dict]:
-    if not universe:
-        raise RuntimeError("Market ingestion received empty universe")
+def _failed(reason: str) -> dict:
+    return {
+        "status": "failed",
+        "reason": reason,
+        "price_series": None,
+    }
+
+
+def _extract_close(data: pd.DataFrame, ticker: str) -> Optional[pd.Series]:
+    """
+    Locate the Close column for one ticker in a (possibly multi-ticker)
+    download frame. Handles both ticker-major and field-major layouts.
+    """
+    if data is None or data.empty:
+        return None
+
+    columns = data.columns
+
+    if isinstance(columns, pd.MultiIndex):
+        if ticker in columns.get_level_values(0):
+            sub = data[ticker]
+            close = sub["Close"] if "Close" in sub else None
+        elif "Close" in columns.get_level_values(0):
+            sub = data["Close"]
+            close = sub[ticker] if ticker in sub else None
+        else:
+            close = None
+    else:
+        close = data["Close"] if "Close" in data else None
+
+    if isinstance(close, pd.DataFrame):
+        close = close.iloc[:, 0] if close.shape[1] == 1 else None
+
+    return close
 
-    results: Dict[str, dict] = {}
 
-    for asset in universe:
-        ticker = _extract_ticker(asset)
+def _stale(record: dict, reason: str, last_date: pd.Timestamp) -> dict:
+    """
+    Mark a record served from cache after its refresh failed.
+    """
+    if record["status"] == "ok":
+        record.update(status="stale", reason=reason, last_date=last_date.strftime("%Y-%m-%d"))
+    return record
 
+
+def _price_record(close: Optional[pd.Series]) -> dict:
+    if close is None:
+        return _failed("no_price_data")
+
+    close = close.dropna()
+    if close.empty:
+        return _failed("no_price_data")
+
+    return {
+        "status": "ok",
+        "reason": None,
+        "price_series": close.tolist(),
+        "latest_price": float(close.iloc[-1]),
+        "volatility": float(close.pct_change().std()),
+    }
+
+
+def _download_batch(
+    tickers: List[str],
+    downloader: Callable[..., pd.DataFrame],
+    **window,
+) -> Dict[str, Union[pd.Series, str]]:
+    """
+    Fetch one batch in a single request and split it per ticker.
+
+    Returns ticker -> close Series, or ticker -> failure reason.
+    A failed request is bisected and retried, so one bad symbol or
+    transient error costs O(log batch) extra requests instead of the
+    whole batch; only a failing single-ticker request is reported.
+    A missing ticker is reported individually.
+    """
+    try:
+        data = downloader(
+            tickers if len(tickers) > 1 else tickers[0],
+            group_by="ticker",
+            threads=False,
+            **DOWNLOAD_KWARGS,
+            **window,
+        )
+    except Exception as e:
+        if len(tickers) == 1:
+            return {tickers[0]: str(e)}
+
+        LOGGER.warning("Batch of %d failed (%s) — bisecting", len(tickers), e)
+        mid = len(tickers) // 2
+        results = _download_batch(tickers[:mid], downloader, **window)
+        results.update(_download_batch(tickers[mid:], downloader, **window))
+        return results
+
+    results: Dict[str, Union[pd.Series, str]] = {}
+    for ticker in tickers:
         try:
-            data = yf.download(
-                ticker,
-                period="6mo",
-                interval="1d",
-                progress=False,
-                auto_adjust=True,
-            )
-
-            if data.empty or "Close" not in data:
-                results[ticker] = {
-                    "status": "failed",
-                    "reason": "no_price_data",
-                    "price_series": None,
-                }
+            close = _extract_close(data, ticker)
+        except Exception as e:
+            results[ticker] = str(e)
+            continue
+
+        if close is not None:
+            close = close.dropna()
+            if isinstance(close.index, pd.DatetimeIndex) and close.index.tz is not None:
+                close = close.tz_localize(None)
+
+        results[ticker] = close if close is not None and not close.empty else "no_price_data"
+
+    return results
+
+
+def _download(
+    tickers: List[str],
+    downloader: Callable[..., pd.DataFrame],
+    batch_size: int,
+    **window,
+) -> Dict[str, Union[pd.Series, str]]:
+    results: Dict[str, Union[pd.Series, str]] = {}
+    for i in range(0, len(tickers), batch_size):
+        results.update(_download_batch(tickers[i:i + batch_size], downloader, **window))
+    return results
+
+
+def _history_rewritten(cached: pd.Series, fetched: pd.Series) -> bool:
+    """
+    True if fetched bars disagree with cached bars on shared dates.
+    """
+    shared = cached.index.intersection(fetched.index)
+    if shared.empty:
+        return False
+
+    a = cached.loc[shared].to_numpy(dtype=float)
+    b = fetched.loc[shared].to_numpy(dtype=float)
+    return not np.allclose(a, b, rtol=ADJUSTMENT_RTOL, atol=0.0)
+
+
+def _load_through_cache(
+    tickers: List[str],
+    downloader: Callable[..., pd.DataFrame],
+    batch_size: int,
+    cache: PriceCache,
+) -> Tuple[Dict[str, Union[pd.Series, str]], Dict[str, str]]:
+    """
+    Fetch only what the cache is missing, then serve the analysis
+    lookback from cached history.
+
+    Only completed bars (before today, UTC) are persisted; today's
+    possibly-partial bar is served from the fetch and never cached.
+
+    Returns:
+        (ticker -> close Series or failure reason,
+         ticker -> fetch error for tickers served stale from cache)
+    """
+    today = pd.Timestamp.now(tz="UTC").tz_localize(None).normalize()
+    live: Dict[str, pd.Series] = {}
+
+    seed: List[str] = []
+    incremental: Dict[pd.Timestamp, List[str]] = {}
+
+    for ticker in tickers:
+        last = cache.last_date(ticker)
+        if last is None:
+            seed.append(ticker)
+        else:
+            start = last - pd.Timedelta(days=CACHE_OVERLAP_DAYS)
+            incremental.setdefault(start, []).append(ticker)
+
+    failures: Dict[str, str] = {}
+    stale: Dict[str, str] = {}
+
+    for start, group in sorted(incremental.items()):
+        fetched = _download(group, downloader, batch_size, start=start.strftime("%Y-%m-%d"))
+        for ticker, close in fetched.items():
+            if isinstance(close, str):
+                # Stale cache still serves, flagged on the record
+                LOGGER.warning("Incremental fetch failed for %s: %s", ticker, close)
+                stale[ticker] = close
                 continue
 
-            close = data["Close"].dropna()
+            if _history_rewritten(cache.load(ticker), close):
+                LOGGER.info("Adjusted history changed for %s — refetching", ticker)
+                seed.append(ticker)
+                continue
 
-            results[ticker] = {
-                "status": "ok",
-                "reason": None,
-                "price_series": close.tolist(),
-                "latest_price": float(close.iloc[-1]),
-                "volatility": float(close.pct_change().std()),
-            }
+            cache.append(ticker, close[close.index < today])
+            live[ticker] = close[close.index >= today]
+
+    if seed:
+        fetched = _download(seed, downloader, batch_size, period=CACHE_SEED_PERIOD)
+        for ticker, close in fetched.items():
+            if isinstance(close, str):
+                failures[ticker] = close
+            else:
+                cache.replace(ticker, close[close.index < today])
+                live[ticker] = close[close.index >= today]
+
+    results: Dict[str, Union[pd.Series, str]] = {}
+    for ticker in tickers:
+        if ticker in failures:
+            results[ticker] = failures[ticker]
+            continue
+
+        history = cache.load(ticker)
+        if ticker in live and not live[ticker].empty:
+            history = live[ticker] if history is None else pd.concat([history, live[ticker]])
+
+        if history is None:
+            results[ticker] = "no_price_data"
+            continue
+
+        results[ticker] = history[history.index >= history.index[-1] - ANALYSIS_LOOKBACK]
+
+    return results, stale
 
-        except Exception as e:
-            results[ticker] = {
-                "status": "failed",
-                "reason": str(e),
-                "price_series": None,
-            }
+
+def load_market_data(
+    universe: List[Union[str, dict]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    downloader: Optional[Callable[..., pd.DataFrame]] = None,
+    cache: Optional[PriceCache] = None,
+) -> Tuple[Dict[str, dict], PricePanel]:
+    """
+    Load price records and the date-aligned price panel.
+
+    Args:
+        universe: Raw tickers or structured universe entries
+        batch_size: Tickers per download request (1 = one request per ticker)
+        downloader: yf.download-compatible callable (injectable for tests)
+        cache: Optional persistent store; only missing bars are fetched
+
+    Returns:
+        (ticker -> {status, reason, price_series, ...}, PricePanel of ok/stale tickers).
+        Stale records carry the fetch error as reason and the last served
+        bar date as last_date.
+    """
+    if not universe:
+        raise RuntimeError("Market ingestion received empty universe")
+
+    if batch_size < 1:
+        raise RuntimeError(f"Invalid batch size: {batch_size}")
+
+    downloader = downloader or yf.download
+
+    tickers = list(dict.fromkeys(_extract_ticker(a) for a in universe))
+
+    started = time.perf_counter()
+
+    stale: Dict[str, str] = {}
+    if cache is None:
+        closes = _download(tickers, downloader, batch_size, period=ANALYSIS_PERIOD)
+    else:
+        closes, stale = _load_through_cache(tickers, downloader, batch_size, cache)
+
+    results: Dict[str, dict] = {}
+    for ticker in tickers:
+        close = closes[ticker]
+        results[ticker] = _failed(close) if isinstance(close, str) else _price_record(close)
+        if ticker in stale:
+            _stale(results[ticker], stale[ticker], close.index[-1])
+
+    panel = PricePanel.from_series(
+        {t: closes[t] for t in tickers if results[t]["status"] in USABLE_STATUSES}
+    )
+
+    elapsed = time.perf_counter() - started
 
     if not results:
         raise RuntimeError("Market ingestion produced no results")
 
+    failed = sum(1 for r in results.values() if r["status"] == "failed")
+    LOGGER.info(
+        "Ingested %d tickers (%d failed, %d stale) in %.2fs — %.1f tickers/sec",
+        len(results),
+        failed,
+        len(stale),
+        elapsed,
+        len(results) / elapsed if elapsed > 0 else float("inf"),
+    )
+
+    return results, panel
+
+
+def load_market_prices(
+    universe: List[Union[str, dict]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    downloader: Optional[Callable[..., pd.DataFrame]] = None,
+    cache: Optional[PriceCache] = None,
+) -> Dict[str, dict]:
+    """
+    Load per-ticker price records only (see load_market_data).
+    """
+    results, _ = load_market_data(universe, batch_size, downloader, cache)
     return results
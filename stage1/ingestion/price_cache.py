@@ -0,0 +1,138 @@
+"""
+Persistent Price Cache
+
+Append-only, per-ticker daily close store sitting in front of
+market ingestion. Keeps full history on disk so each run only
+fetches the date range it does not already hold.
+
+Layout (one pair of raw little-endian columns per ticker):
+- <TICKER>.dates  int64 days since epoch, strictly increasing
+- <TICKER>.close  float64 auto-adjusted close
+
+Columns are read back through memory maps; new bars are appended.
+A ticker whose auto-adjusted history changed (split / dividend)
+is rewritten in full by the ingestion layer.
+"""
+
+from pathlib import Path
+from typing import Optional
+import os
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CACHE_DIR = os.getenv("FIA_PRICE_CACHE_DIR", ".cache/prices")
+
+_DATE_DTYPE = np.dtype("<i8")
+_CLOSE_DTYPE = np.dtype("<f8")
+
+
+def _to_days(index: pd.Index) -> np.ndarray:
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.values.astype("datetime64[D]").astype(_DATE_DTYPE)
+
+
+class PriceCache:
+    """
+    Local persistent store of daily closes, one column pair per ticker.
+    """
+
+    def __init__(self, root: str = DEFAULT_CACHE_DIR):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    # -------------------------
+    # Paths
+    # -------------------------
+
+    def _paths(self, ticker: str):
+        name = ticker.replace("/", "_")
+        return self.root / f"{name}.dates", self.root / f"{name}.close"
+
+    # -------------------------
+    # Reads
+    # -------------------------
+
+    def _columns(self, ticker: str):
+        dates_path, close_path = self._paths(ticker)
+        if not dates_path.exists() or not close_path.exists():
+            return None, None
+
+        if dates_path.stat().st_size == 0 or close_path.stat().st_size == 0:
+            return None, None
+
+        dates = np.memmap(dates_path, dtype=_DATE_DTYPE, mode="r")
+        close = np.memmap(close_path, dtype=_CLOSE_DTYPE, mode="r")
+
+        # A torn append leaves one column longer; trust the common prefix
+        n = min(len(dates), len(close))
+        return dates[:n], close[:n]
+
+    def last_date(self, ticker: str) -> Optional[pd.Timestamp]:
+        dates, _ = self._columns(ticker)
+        if dates is None:
+            return None
+        return pd.Timestamp(np.datetime64(int(dates[-1]), "D"))
+
+    def load(self, ticker: str) -> Optional[pd.Series]:
+        """
+        Full cached history as a date-indexed Series (None if absent).
+        """
+        dates, close = self._columns(ticker)
+        if dates is None:
+            return None
+
+        index = pd.DatetimeIndex(np.asarray(dates).astype("datetime64[D]"))
+        return pd.Series(np.asarray(close), index=index, name=ticker)
+
+    # -------------------------
+    # Writes
+    # -------------------------
+
+    def append(self, ticker: str, close: pd.Series) -> int:
+        """
+        Append bars strictly newer than the cached history.
+
+        Returns:
+            Number of bars written
+        """
+        close = close.dropna()
+        if close.empty:
+            return 0
+
+        days = _to_days(close.index)
+        values = close.to_numpy(dtype=_CLOSE_DTYPE)
+
+        dates_path, close_path = self._paths(ticker)
+
+        cached_dates, _ = self._columns(ticker)
+        if cached_dates is not None:
+            n = len(cached_dates)
+            keep = days > cached_dates[-1]
+            days, values = days[keep], values[keep]
+            del cached_dates
+
+            # Drop any torn tail before appending
+            os.truncate(dates_path, n * _DATE_DTYPE.itemsize)
+            os.truncate(close_path, n * _CLOSE_DTYPE.itemsize)
+
+        if len(days) == 0:
+            return 0
+
+        with open(close_path, "ab") as f:
+            f.write(values.tobytes())
+        with open(dates_path, "ab") as f:
+            f.write(days.tobytes())
+
+        return len(days)
+
+    def replace(self, ticker: str, close: pd.Series) -> int:
+        """
+        Discard cached history and store the given series in full.
+        """
+        for path in self._paths(ticker):
+            if path.exists():
+                path.unlink()
+        return self.append(ticker, close)
@@ -0,0 +1,229 @@
+"""
+Price Panel — Canonical Stage 1 Price Structure
+
+One contiguous dates × tickers close matrix plus a validity mask,
+built once by ingestion and shared (without copies) by the quant
+engine, the standalone quant modules and NTI synthesis.
+
+Rules:
+- Rows are calendar-aligned trading dates (union across assets)
+- Missing observations are NaN and masked out, never imputed
+- Undated inputs are right-aligned on a positional index
+"""
+
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class PricePanel:
+    """
+    Date-indexed close panel.
+
+    Attributes:
+        dates: (T,) datetime64[D] (or int64 positions for undated input)
+        tickers: Column labels
+        values: (T, N) C-contiguous float array, NaN where missing
+        mask: (T, N) bool, True where a close exists
+    """
+
+    def __init__(
+        self,
+        dates: np.ndarray,
+        tickers: Sequence[str],
+        values: np.ndarray,
+        dtype: type = np.float64,
+    ):
+        values = np.ascontiguousarray(values, dtype=dtype)
+
+        if values.ndim != 2 or values.shape != (len(dates), len(tickers)):
+            raise RuntimeError(
+                f"Panel shape {values.shape} does not match "
+                f"{len(dates)} dates x {len(tickers)} tickers"
+            )
+
+        self.dates = np.asarray(dates)
+        self.tickers: List[str] = list(tickers)
+        self.values = values
+        self.mask = ~np.isnan(values)
+        self._columns = {t: j for j, t in enumerate(self.tickers)}
+
+    # -------------------------
+    # Construction
+    # -------------------------
+
+    @classmethod
+    def from_series(
+        cls,
+        closes: Dict[str, pd.Series],
+        dtype: type = np.float64,
+    ) -> "PricePanel":
+        """
+        Build from date-indexed close Series (one per ticker).
+        """
+        tickers = list(closes)
+        if not tickers:
+            return cls(np.array([], dtype="datetime64[D]"), [], np.empty((0, 0)), dtype)
+
+        days = {
+            t: pd.DatetimeIndex(s.index).values.astype("datetime64[D]")
+            for t, s in closes.items()
+        }
+        dates = np.unique(np.concatenate(list(days.values())))
+
+        values = np.full((len(dates), len(tickers)), np.nan, dtype=dtype)
+        for j, t in enumerate(tickers):
+            rows = np.searchsorted(dates, days[t])
+            values[rows, j] = closes[t].to_numpy(dtype=dtype)
+
+        return cls(dates, tickers, values, dtype)
+
+    @classmethod
+    def from_lists(
+        cls,
+        prices: Dict[str, Sequence[float]],
+        dtype: type = np.float64,
+    ) -> "PricePanel":
+        """
+        Build from undated ordered series, right-aligned on position.
+        """
+        tickers = list(prices)
+        length = max((len(p) for p in prices.values()), default=0)
+
+        values = np.full((length, len(tickers)), np.nan, dtype=dtype)
+        for j, t in enumerate(tickers):
+            series = np.asarray(prices[t], dtype=dtype)
+            if len(series):
+                values[length - len(series):, j] = series
+
+        return cls(np.arange(length, dtype=np.int64), tickers, values, dtype)
+
+    @classmethod
+    def concat(cls, panels: Sequence["PricePanel"]) -> "PricePanel":
+        """
+        Join panels over disjoint tickers on the union of their dates.
+
+        Equivalent to building one panel from all the underlying
+        series at once (the inverse of splitting a universe).
+        """
+        panels = list(panels)
+        tickers = [t for p in panels for t in p.tickers]
+        if len(set(tickers)) != len(tickers):
+            raise RuntimeError("Cannot concatenate panels with overlapping tickers")
+
+        nonempty = [p.dates for p in panels if len(p.dates)]
+        if not nonempty:
+            dtype = panels[0].values.dtype.type if panels else np.float64
+            return cls(np.array([], dtype="datetime64[D]"), tickers, np.empty((0, len(tickers))), dtype)
+
+        dates = np.unique(np.concatenate(nonempty))
+        dtype = np.result_type(*(p.values.dtype for p in panels)).type
+
+        values = np.full((len(dates), len(tickers)), np.nan, dtype=dtype)
+        col = 0
+        for p in panels:
+            rows = np.searchsorted(dates, p.dates)
+            values[rows, col:col + len(p)] = p.values
+            col += len(p)
+
+        return cls(dates, tickers, values, dtype)
+
+    # -------------------------
+    # Access
+    # -------------------------
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def __contains__(self, ticker: str) -> bool:
+        j = self._columns.get(ticker)
+        return j is not None and bool(self.mask[:, j].any())
+
+    def column(self, ticker: str) -> np.ndarray:
+        """
+        Date-aligned view of one ticker's column (NaN where missing).
+        """
+        return self.values[:, self._columns[ticker]]
+
+    def series(self, ticker: str) -> np.ndarray:
+        """
+        Ordered valid closes for one ticker (a view when fully populated).
+        """
+        j = self._columns[ticker]
+        column = self.values[:, j]
+        valid = self.mask[:, j]
+        return column if valid.all() else column[valid]
+
+    def items(self) -> Iterator[Tuple[str, np.ndarray]]:
+        for ticker in self.tickers:
+            yield ticker, self.series(ticker)
+
+    def counts(self) -> np.ndarray:
+        """
+        Valid observations per ticker.
+        """
+        return self.mask.sum(axis=0)
+
+    def subset(self, tickers: Sequence[str]) -> "PricePanel":
+        cols = [self._columns[t] for t in tickers]
+        return PricePanel(self.dates, tickers, self.values[:, cols], self.values.dtype.type)
+
+    # -------------------------
+    # Derived
+    # -------------------------
+
+    def _previous(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Each cell's previous valid close in the same column, and a
+        mask of cells that have both a close and a previous close.
+        """
+        T = self.values.shape[0]
+        rows = np.arange(T)[:, None]
+
+        last = np.maximum.accumulate(np.where(self.mask, rows, -1), axis=0)
+        prev = np.vstack([np.full((1, last.shape[1]), -1), last[:-1]])
+
+        prev_values = np.take_along_axis(self.values, np.maximum(prev, 0), axis=0)
+        return prev_values, self.mask & (prev >= 0)
+
+    def returns(self) -> np.ndarray:
+        """
+        Simple returns on the date grid, each relative to the
+        asset's previous valid close. NaN where undefined.
+        """
+        prev_values, valid = self._previous()
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = self.values / prev_values - 1.0
+
+        return np.where(valid, r, np.nan)
+
+    def log_returns(self) -> np.ndarray:
+        """
+        Log returns on the date grid against the previous valid close.
+        NaN where undefined or where either close is non-positive.
+        """
+        prev_values, valid = self._previous()
+        valid = valid & (self.values > 0) & (prev_values > 0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = np.log(self.values / prev_values)
+
+        return np.where(valid, r, np.nan)
+
+    def describe(self) -> Dict:
+        """
+        Compact JSON-safe summary for debug artifacts.
+        """
+        def _label(value: Optional[np.generic]) -> Optional[str]:
+            return None if value is None else str(value)
+
+        return {
+            "n_dates": int(len(self.dates)),
+            "n_tickers": len(self.tickers),
+            "first_date": _label(self.dates[0] if len(self.dates) else None),
+            "last_date": _label(self.dates[-1] if len(self.dates) else None),
+            "dtype": str(self.values.dtype),
+            "coverage": {t: int(c) for t, c in zip(self.tickers, self.counts())},
+        }
@@ -54,6 +54,8 @@ def load_universe_from_google_sheets() -> List[Dict[str, str]]:
                 "status": status,
                 "asset_name": row["asset name"],
                 "asset_class": row["asset class"],
+                # Optional ";"-separated names used by the entity linker
+                "aliases": row.get("aliases", ""),
             }
         )
 
@@ -0,0 +1,210 @@
+"""
+Classical NLP Burst Detection — Daily Document Counts
+
+Maintains a fixed-size ring buffer of daily document counts per
+entity with running sums, so each day's N_burst is an O(1) update
+per entity. State persists locally between runs.
+
+Canon reference:
+- Daily doc count d_t
+- Baseline = mean(d_{t−30:t})
+- B = max(0, (d_t − baseline) / baseline)
+- N_burst = clip(B / 3, 0, 1)
+- Deterministic, missing data excluded (no baseline ⇒ no score)
+"""
+
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+import os
+
+import numpy as np
+import pandas as pd
+
+BURST_WINDOW = 30
+BURST_SCALE = 3.0
+
+DEFAULT_STATE_PATH = os.getenv("FIA_BURST_STATE", ".cache/nlp/burst_state.npz")
+
+
+class BurstDetector:
+    """
+    Per-entity daily-count ring buffers.
+
+    The ring holds the `window` completed days before the current day;
+    the current day's counts are kept apart, so re-running on the same
+    day replaces them instead of double counting.
+    """
+
+    def __init__(self, window: int = BURST_WINDOW):
+        self.window = window
+        self.entities: List[str] = []
+        self._index: Dict[str, int] = {}
+
+        self._ring = np.zeros((0, window), dtype=np.int64)
+        self._sum = np.zeros(0, dtype=np.int64)
+        self._filled = np.zeros(0, dtype=np.int64)
+        self._today = np.zeros(0, dtype=np.int64)
+        self._slot = 0
+        self.day: Optional[date] = None
+
+    # -------------------------
+    # Updates
+    # -------------------------
+
+    def _ensure(self, entities) -> None:
+        new = [e for e in entities if e not in self._index]
+        if not new:
+            return
+
+        for e in new:
+            self._index[e] = len(self.entities)
+            self.entities.append(e)
+
+        k = len(new)
+        self._ring = np.vstack([self._ring, np.zeros((k, self.window), dtype=np.int64)])
+        self._sum = np.concatenate([self._sum, np.zeros(k, dtype=np.int64)])
+        self._filled = np.concatenate([self._filled, np.zeros(k, dtype=np.int64)])
+        self._today = np.concatenate([self._today, np.zeros(k, dtype=np.int64)])
+
+    def _push(self, counts: np.ndarray) -> None:
+        """
+        Retire the oldest ring slot and append one completed day.
+        """
+        old = self._ring[:, self._slot]
+        self._sum += counts - old
+        self._ring[:, self._slot] = counts
+        self._filled = np.minimum(self._filled + 1, self.window)
+        self._slot = (self._slot + 1) % self.window
+
+    def update(
+        self,
+        day: Union[str, date, pd.Timestamp],
+        counts: Dict[str, int],
+    ) -> Dict[str, Optional[float]]:
+        """
+        Record one day's document counts per entity.
+
+        Days skipped since the last update enter the ring as zero
+        counts; entities absent from `counts` count 0 today.
+
+        Returns:
+            N_burst per known entity (None without a baseline)
+        """
+        day = pd.Timestamp(day).date()
+
+        if self.day is not None and day < self.day:
+            raise RuntimeError(f"Burst update for {day} precedes state day {self.day}")
+
+        if self.day is not None and day > self.day:
+            self._push(self._today)
+            gap = (day - self.day).days - 1
+            for _ in range(min(gap, self.window)):
+                self._push(np.zeros(len(self.entities), dtype=np.int64))
+
+        # New entities join after the ring advances: no history yet
+        self._ensure(counts)
+
+        self.day = day
+        self._today = np.zeros(len(self.entities), dtype=np.int64)
+        for entity, n in counts.items():
+            self._today[self._index[entity]] = int(n)
+
+        return self.scores()
+
+    def adopt(self, other: "BurstDetector", entities: Sequence[str]) -> None:
+        """
+        Take the state of `entities` from a detector advanced over the
+        same days (a shard's copy of this state).
+        """
+        if (other.window, other.day, other._slot) != (self.window, self.day, self._slot):
+            raise RuntimeError("Burst states were not advanced over the same days")
+
+        entities = [e for e in entities if e in other._index]
+        self._ensure(entities)
+        rows = [self._index[e] for e in entities]
+        source = [other._index[e] for e in entities]
+        self._ring[rows] = other._ring[source]
+        self._sum[rows] = other._sum[source]
+        self._filled[rows] = other._filled[source]
+        self._today[rows] = other._today[source]
+
+    # -------------------------
+    # Scores
+    # -------------------------
+
+    def burst(self) -> np.ndarray:
+        """
+        (E,) raw burst B for the current day (NaN without a baseline).
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            baseline = self._sum / self._filled
+            b = (self._today - baseline) / baseline
+        return np.where(baseline > 0, np.maximum(b, 0.0), np.nan)
+
+    def scores(self) -> Dict[str, Optional[float]]:
+        """
+        N_burst = clip(B / 3, 0, 1) per entity.
+        """
+        n_burst = np.clip(self.burst() / BURST_SCALE, 0.0, 1.0)
+        return {
+            e: None if np.isnan(v) else v
+            for e, v in zip(self.entities, n_burst.tolist())
+        }
+
+    # -------------------------
+    # Persistence
+    # -------------------------
+
+    def save(self, path: Union[str, Path] = DEFAULT_STATE_PATH) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                window=self.window,
+                entities=np.array(self.entities, dtype=str),
+                ring=self._ring,
+                sum=self._sum,
+                filled=self._filled,
+                today=self._today,
+                slot=self._slot,
+                day=np.array(
+                    "NaT" if self.day is None else self.day.isoformat(),
+                    dtype="datetime64[D]",
+                ),
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(
+        cls,
+        path: Union[str, Path] = DEFAULT_STATE_PATH,
+        window: int = BURST_WINDOW,
+    ) -> "BurstDetector":
+        """
+        Restore saved state, or a fresh detector if none exists.
+        """
+        path = Path(path)
+        if not path.exists():
+            return cls(window)
+
+        with np.load(path, allow_pickle=False) as data:
+            detector = cls(int(data["window"]))
+            detector.entities = data["entities"].tolist()
+            detector._index = {e: i for i, e in enumerate(detector.entities)}
+            detector._ring = data["ring"]
+            detector._sum = data["sum"]
+            detector._filled = data["filled"]
+            detector._today = data["today"]
+            detector._slot = int(data["slot"])
+            day = data["day"][()]
+            detector.day = None if np.isnat(day) else pd.Timestamp(day).date()
+
+        if detector.window != window:
+            raise RuntimeError(
+                f"Burst state window {detector.window} does not match {window}"
+            )
+        return detector
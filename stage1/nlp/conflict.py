@@ -10,38 +10,30 @@ Canon reference:
 - Deterministic, missing data excluded
 """
 
-from typing import List
+from typing import List, Union
 
-from stage1.nlp.sentiment import POSITIVE_WORDS, NEGATIVE_WORDS
+from stage1.nlp.token_counts import TokenCounts, as_counts
 
 
-def conflict_signal(documents: List[List[str]]) -> float:
+def conflict_signal(documents: Union[List[List[str]], TokenCounts]) -> float:
     """
     Compute conflict / contradiction signal.
 
     Args:
-        documents: Tokenized documents
+        documents: Tokenized documents, or their TokenCounts record
 
     Returns:
         Normalized conflict signal ∈ [0,1]
     """
-    if not documents:
+    if not isinstance(documents, TokenCounts) and not documents:
         return 0.0
 
-    pos_count = 0
-    neg_count = 0
+    counts = as_counts(documents)
 
-    for doc in documents:
-        for token in doc:
-            if token in POSITIVE_WORDS:
-                pos_count += 1
-            elif token in NEGATIVE_WORDS:
-                neg_count += 1
-
-    total = pos_count + neg_count
+    total = counts.pos + counts.neg
     if total == 0:
         return 0.0
 
-    conflict = 1.0 - abs(pos_count - neg_count) / total
+    conflict = 1.0 - abs(counts.pos - counts.neg) / total
 
     return min(max(conflict, 0.0), 1.0)
@@ -0,0 +1,627 @@
+"""
+Classical NLP Corpus Store — Day-Partitioned Local Documents
+
+Append-only local store of tokenized documents, so each run reads
+its 30/37-day NLP windows from disk instead of refetching them.
+
+Layout (one directory per publication day, UTC):
+
+    <root>/vocab.txt                  token per line; line number = stored id
+    <root>/YYYY-MM-DD/tokens.i32      token ids of every document, concatenated
+    <root>/YYYY-MM-DD/ends.i64        cumulative token offset after each document
+    <root>/YYYY-MM-DD/docs.jsonl      {id, timestamp, entities, copies} per document
+    <root>/YYYY-MM-DD/index-*.npz     BM25 index partition of the day's documents
+
+Token arrays are memory-mapped, so a window is a set of slices.
+Stored ids are remapped onto the live Vocabulary when read, so the
+records are interchangeable with TokenCounts built from raw tokens.
+
+Near-duplicate documents within an appended batch (syndicated
+copies) are collapsed before storage; each stored document keeps
+the number of copies it stands for, and window counts weight it by
+that number.
+
+Writes append token ids first and the docs.jsonl line last; the
+line count is the committed document count, so a torn write is
+ignored (and overwritten by the next append).
+
+Canon reference:
+- Corpus = last 30d documents, plus the 7d recent window
+- Deterministic, missing data excluded
+"""
+
+from datetime import date, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from stage1.nlp.dedup import deduplicate
+from stage1.nlp.relevance_index import CORPUS_DAYS, NGRAM_RANGE, Document, InvertedIndex, analyze
+from stage1.nlp.token_counts import TokenCounts, Vocabulary, lexicon_vocabulary
+
+if TYPE_CHECKING:
+    from stage1.nlp.hashing import HashingVectorizer
+
+RECENT_DAYS = 7
+RETENTION_DAYS = CORPUS_DAYS + RECENT_DAYS
+
+DEFAULT_CORPUS_DIR = os.getenv("FIA_CORPUS_DIR", ".cache/nlp/corpus")
+
+_TOKENS = "tokens.i32"
+_ENDS = "ends.i64"
+_DOCS = "docs.jsonl"
+_VOCAB = "vocab.txt"
+_INDEX = "index-{}-{}-{}.npz"
+
+
+def _as_day(day: Union[str, date, pd.Timestamp]) -> date:
+    return pd.Timestamp(day).date()
+
+
+def _tokens(document: Document) -> List[str]:
+    """
+    Stored tokens: lowercased unigrams, stop words kept (the
+    sentiment lexicon includes words such as "up" and "down").
+    """
+    if isinstance(document, str):
+        return analyze(document, (1, 1), frozenset())
+    return list(document)
+
+
+def _read_committed(path: Path) -> bytes:
+    """
+    Complete lines of a text file (a torn last line without its
+    newline is not committed).
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    return data[: data.rfind(b"\n") + 1]
+
+
+def _gather(values: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Concatenate the ranges values[start:start + length] without a
+    Python loop.
+
+    Returns:
+        (gathered values, lengths)
+    """
+    offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+    return np.asarray(values)[np.arange(offsets.size) + offsets], lengths
+
+
+def _read_array(path: Path, dtype, count: int) -> np.ndarray:
+    """
+    Memory-map the first `count` items of a raw array file.
+    """
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+
+class _Partition:
+    """
+    One day's documents (read side).
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.day = _as_day(path.name)
+
+        self._docs = _read_committed(path / _DOCS)
+        self.size = len(self._docs)
+        self._meta: Optional[List[dict]] = None
+
+        n = self._docs.count(b"\n")
+        self.n_docs = n
+        self.ends = _read_array(path / _ENDS, np.int64, n)
+        self.tokens = _read_array(path / _TOKENS, np.int32, int(self.ends[-1]) if n else 0)
+
+        self._entities: Optional[Dict[str, np.ndarray]] = None
+        self._copies: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self.n_docs
+
+    @property
+    def meta(self) -> List[dict]:
+        """
+        Per-document metadata, parsed on first use.
+        """
+        if self._meta is None:
+            body = self._docs.decode("utf-8").rstrip("\n").replace("\n", ",")
+            self._meta = json.loads(f"[{body}]")
+        return self._meta
+
+    def rows(self, entity: Optional[str] = None) -> np.ndarray:
+        """
+        Document rows, optionally only those tagged with `entity`.
+        """
+        if entity is None:
+            return np.arange(self.n_docs)
+
+        if self._entities is None:
+            postings: Dict[str, List[int]] = {}
+            for row, meta in enumerate(self.meta):
+                for e in meta.get("entities", ()):
+                    postings.setdefault(e, []).append(row)
+            self._entities = {e: np.array(r) for e, r in postings.items()}
+
+        return self._entities.get(entity, np.zeros(0, dtype=np.int64))
+
+    def copies(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Syndicated copies each selected document stands for.
+        """
+        if self._copies is None:
+            self._copies = np.array([m.get("copies", 1) for m in self.meta], dtype=np.int64)
+        return self._copies if rows is None else self._copies[rows]
+
+    def slices(self, rows: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (stored token ids, lengths) of the selected documents
+        (default: all, without copying the mapped tokens).
+        """
+        ends = np.asarray(self.ends)
+        starts = np.concatenate([[0], ends[:-1]]).astype(np.int64)
+        if rows is None:
+            return self.tokens, ends - starts
+
+        return _gather(self.tokens, starts[rows], ends[rows] - starts[rows])
+
+
+class CorpusStore:
+    """
+    Append-only, day-partitioned document store.
+
+    Attributes:
+        root: Store directory
+        retention_days: Days kept by compact() (30d corpus + 7d window)
+        vocab: Live vocabulary that read ids refer to (default: one
+            owned by this store, released with it)
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path] = DEFAULT_CORPUS_DIR,
+        retention_days: int = RETENTION_DAYS,
+        vocab: Optional[Vocabulary] = None,
+    ):
+        self.root = Path(root)
+        self.retention_days = retention_days
+        self.vocab = vocab or lexicon_vocabulary()
+
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        self._stored: Dict[str, int] = {}
+        self._remap = np.zeros(0, dtype=np.int64)
+        vocab_path = self.root / _VOCAB
+        if vocab_path.exists():
+            committed = _read_committed(vocab_path)
+            with open(vocab_path, "ab") as f:
+                f.truncate(len(committed))
+            self._register(committed.decode("utf-8").split("\n")[:-1])
+
+        self._partitions: Dict[date, _Partition] = {}
+        self._indexes: Dict[Tuple[str, int], InvertedIndex] = {}
+
+    def _register(self, tokens: List[str]) -> None:
+        for token in tokens:
+            self._stored[token] = len(self._stored)
+        self._remap = np.concatenate(
+            [self._remap, np.asarray(self.vocab.ids(tokens), dtype=np.int64)]
+        )
+
+    # -------------------------
+    # Writes
+    # -------------------------
+
+    def _stored_ids(self, tokens: List[str]) -> List[int]:
+        """
+        Stored ids for tokens, appending unseen tokens to vocab.txt.
+        """
+        new = list(dict.fromkeys(t for t in tokens if t not in self._stored))
+        if new:
+            if any("\n" in t for t in new):
+                raise ValueError("Tokens must not contain newlines")
+            with open(self.root / _VOCAB, "a", encoding="utf-8") as f:
+                f.writelines(t + "\n" for t in new)
+            self._register(new)
+
+        stored = self._stored
+        return [stored[t] for t in tokens]
+
+    def append(
+        self,
+        documents: Sequence[Document],
+        timestamps: Sequence[Union[str, pd.Timestamp]],
+        entities: Optional[Sequence[Sequence[str]]] = None,
+        doc_ids: Optional[Sequence[str]] = None,
+        dedup: bool = True,
+    ) -> int:
+        """
+        Append documents to their publication-day partitions.
+
+        Args:
+            documents: Raw texts or token lists
+            timestamps: Publication time per document (UTC day = partition)
+            entities: Entities linked to each document
+            doc_ids: Optional stable ids; ids already stored are skipped,
+                so re-fetched documents are not duplicated
+            dedup: Collapse near-duplicates within the batch into their
+                earliest copy (entities are merged over the copies)
+
+        Returns:
+            Documents written
+        """
+        n = len(documents)
+        if len(timestamps) != n:
+            raise ValueError("timestamps must match documents")
+        if entities is not None and len(entities) != n:
+            raise ValueError("entities must match documents")
+        if doc_ids is not None and len(doc_ids) != n:
+            raise ValueError("doc_ids must match documents")
+
+        stamps = list(pd.to_datetime(list(timestamps), utc=True))
+        tags = [list(entities[i]) if entities is not None else [] for i in range(n)]
+        copies = [1] * n
+        keep = range(n)
+
+        if dedup and n > 1:
+            groups = deduplicate([d if isinstance(d, str) else " ".join(d) for d in documents])
+            keep = groups["representatives"]
+            for i, label in enumerate(groups["labels"]):
+                if label != i:
+                    tags[label].extend(e for e in tags[i] if e not in tags[label])
+            for i, count in zip(keep, groups["counts"]):
+                copies[i] = count
+
+        by_day: Dict[date, List[int]] = {}
+        for i in keep:
+            by_day.setdefault(stamps[i].date(), []).append(i)
+
+        written = 0
+        for day, rows in sorted(by_day.items()):
+            written += self._append_day(
+                day,
+                [
+                    {
+                        "id": doc_ids[i] if doc_ids is not None else None,
+                        "timestamp": stamps[i].isoformat(),
+                        "entities": tags[i],
+                        "copies": copies[i],
+                    }
+                    for i in rows
+                ],
+                [_tokens(documents[i]) for i in rows],
+            )
+        return written
+
+    def _append_day(self, day: date, meta: List[dict], tokens: List[List[str]]) -> int:
+        path = self.root / day.isoformat()
+        path.mkdir(exist_ok=True)
+        (path / _DOCS).touch()
+
+        partition = _Partition(path)
+        if any(m["id"] is not None for m in meta):
+            seen = {m.get("id") for m in partition.meta}
+            keep = [i for i, m in enumerate(meta) if m["id"] is None or m["id"] not in seen]
+            meta = [meta[i] for i in keep]
+            tokens = [tokens[i] for i in keep]
+
+        if not meta:
+            return 0
+
+        start, size = len(partition), partition.size
+        if meta[0]["id"] is None:
+            for i, m in enumerate(meta):
+                m["id"] = f"{day.isoformat()}:{start + i}"
+
+        ids = np.asarray(self._stored_ids([t for doc in tokens for t in doc]), dtype=np.int32)
+        base = int(partition.ends[-1]) if start else 0
+        ends = base + np.cumsum([len(doc) for doc in tokens], dtype=np.int64)
+
+        # Drop any torn tail, then append tokens, offsets and metadata
+        del partition
+        for name, committed in ((_TOKENS, base * 4), (_ENDS, start * 8)):
+            with open(path / name, "ab") as f:
+                f.truncate(committed)
+                f.write(ids.tobytes() if name == _TOKENS else ends.tobytes())
+
+        with open(path / _DOCS, "ab") as f:
+            f.truncate(size)
+            f.writelines((json.dumps(m, sort_keys=True) + "\n").encode("utf-8") for m in meta)
+
+        self._partitions.pop(day, None)
+        return len(meta)
+
+    def compact(self, today: Optional[Union[str, date, pd.Timestamp]] = None) -> List[date]:
+        """
+        Drop partitions older than the retention window.
+
+        Args:
+            today: Window end (default: latest stored day)
+
+        Returns:
+            Days removed
+        """
+        days = self.days()
+        if not days:
+            return []
+
+        end = _as_day(today) if today is not None else days[-1]
+        cutoff = end - timedelta(days=self.retention_days - 1)
+
+        removed = [d for d in days if d < cutoff]
+        for day in removed:
+            shutil.rmtree(self.root / day.isoformat())
+            self._partitions.pop(day, None)
+        return removed
+
+    # -------------------------
+    # Reads
+    # -------------------------
+
+    def days(self) -> List[date]:
+        days = []
+        for path in self.root.iterdir():
+            if path.is_dir() and (path / _DOCS).exists():
+                days.append(_as_day(path.name))
+        return sorted(days)
+
+    def _partition(self, day: date) -> _Partition:
+        if day not in self._partitions:
+            self._partitions[day] = _Partition(self.root / day.isoformat())
+        return self._partitions[day]
+
+    def window(
+        self,
+        days: int = CORPUS_DAYS,
+        end: Optional[Union[str, date, pd.Timestamp]] = None,
+    ) -> List[_Partition]:
+        """
+        Partitions for the `days` calendar days ending at `end`
+        (default: latest stored day), oldest first.
+        """
+        stored = self.days()
+        if not stored:
+            return []
+
+        end = _as_day(end) if end is not None else stored[-1]
+        start = end - timedelta(days=days - 1)
+        return [self._partition(d) for d in stored if start <= d <= end]
+
+    def _decode(self, ids: np.ndarray, lengths: np.ndarray) -> List[List[str]]:
+        if not len(lengths):
+            return []
+        tokens = np.array(self.vocab.tokens, dtype=object)[ids]
+        return [list(doc) for doc in np.split(tokens, np.cumsum(lengths)[:-1])]
+
+    def token_ids(
+        self,
+        days: int = CORPUS_DAYS,
+        end: Optional[Union[str, date, pd.Timestamp]] = None,
+        entity: Optional[str] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (live vocabulary ids, lengths) of the window's documents.
+        """
+        ids, lengths = [], []
+        for partition in self.window(days, end):
+            stored, n = partition.slices(None if entity is None else partition.rows(entity))
+            ids.append(stored)
+            lengths.append(n)
+
+        if not ids:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return self._remap[np.concatenate(ids)], np.concatenate(lengths)
+
+    def entity_token_ids(
+        self,
+        entities: Sequence[str],
+        days: int = CORPUS_DAYS,
+        end: Optional[Union[str, date, pd.Timestamp]] = None,
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        token_ids() plus per-document copies, for many entities in one
+        pass over the window.
+        """
+        index = {e: i for i, e in enumerate(entities)}
+        tagged, ids, lengths, copies = [], [], [], []
+
+        for partition in self.window(days, end):
+            pairs = [
+                (index[e], row)
+                for row, meta in enumerate(partition.meta)
+                for e in meta.get("entities", ())
+                if e in index
+            ]
+            if not pairs:
+                continue
+            entity, rows = np.array(pairs, dtype=np.int64).T
+            stored, n = partition.slices(rows)
+            tagged.append(entity)
+            ids.append(stored)
+            lengths.append(n)
+            copies.append(partition.copies(rows))
+
+        if not tagged:
+            empty = np.zeros(0, dtype=np.int64)
+            return {e: (empty, empty, empty) for e in entities}
+
+        # Regroup documents by entity, keeping day order within each
+        entity = np.concatenate(tagged)
+        lengths = np.concatenate(lengths)
+        starts = np.cumsum(lengths) - lengths
+        order = np.argsort(entity, kind="stable")
+        copies = np.concatenate(copies)[order]
+        ids, lengths = _gather(self._remap[np.concatenate(ids)], starts[order], lengths[order])
+
+        docs = np.searchsorted(entity[order], np.arange(len(index) + 1))
+        tokens = np.concatenate([[0], np.cumsum(lengths)])[docs]
+        return {
+            e: (
+                ids[tokens[i]:tokens[i + 1]],
+                lengths[docs[i]:docs[i + 1]],
+                copies[docs[i]:docs[i + 1]],
+            )
+            for e, i in index.items()
+        }
+
+    def daily_entity_counts(
+        self,
+        entities: Sequence[str],
+        since: Optional[Union[str, date, pd.Timestamp]] = None,
+    ) -> List[Tuple[date, Dict[str, int]]]:
+        """
+        Stored documents tagged with each entity, per stored day from
+        `since` (default: every day), oldest first. These are the canon
+        daily document counts d_t that feed the burst detector.
+        """
+        since = _as_day(since) if since is not None else date.min
+        return [
+            (day, {e: len(self._partition(day).rows(e)) for e in entities})
+            for day in self.days()
+            if day >= since
+        ]
+
+    def daily_documents(
+        self,
+        after: Optional[Union[str, date, pd.Timestamp]] = None,
+    ) -> List[Tuple[date, List[List[str]], List[List[str]]]]:
+        """
+        (day, tokenized documents, linked entities) per stored day after
+        `after` (default: every day), oldest first. These are the daily
+        batches that update the topic model.
+        """
+        after = _as_day(after) if after is not None else date.min
+        batches = []
+        for day in self.days():
+            if day <= after:
+                continue
+            partition = self._partition(day)
+            stored, lengths = partition.slices()
+            batches.append((
+                day,
+                self._decode(self._remap[stored], lengths),
+                [list(m.get("entities", ())) for m in partition.meta],
+            ))
+        return batches
+
+    def counts(
+        self,
+        days: int = CORPUS_DAYS,
+        end: Optional[Union[str, date, pd.Timestamp]] = None,
+        entity: Optional[str] = None,
+    ) -> TokenCounts:
+        """
+        TokenCounts record of a window, straight from the stored ids
+        (each document weighted by its syndicated copies).
+        """
+        ids, lengths = self.token_ids(days, end, entity)
+        weights = [
+            partition.copies(None if entity is None else partition.rows(entity))
+            for partition in self.window(days, end)
+        ]
+        weights = np.concatenate(weights) if weights else np.zeros(0, dtype=np.int64)
+        return TokenCounts.from_ids(ids, lengths, self.vocab, weights)
+
+    def documents(
+        self,
+        days: int = CORPUS_DAYS,
+        end: Optional[Union[str, date, pd.Timestamp]] = None,
+        entity: Optional[str] = None,
+    ) -> List[List[str]]:
+        """
+        Tokenized documents of a window, oldest first.
+        """
+        return self._decode(*self.token_ids(days, end, entity))
+
+    def metadata(
+        self,
+        days: int = CORPUS_DAYS,
+        end: Optional[Union[str, date, pd.Timestamp]] = None,
+    ) -> List[dict]:
+        return [m for partition in self.window(days, end) for m in partition.meta]
+
+    def relevance_index(
+        self,
+        end: Optional[Union[str, date, pd.Timestamp]] = None,
+        window_days: int = CORPUS_DAYS,
+        hashing: Optional["HashingVectorizer"] = None,
+    ) -> InvertedIndex:
+        """
+        BM25 index over the stored window, one partition per day
+        (hashed terms when a HashingVectorizer is given).
+
+        The index is kept across calls and each day's index partition
+        is saved next to its documents, so only documents appended
+        since the last run are vectorized; expired days are evicted.
+        """
+        name = (
+            _INDEX.format(f"hashed{hashing.n_features}", *hashing.ngram_range)
+            if hashing is not None
+            else _INDEX.format("terms", *NGRAM_RANGE)
+        )
+
+        partitions = self.window(window_days, end)
+        index = self._indexes.get((name, window_days))
+        if index is None or (index.days and partitions and index.days[-1] > partitions[-1].day):
+            index = self._indexes[name, window_days] = InvertedIndex(window_days, hashing=hashing)
+
+        for partition in partitions:
+            path = self.root / partition.day.isoformat() / name
+            indexed = index.day_size(partition.day)
+            if not indexed and path.exists():
+                with np.load(path, allow_pickle=False) as data:
+                    saved = len(data["doc_ids"])
+                # A save ahead of the committed documents is re-indexed
+                if saved <= len(partition):
+                    indexed = index.load_day(partition.day, path)
+            if indexed == len(partition):
+                continue
+
+            rows = np.arange(indexed, len(partition))
+            stored, lengths = partition.slices(rows)
+            index.add_documents(
+                partition.day,
+                self._decode(self._remap[stored], lengths),
+                [partition.meta[i]["id"] for i in rows],
+            )
+            index.save_day(partition.day, path)
+
+        if partitions:
+            index.evict_before(partitions[0].day)
+        return index
+
+
+def entity_windows(
+    store: CorpusStore,
+    entities: Iterable[str],
+    end: Optional[Union[str, date, pd.Timestamp]] = None,
+) -> Dict[str, Tuple[TokenCounts, TokenCounts]]:
+    """
+    (recent 7d, prior 30d) TokenCounts per entity, weighted by copies.
+    """
+    stored = store.days()
+    if not stored:
+        return {}
+
+    end = _as_day(end) if end is not None else stored[-1]
+    prior_end = end - timedelta(days=RECENT_DAYS)
+
+    recent = store.entity_token_ids(entities, RECENT_DAYS, end)
+    prior = store.entity_token_ids(entities, CORPUS_DAYS, prior_end)
+
+    return {
+        e: (
+            TokenCounts.from_ids(recent[e][0], recent[e][1], store.vocab, recent[e][2]),
+            TokenCounts.from_ids(prior[e][0], prior[e][1], store.vocab, prior[e][2]),
+        )
+        for e in entities
+    }
@@ -0,0 +1,181 @@
+"""
+Classical NLP Deduplication — MinHash / LSH
+
+Collapses near-duplicate documents (syndicated headlines) ahead of
+the NLP modules, keeping a count per surviving document so later
+components can weight it instead of re-processing every copy.
+
+Method:
+- Character 5-gram shingles of the normalized text, hashed with a
+  vectorized polynomial rolling hash
+- MinHash signatures: each shingle hash is mixed once, then 128
+  seeded odd-multiplier affine permutations (mod 2^64) are applied
+  and reduced with segment-wise minima over the whole batch
+- LSH banding (16 bands × 8 rows): documents sharing a band bucket
+  are compared with their bucket's first document only, so candidate
+  generation stays linear in the batch size
+- Candidates whose estimated Jaccard similarity reaches the threshold
+  are merged (union-find); the earliest document represents its group
+
+Deterministic: fixed seeds, no Python hash randomization.
+"""
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from stage1.nlp.relevance_index import analyze
+from utils.math import find_roots, mix64, union_edges
+
+SHINGLE_CHARS = 5
+NUM_PERM = 128
+LSH_BANDS = 16
+LSH_ROWS = 8
+DEDUP_THRESHOLD = 0.8
+MINHASH_SEED = 17
+
+# Shingle hashes processed per MinHash block (× NUM_PERM uint64 values)
+_BLOCK_SHINGLES = 1 << 16
+
+_HASH_BASE = np.uint64(1099511628211)
+
+
+def normalize(text: str) -> str:
+    """
+    Lowercased word tokens joined by single spaces (punctuation dropped).
+    """
+    return " ".join(analyze(text, (1, 1), frozenset()))
+
+
+def shingle_hashes(texts: Sequence[str], k: int = SHINGLE_CHARS):
+    """
+    64-bit hashes of every character k-gram of every document.
+
+    Documents shorter than k are padded to one shingle.
+
+    Returns:
+        (hashes (S,), starts (n,)): shingles in document order and the
+        offset of each document's first shingle
+    """
+    encoded = [normalize(t).encode("utf-8").ljust(k) for t in texts]
+    lengths = np.array([len(e) for e in encoded], dtype=np.int64)
+
+    buf = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+    powers = _HASH_BASE ** np.arange(k - 1, -1, -1, dtype=np.uint64)
+
+    windows = sliding_window_view(buf, k)
+    hashes = (windows * powers).sum(axis=1, dtype=np.uint64)
+
+    # Keep windows that start and end inside one document
+    ends = np.cumsum(lengths)
+    doc = np.repeat(np.arange(len(texts)), lengths)[: len(hashes)]
+    valid = np.arange(len(hashes)) + k <= ends[doc]
+
+    counts = lengths - k + 1
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    return hashes[valid], starts
+
+
+def minhash_signatures(
+    texts: Sequence[str],
+    num_perm: int = NUM_PERM,
+    seed: int = MINHASH_SEED,
+) -> np.ndarray:
+    """
+    (n, num_perm) MinHash signatures for a batch of documents.
+    """
+    if not len(texts):
+        return np.zeros((0, num_perm), dtype=np.uint64)
+
+    # Permutation i: x -> a_i·x + b_i (mod 2^64, a_i odd) over mixed hashes
+    rng = np.random.default_rng(seed)
+    top = np.iinfo(np.uint64).max
+    a = (rng.integers(0, top, size=num_perm, dtype=np.uint64, endpoint=True) | np.uint64(1))[:, None]
+    b = rng.integers(0, top, size=num_perm, dtype=np.uint64, endpoint=True)[:, None]
+
+    hashes, starts = shingle_hashes(texts)
+    hashes = mix64(hashes)
+    ends = np.append(starts[1:], len(hashes))
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint64)
+
+    # Blocks of whole documents bound peak memory at num_perm × block
+    doc = 0
+    while doc < len(texts):
+        last = max(doc + 1, int(np.searchsorted(ends, starts[doc] + _BLOCK_SHINGLES, "right")))
+        lo, hi = starts[doc], ends[last - 1]
+
+        permuted = hashes[lo:hi][None, :] * a
+        permuted += b
+        signatures[doc:last] = np.minimum.reduceat(permuted, starts[doc:last] - lo, axis=1).T
+        doc = last
+
+    return signatures
+
+
+def _band_keys(band: np.ndarray) -> np.ndarray:
+    key = np.zeros(len(band), dtype=np.uint64)
+    for col in band.T:
+        key = mix64(key ^ col)
+    return key
+
+
+def near_duplicate_labels(
+    signatures: np.ndarray,
+    bands: int = LSH_BANDS,
+    rows: int = LSH_ROWS,
+    threshold: float = DEDUP_THRESHOLD,
+) -> np.ndarray:
+    """
+    Group label per document: the index of its group's earliest member.
+    """
+    n = len(signatures)
+    parent = np.arange(n)
+    if n < 2:
+        return parent
+
+    if bands * rows > signatures.shape[1]:
+        raise ValueError(f"{bands} bands × {rows} rows exceed {signatures.shape[1]} hashes")
+
+    for b in range(bands):
+        keys = _band_keys(signatures[:, b * rows:(b + 1) * rows])
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+        rep = first[inverse]
+        i = np.nonzero(rep != np.arange(n))[0]
+        if not len(i):
+            continue
+
+        similarity = (signatures[i] == signatures[rep[i]]).mean(axis=1)
+        keep = similarity >= threshold
+        parent = union_edges(parent, i[keep], rep[i][keep])
+
+    return find_roots(parent)
+
+
+def deduplicate(
+    texts: Sequence[str],
+    threshold: float = DEDUP_THRESHOLD,
+) -> Dict[str, List[int]]:
+    """
+    Collapse near-duplicate documents.
+
+    Args:
+        texts: Raw documents (e.g. headlines)
+        threshold: Minimum estimated Jaccard similarity to merge
+
+    Returns:
+        {
+          representatives: indices of surviving documents (input order),
+          counts: copies collapsed into each representative (weights),
+          labels: representative index for every input document,
+        }
+    """
+    labels = near_duplicate_labels(minhash_signatures(texts), threshold=threshold)
+    representatives, counts = np.unique(labels, return_counts=True)
+
+    return {
+        "representatives": representatives.tolist(),
+        "counts": counts.tolist(),
+        "labels": labels.tolist(),
+    }
@@ -0,0 +1,263 @@
+"""
+Classical NLP Entity Linker — Aho-Corasick over the Universe
+
+Maps documents to universe assets with one multi-pattern automaton
+instead of checking every name against every document.
+
+Patterns per asset:
+- Ticker, matched case-sensitively as an uppercase word (≥ 2 chars)
+- Cashtag ($TICKER), any case
+- Asset name, any case, with and without a trailing corporate
+  suffix ("Apple Inc." also matches "Apple")
+- Aliases, any case (universe "aliases" field, ";"-separated)
+
+The automaton is compiled into a dense DFA over the pattern
+alphabet, so a batch of documents is scanned column by column:
+one table lookup per character position for all documents at once.
+Matches must sit on word boundaries.
+
+Linkers are cached per universe content hash and rebuilt only when
+the universe changes.
+
+Deterministic, missing data excluded.
+"""
+
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+import hashlib
+import json
+
+import numpy as np
+
+MIN_BARE_TICKER = 2
+SCAN_CHUNK = 4096
+
+_CORPORATE_SUFFIXES = (
+    "inc", "incorporated", "corp", "corporation", "co", "company",
+    "ltd", "limited", "plc", "llc", "lp", "ag", "sa", "nv", "se",
+    "holdings", "holding", "group", "trust", "etf", "fund",
+    "class a", "class b", "class c",
+)
+
+# Pattern kinds
+_TICKER, _CASHTAG, _NAME = 0, 1, 2
+
+
+def _asset_name(asset: Dict) -> str:
+    return asset.get("asset_name") or asset.get("asset name") or ""
+
+
+def _aliases(asset: Dict) -> List[str]:
+    aliases = asset.get("aliases") or []
+    if isinstance(aliases, str):
+        aliases = aliases.split(";")
+    return [a.strip() for a in aliases if a.strip()]
+
+
+def _name_variants(name: str) -> List[str]:
+    """
+    Lowercased name, plus the name without trailing corporate suffixes.
+    """
+    name = " ".join(name.lower().replace(",", " ").split()).strip(". ")
+    variants = [name] if name else []
+
+    words = name.replace(".", " ").split()
+    while words:
+        tail = next(
+            (s for s in _CORPORATE_SUFFIXES if words[-len(s.split()):] == s.split()),
+            None,
+        )
+        if tail is None:
+            break
+        words = words[: -len(tail.split())]
+
+    short = " ".join(words)
+    if len(short) >= 3 and short not in variants:
+        variants.append(short)
+    return variants
+
+
+def _lower(text: str) -> str:
+    """
+    Lowercase without changing the length (positions must line up).
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+def universe_hash(universe: Sequence[Dict]) -> str:
+    """
+    Content hash of the fields the linker compiles.
+    """
+    key = sorted(
+        (a["ticker"], _asset_name(a), sorted(_aliases(a))) for a in universe
+    )
+    return hashlib.sha256(json.dumps(key).encode()).hexdigest()
+
+
+class EntityLinker:
+    """
+    Aho-Corasick automaton over one universe's tickers, cashtags,
+    names and aliases.
+
+    Attributes:
+        tickers: Universe tickers (posting list keys)
+        patterns: Lowercased pattern strings
+    """
+
+    def __init__(self, universe: Sequence[Dict]):
+        self.tickers: List[str] = [a["ticker"] for a in universe]
+
+        entries: Dict[Tuple[str, int], set] = {}
+        for asset in universe:
+            ticker = asset["ticker"]
+            if len(ticker) >= MIN_BARE_TICKER:
+                entries.setdefault((ticker.lower(), _TICKER), set()).add(ticker)
+            entries.setdefault(("$" + ticker.lower(), _CASHTAG), set()).add(ticker)
+            for text in [_asset_name(asset)] + _aliases(asset):
+                for variant in _name_variants(text):
+                    entries.setdefault((variant, _NAME), set()).add(ticker)
+
+        keys = sorted(entries)
+        self.patterns: List[str] = [p for p, _ in keys]
+        self._kinds = [k for _, k in keys]
+        self._assets = [sorted(entries[key]) for key in keys]
+
+        self._build()
+
+    # -------------------------
+    # Automaton
+    # -------------------------
+
+    def _build(self) -> None:
+        """
+        Trie + failure links, resolved into a dense DFA table.
+        """
+        alphabet = sorted({c for p in self.patterns for c in p})
+        self._alphabet = np.array([ord(c) for c in alphabet], dtype=np.int64)
+        symbol = {c: i + 1 for i, c in enumerate(alphabet)}  # 0 = any other char
+
+        goto: List[Dict[int, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for pid, pattern in enumerate(self.patterns):
+            state = 0
+            for c in pattern:
+                a = symbol[c]
+                if a not in goto[state]:
+                    goto[state][a] = len(goto)
+                    goto.append({})
+                    outputs.append([])
+                state = goto[state][a]
+            outputs[state].append(pid)
+
+        n_states, width = len(goto), len(alphabet) + 1
+        table = np.zeros((n_states, width), dtype=np.int32)
+        fail = [0] * n_states
+
+        # Breadth-first: a state's failure target is always resolved first
+        queue = deque()
+        for a, child in goto[0].items():
+            table[0, a] = child
+            queue.append(child)
+
+        while queue:
+            state = queue.popleft()
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            table[state] = table[fail[state]]
+            for a, child in goto[state].items():
+                table[state, a] = child
+                fail[child] = int(table[fail[state], a])
+                queue.append(child)
+
+        self._table = table
+        self._outputs = outputs
+        self._accepting = np.array([bool(o) for o in outputs])
+
+    # -------------------------
+    # Scanning
+    # -------------------------
+
+    def _scan(self, texts: List[str]) -> List[Tuple[int, int, int]]:
+        """
+        (document, end position, state) for every accepting step.
+        """
+        lowered = [_lower(t) for t in texts]
+        lengths = np.array([len(t) for t in lowered], dtype=np.int64)
+        if not lengths.sum():
+            return []
+
+        codes = np.frombuffer("".join(lowered).encode("utf-32-le"), dtype=np.uint32)
+        j = np.searchsorted(self._alphabet, codes)
+        j = np.minimum(j, len(self._alphabet) - 1)
+        symbols = np.where(self._alphabet[j] == codes, j + 1, 0)
+
+        # Pad into a (docs, max length) matrix; padding resets to root
+        width = int(lengths.max())
+        matrix = np.zeros((len(texts), width), dtype=np.int64)
+        rows = np.repeat(np.arange(len(texts)), lengths)
+        cols = np.arange(len(codes)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        matrix[rows, cols] = symbols
+
+        state = np.zeros(len(texts), dtype=np.int32)
+        hits = []
+        for t in range(width):
+            state = self._table[state, matrix[:, t]]
+            docs = np.nonzero(self._accepting[state])[0]
+            if len(docs):
+                hits.extend((int(d), t, int(state[d])) for d in docs)
+        return hits
+
+    def link(self, documents: Sequence[str]) -> List[List[str]]:
+        """
+        Assets mentioned by each document, in universe order.
+        """
+        order = {t: i for i, t in enumerate(self.tickers)}
+        linked: List[set] = [set() for _ in documents]
+
+        # Similar lengths per chunk keep the padded matrix tight
+        by_length = sorted(range(len(documents)), key=lambda i: len(documents[i]))
+        for lo in range(0, len(by_length), SCAN_CHUNK):
+            chunk = by_length[lo:lo + SCAN_CHUNK]
+            texts = [documents[i] for i in chunk]
+
+            for d, end, state in self._scan(texts):
+                text = texts[d]
+                for pid in self._outputs[state]:
+                    start = end - len(self.patterns[pid]) + 1
+                    if start > 0 and text[start - 1].isalnum():
+                        continue
+                    if end + 1 < len(text) and text[end + 1].isalnum():
+                        continue
+                    if self._kinds[pid] == _TICKER and text[start:end + 1] != self.patterns[pid].upper():
+                        continue
+                    linked[chunk[d]].update(self._assets[pid])
+
+        return [sorted(s, key=order.__getitem__) for s in linked]
+
+    def postings(self, documents: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        Per-asset posting lists: sorted indices of linked documents.
+        """
+        postings: Dict[str, List[int]] = {t: [] for t in self.tickers}
+        for i, assets in enumerate(self.link(documents)):
+            for ticker in assets:
+                postings[ticker].append(i)
+        return {t: np.array(docs, dtype=np.int64) for t, docs in postings.items()}
+
+
+_LINKERS: Dict[str, EntityLinker] = {}
+
+
+def get_linker(universe: Sequence[Dict]) -> EntityLinker:
+    """
+    Cached linker for a universe; rebuilt only when its tickers,
+    names or aliases change.
+    """
+    key = universe_hash(universe)
+    linker: Optional[EntityLinker] = _LINKERS.get(key)
+    if linker is None:
+        _LINKERS.clear()
+        linker = _LINKERS[key] = EntityLinker(universe)
+    return linker
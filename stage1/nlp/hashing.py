@@ -0,0 +1,186 @@
+"""
+Classical NLP Feature Hashing — Out-of-Core Vectorization
+
+Vocabulary-free alternative to the TF-IDF vocabulary: every n-gram
+term is hashed into a fixed-width, signed feature space, so documents
+can be vectorized in streaming chunks with memory bounded by the
+chunk and the feature width, never by the corpus.
+
+- Term hash: CRC-32 of the UTF-8 term, then a SplitMix64 finalizer;
+  the low bits pick the bucket, the top bit the sign (colliding terms
+  cancel in expectation instead of piling up)
+- IDF sketch: running per-bucket document frequencies (exact per
+  bucket, approximate per term through collisions). Chunks can be
+  added and subtracted, so rolling windows stay consistent.
+
+Config (config/nlp.yaml processing): method: hashing, hash_features.
+
+Deterministic: no Python hash randomization.
+"""
+
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+import zlib
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from stage1.nlp.relevance_index import NGRAM_RANGE, STOP_WORDS, Document, analyze
+from utils.io import load_yaml_config
+from utils.math import mix64
+
+HASH_FEATURES = 1 << 18
+HASH_CHUNK = 10_000
+
+NLP_CONFIG = "config/nlp.yaml"
+
+
+def hash_terms(terms: Sequence[str]) -> np.ndarray:
+    """
+    (len(terms),) well-mixed uint64 hashes of the terms.
+    """
+    crc = np.fromiter(
+        (zlib.crc32(t.encode("utf-8")) for t in terms),
+        dtype=np.uint64,
+        count=len(terms),
+    )
+    return mix64(crc)
+
+
+class HashingVectorizer:
+    """
+    Signed feature-hashing vectorizer over analyze() n-gram terms.
+
+    Attributes:
+        n_features: Feature space width (power of two)
+        ngram_range: Term n-gram range
+    """
+
+    def __init__(
+        self,
+        n_features: int = HASH_FEATURES,
+        ngram_range: Tuple[int, int] = NGRAM_RANGE,
+        stop_words: frozenset = STOP_WORDS,
+        alternate_sign: bool = True,
+    ):
+        if n_features <= 0 or n_features & (n_features - 1):
+            raise ValueError(f"n_features must be a power of two, got {n_features}")
+
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.stop_words = stop_words
+        self.alternate_sign = alternate_sign
+
+    def buckets(self, terms: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (bucket index, sign ±1) per term.
+        """
+        h = hash_terms(terms)
+        index = (h & np.uint64(self.n_features - 1)).astype(np.int64)
+        if not self.alternate_sign:
+            return index, np.ones(len(terms))
+        return index, np.where(h >> np.uint64(63), -1.0, 1.0)
+
+    def bucket_terms(self, document: Document) -> List[int]:
+        """
+        Bucket index of every term of one document (unsigned, for
+        count-based consumers such as BM25).
+        """
+        index, _ = self.buckets(analyze(document, self.ngram_range, self.stop_words))
+        return index.tolist()
+
+    def transform(self, documents: Sequence[Document]) -> csr_matrix:
+        """
+        (n_docs, n_features) signed term counts of one chunk.
+
+        Every (document, bucket) pair a term hit is stored, even when
+        opposite-sign collisions sum to zero, so the sparsity pattern
+        is the document's bucket set.
+        """
+        terms: List[str] = []
+        lengths: List[int] = []
+        for document in documents:
+            doc_terms = analyze(document, self.ngram_range, self.stop_words)
+            terms.extend(doc_terms)
+            lengths.append(len(doc_terms))
+
+        index, sign = self.buckets(terms)
+        keys = np.repeat(np.arange(len(lengths)), lengths) * self.n_features + index
+        keys, inverse = np.unique(keys, return_inverse=True)
+        values = np.bincount(inverse, weights=sign, minlength=len(keys))
+
+        rows, cols = np.divmod(keys, self.n_features)
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=len(lengths)))])
+        return csr_matrix((values, cols, indptr), shape=(len(lengths), self.n_features))
+
+    def stream(
+        self,
+        documents: Iterable[Document],
+        chunk_size: int = HASH_CHUNK,
+    ) -> Iterator[csr_matrix]:
+        """
+        Vectorize an unbounded document stream chunk by chunk.
+        """
+        documents = iter(documents)
+        while True:
+            chunk = list(islice(documents, chunk_size))
+            if not chunk:
+                return
+            yield self.transform(chunk)
+
+
+class IdfSketch:
+    """
+    Running per-bucket document frequencies over a hashed feature space.
+
+    Attributes:
+        df: (n_features,) documents containing each bucket
+        n_docs: Documents counted
+    """
+
+    def __init__(self, n_features: int = HASH_FEATURES):
+        self.n_features = n_features
+        self.df = np.zeros(n_features, dtype=np.int64)
+        self.n_docs = 0
+
+    def update(self, X: csr_matrix) -> None:
+        """
+        Count one vectorized chunk.
+        """
+        self.df += np.bincount(X.indices, minlength=self.n_features)
+        self.n_docs += X.shape[0]
+
+    def subtract(self, X: csr_matrix) -> None:
+        """
+        Remove a previously counted chunk (e.g. a day leaving the window).
+        """
+        self.df -= np.bincount(X.indices, minlength=self.n_features)
+        self.n_docs -= X.shape[0]
+
+    def merge(self, other: "IdfSketch") -> None:
+        if other.n_features != self.n_features:
+            raise ValueError("IDF sketches must share n_features")
+        self.df += other.df
+        self.n_docs += other.n_docs
+
+    def idf(self, buckets: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Smoothed idf log((1 + N) / (1 + df)) + 1 per bucket.
+        """
+        df = self.df if buckets is None else self.df[buckets]
+        return np.log((1 + self.n_docs) / (1 + df)) + 1
+
+
+def configured_vectorizer(path: str = NLP_CONFIG) -> Optional[HashingVectorizer]:
+    """
+    HashingVectorizer when config/nlp.yaml selects `method: hashing`
+    (None for the vocabulary TF-IDF method).
+    """
+    processing = load_yaml_config(path).get("processing") or {}
+    if processing.get("method") != "hashing":
+        return None
+
+    return HashingVectorizer(
+        int(processing.get("hash_features", HASH_FEATURES)),
+        tuple(processing.get("ngram_range", NGRAM_RANGE)),
+    )
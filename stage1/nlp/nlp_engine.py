@@ -6,11 +6,40 @@ Outputs:
 - Temporal sentiment shifts
 - Cross-asset coherence flags
 - Deterministic topic clusters
+- BM25 relevance per asset (when a document index is supplied)
+- Narrative conflict per asset (when a topic model is supplied; fed
+  each stored corpus day, else the day's deduplicated documents)
+- Lexical sentiment per asset (when a corpus store is supplied)
+- Document mentions per asset (when raw documents are supplied;
+  near-duplicate copies are collapsed first)
+- Canon N_burst per asset (burst detector fed per-day entity
+  document counts from the corpus store, else the day's linked
+  documents); legacy token-ratio burst without a detector
+- Vol-adjusted sentiment stress per asset (documents + price panel)
 """
 
-from typing import List, Dict
+from datetime import date
+from typing import Any, List, Dict, Optional, Sequence, Union
 import hashlib
 
+import pandas as pd
+
+from stage1.ingestion.price_panel import PricePanel
+from stage1.nlp.burst import BurstDetector
+from stage1.nlp.corpus_store import CorpusStore, entity_windows
+from stage1.nlp.dedup import deduplicate
+from stage1.nlp.entity_linker import get_linker
+from stage1.nlp.hashing import configured_vectorizer
+from stage1.nlp.relevance_burst import relevance_burst_signal
+from stage1.nlp.relevance_index import InvertedIndex, relevance_scores
+from stage1.nlp.sentiment import (
+    LexiconScorer,
+    realized_volatility,
+    sentiment_signal,
+    sentiment_stress,
+)
+from stage1.nlp.topics import TopicModel
+
 
 def _deterministic_score(key: str, horizon: str) -> float:
     """
@@ -35,10 +64,69 @@ def run_nlp_analysis(
     long_horizon_days: int = 45,
     detect_sentiment_shifts: bool = True,
     cluster_topics: bool = True,
+    relevance_index: Optional[InvertedIndex] = None,
+    topic_model: Optional[TopicModel] = None,
+    corpus: Optional[CorpusStore] = None,
+    documents: Optional[Sequence[str]] = None,
+    panel: Optional[PricePanel] = None,
+    signals: Optional[Dict[str, Any]] = None,
+    burst_detector: Optional[BurstDetector] = None,
+    day: Optional[Union[str, date]] = None,
 ) -> dict:
     per_asset = {}
     topic_clusters: Dict[str, List[str]] = {}
 
+    # Stored 30d corpus backs the relevance index and lexical signals
+    if corpus is not None and relevance_index is None:
+        relevance_index = corpus.relevance_index(hashing=configured_vectorizer())
+    windows = (
+        entity_windows(corpus, [a["ticker"] for a in universe])
+        if corpus is not None
+        else {}
+    )
+
+    # N_relevance from the rolling BM25 index, when a corpus is available
+    relevance = (
+        relevance_scores(relevance_index, universe)
+        if relevance_index is not None
+        else {}
+    )
+
+    # Per-asset posting lists and polarity of the deduplicated documents
+    if signals is None and documents is not None:
+        signals = document_signals(universe, documents)
+    postings = signals["postings"] if signals is not None else {}
+
+    # N_burst: per-entity daily document counts into the ring buffers,
+    # from the stored partitions (catching up every day since the
+    # detector's state day) or else from today's linked documents
+    tickers = [a["ticker"] for a in universe]
+    bursts: Dict[str, Optional[float]] = {}
+    if burst_detector is not None and corpus is not None:
+        for stored_day, counts in corpus.daily_entity_counts(tickers, since=burst_detector.day):
+            bursts = burst_detector.update(stored_day, counts)
+    elif burst_detector is not None and signals is not None:
+        day = day or pd.Timestamp.now(tz="UTC").date()
+        bursts = burst_detector.update(day, {t: len(postings.get(t, ())) for t in tickers})
+
+    # N_conflict from the incremental topic model (7d vs prior 30d),
+    # absorbing each stored day after its state day, or else today's
+    # deduplicated documents once per day
+    conflict: Dict[str, Optional[float]] = {}
+    if topic_model is not None:
+        if corpus is not None:
+            for stored_day, docs, linked in corpus.daily_documents(after=topic_model.day):
+                topic_model.update(stored_day, docs, linked)
+        elif signals is not None:
+            day = pd.Timestamp(day or pd.Timestamp.now(tz="UTC")).date()
+            if topic_model.day is None or day > topic_model.day:
+                linked = [[] for _ in signals["documents"]]
+                for ticker, rows in postings.items():
+                    for row in rows:
+                        linked[row].append(ticker)
+                topic_model.update(day, signals["documents"], linked)
+        conflict = topic_model.conflict()
+
     for asset in universe:
         ticker = asset["ticker"]
 
@@ -55,10 +143,88 @@ def run_nlp_analysis(
             "coherent": coherent,
         }
 
+        if ticker in relevance:
+            per_asset[ticker]["relevance"] = round(relevance[ticker], 4)
+
+        if conflict.get(ticker) is not None:
+            per_asset[ticker]["conflict"] = round(conflict[ticker], 4)
+
+        if ticker in postings:
+            per_asset[ticker]["mentions"] = len(postings[ticker])
+
+        if bursts.get(ticker) is not None:
+            per_asset[ticker]["burst"] = round(bursts[ticker], 4)
+
+        if ticker in windows:
+            recent, prior = windows[ticker]
+            if recent.n_docs:
+                per_asset[ticker]["sentiment"] = round(sentiment_signal(recent), 4)
+                # Legacy token-ratio burst when no detector is maintained
+                if burst_detector is None:
+                    per_asset[ticker]["burst"] = round(relevance_burst_signal(recent, prior), 4)
+
         if cluster_topics:
             topic = _topic_bucket(ticker)
             topic_clusters.setdefault(topic, []).append(ticker)
 
+    result = summarize_nlp(per_asset, topic_clusters)
+    return add_stress(result, signals, panel) if panel is not None else result
+
+
+def document_signals(
+    universe: List[Dict[str, str]],
+    documents: Sequence[str],
+) -> Dict[str, Any]:
+    """
+    Per-document inputs of the document modules. Syndicated copies
+    collapse to their earliest document first (mentions, stress and
+    burst count stories).
+
+    Returns:
+        {documents: the deduplicated documents,
+         postings: ticker -> document indices (one automaton scan),
+         polarity: (n,) lexicon polarity per deduplicated document}
+    """
+    if len(documents) > 1:
+        documents = [documents[i] for i in deduplicate(documents)["representatives"]]
+
+    return {
+        "documents": list(documents),
+        "postings": get_linker(universe).postings(documents),
+        "polarity": LexiconScorer().polarity(documents),
+    }
+
+
+def add_stress(
+    nlp: dict,
+    signals: Optional[Dict[str, Any]],
+    panel: PricePanel,
+) -> dict:
+    """
+    N_sent per asset: document polarity × σ_real of the price panel.
+
+    Needs prices, so the runner applies it as its own stage after the
+    download instead of holding NLP back.
+    """
+    if signals is None:
+        return nlp
+
+    stress = sentiment_stress(signals["polarity"], signals["postings"], realized_volatility(panel))
+    per_asset = {ticker: dict(values) for ticker, values in nlp["per_asset"].items()}
+    for ticker, values in stress.items():
+        if ticker in per_asset:
+            per_asset[ticker]["stress"] = round(values["N_sent"], 4)
+    return {**nlp, "per_asset": per_asset}
+
+
+def summarize_nlp(
+    per_asset: Dict[str, dict],
+    topic_clusters: Dict[str, List[str]],
+) -> dict:
+    """
+    Universe-level NLP outputs derived from per-asset results
+    (also used to recombine sharded per-asset results).
+    """
     global_sentiment = round(
         sum(v["shift"] for v in per_asset.values()), 4
     )
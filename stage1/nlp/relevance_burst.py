@@ -11,50 +11,49 @@ Canon reference:
 - Deterministic, missing data excluded
 """
 
-from typing import List
-from collections import Counter
+from typing import List, Union
+
+import numpy as np
+
+from stage1.nlp.token_counts import TokenCounts, as_counts
 
 
 def relevance_burst_signal(
-    documents: List[List[str]],
-    baseline_documents: List[List[str]],
+    documents: Union[List[List[str]], TokenCounts],
+    baseline_documents: Union[List[List[str]], TokenCounts],
 ) -> float:
     """
     Compute relevance and burst signal.
 
     Args:
-        documents: Current window of tokenized documents
+        documents: Current window of tokenized documents (or TokenCounts)
         baseline_documents: Historical baseline tokenized documents
+            (or TokenCounts over the same vocabulary)
 
     Returns:
         Normalized relevance/burst signal ∈ [0,1]
     """
-    if not documents or not baseline_documents:
-        return 0.0
+    current = as_counts(documents)
+    baseline = as_counts(baseline_documents, current.vocab)
 
-    current_tokens = [token for doc in documents for token in doc]
-    baseline_tokens = [token for doc in baseline_documents for token in doc]
-
-    if not current_tokens or not baseline_tokens:
+    if current.n_docs == 0 or baseline.n_docs == 0:
         return 0.0
 
-    current_counts = Counter(current_tokens)
-    baseline_counts = Counter(baseline_tokens)
-
-    scores = []
-
-    for token, curr_freq in current_counts.items():
-        base_freq = baseline_counts.get(token, 0)
-
-        if base_freq == 0:
-            continue
+    if current.n_tokens == 0 or baseline.n_tokens == 0:
+        return 0.0
 
-        burst_ratio = curr_freq / base_freq
-        scores.append(burst_ratio)
+    if baseline.vocab is not current.vocab:
+        raise RuntimeError("Burst counts must share one vocabulary")
 
-    if not scores:
+    # Tokens present in both windows (sparse vectors sorted by id)
+    shared, curr_idx, base_idx = np.intersect1d(
+        current.ids, baseline.ids, assume_unique=True, return_indices=True
+    )
+    if not len(shared):
         return 0.0
 
+    burst_ratio = current.tf[curr_idx] / baseline.tf[base_idx]
+
     # Normalize burst score into [0,1]
-    raw_score = sum(scores) / len(scores)
+    raw_score = float(burst_ratio.mean())
     return min(max(raw_score, 0.0), 1.0)
@@ -0,0 +1,481 @@
+"""
+Classical NLP Relevance Index — TF-IDF / BM25
+
+Incrementally maintained inverted index over a rolling document
+window, scoring document relevance to entities with BM25.
+
+Documents are stored in per-day partitions, each holding its own
+postings and document-frequency counts. Adding a day updates the
+global df table and length totals in place; days leaving the window
+are subtracted the same way. Nothing is re-vectorized: a saved day
+partition (save_day / load_day) is merged back without re-analyzing
+its documents.
+
+In hashing mode, terms are replaced by feature-hash buckets, so the
+df table is a per-bucket sketch bounded by the feature width.
+
+Canon reference:
+- TF-IDF + BM25 relevance, corpus = last 30d documents
+- N_relevance = mean(top 10 relevance scores)
+- All outputs ∈ [0,1]
+- Deterministic, missing data excluded
+"""
+
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import os
+import re
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+
+if TYPE_CHECKING:
+    from stage1.nlp.hashing import HashingVectorizer, IdfSketch
+
+CORPUS_DAYS = 30
+TOP_K = 10
+NGRAM_RANGE = (1, 2)
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9$][a-z0-9.&'-]*")
+
+# Same tokens plus newline document separators (batch tokenization)
+_BATCH_RE = re.compile(_TOKEN_RE.pattern + r"|\n")
+
+# Compact English stop list (config/nlp.yaml: stop_words: english)
+STOP_WORDS = frozenset(
+    """
+    a about above after again against all am an and any are as at be
+    because been before being below between both but by can could did
+    do does doing down during each few for from further had has have
+    having he her here hers herself him himself his how i if in into is
+    it its itself just me more most my myself no nor not now of off on
+    once only or other our ours ourselves out over own same she should
+    so some such than that the their theirs them themselves then there
+    these they this those through to too under until up very was we
+    were what when where which while who whom why will with would you
+    your yours yourself yourselves
+    """.split()
+)
+
+Document = Union[str, Sequence[str]]
+
+
+def tokenize(document: Document, stop_words: frozenset = STOP_WORDS) -> List[str]:
+    """
+    Lowercased, stop-word-filtered unigram tokens of one document.
+
+    Strings are tokenized; token lists are used as given (lowercased).
+    """
+    if isinstance(document, str):
+        tokens = _TOKEN_RE.findall(document.lower())
+    else:
+        tokens = [t.lower() for t in document]
+
+    tokens = [t.strip(".'-$") for t in tokens]
+    return [t for t in tokens if t and t not in stop_words]
+
+
+def tokenize_batch(
+    documents: Sequence[Document],
+    stop_words: frozenset = STOP_WORDS,
+) -> Tuple[List[str], List[int]]:
+    """
+    tokenize() over a batch: one regex pass over the joined text.
+
+    Returns:
+        (tokens of all documents concatenated, tokens per document)
+    """
+    if not all(isinstance(d, str) for d in documents):
+        per_doc = [tokenize(d, stop_words) for d in documents]
+        return [t for doc in per_doc for t in doc], [len(doc) for doc in per_doc]
+
+    text = "\n".join(d.replace("\n", " ") for d in documents).lower() + "\n"
+    tokens = [t.strip(".'-$") for t in _BATCH_RE.findall(text)]
+    tokens = [t for t in tokens if t and t not in stop_words]
+
+    # Separator positions give document boundaries
+    separators = [i for i, t in enumerate(tokens) if t == "\n"]
+    lengths = np.diff([-1] + separators) - 1
+    return [t for t in tokens if t != "\n"], lengths.tolist()
+
+
+def analyze(
+    document: Document,
+    ngram_range: Tuple[int, int] = NGRAM_RANGE,
+    stop_words: frozenset = STOP_WORDS,
+) -> List[str]:
+    """
+    Lowercased, stop-word-filtered n-gram terms of one document.
+    """
+    tokens = tokenize(document, stop_words)
+
+    lo, hi = ngram_range
+    terms: List[str] = []
+    for n in range(lo, hi + 1):
+        terms.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+    return terms
+
+
+def _as_day(day: Union[str, date, pd.Timestamp]) -> date:
+    return pd.Timestamp(day).date()
+
+
+def _bucket_rows(buckets: List[List[int]], n_features: int) -> csr_matrix:
+    """
+    (n_docs, n_features) CSR indicator rows of each document's buckets.
+    """
+    indices = np.fromiter((b for doc in buckets for b in doc), dtype=np.int64)
+    indptr = np.concatenate([[0], np.cumsum([len(doc) for doc in buckets])])
+    return csr_matrix((np.ones(len(indices)), indices, indptr), shape=(len(buckets), n_features))
+
+
+class _DayPartition:
+    """
+    One day's documents: ids, lengths, postings and df counts.
+    """
+
+    def __init__(self):
+        self.doc_ids: List[str] = []
+        self.lengths: List[int] = []
+        self.df: Counter = Counter()
+        # Hashed mode: the day's unique-bucket rows, subtracted on eviction
+        self.chunks: list = []
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._frozen: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def add(self, doc_id: str, terms: List[str]) -> Counter:
+        local = len(self.doc_ids)
+        self.doc_ids.append(doc_id)
+        self.lengths.append(len(terms))
+
+        tf = Counter(terms)
+        for term, count in tf.items():
+            self._postings.setdefault(term, []).append((local, count))
+            self._frozen.pop(term, None)
+        self.df.update(tf.keys())
+        return tf
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Flat (term, doc, tf) postings plus ids and lengths, for saving.
+        """
+        terms = list(self._postings)
+        entries = [e for term in terms for e in self._postings[term]]
+        docs, tf = np.array(entries, dtype=np.int64).reshape(-1, 2).T
+        return {
+            "doc_ids": np.array(self.doc_ids, dtype=str),
+            "lengths": np.array(self.lengths, dtype=np.int64),
+            "terms": np.array(terms, dtype=np.int64 if terms and isinstance(terms[0], int) else str),
+            "offsets": np.cumsum([0] + [len(self._postings[t]) for t in terms], dtype=np.int64),
+            "docs": docs,
+            "tf": tf,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, n_features: Optional[int] = None) -> "_DayPartition":
+        """
+        Rebuild a saved partition (bucket rows too, in hashed mode).
+        """
+        partition = cls()
+        partition.doc_ids = arrays["doc_ids"].tolist()
+        partition.lengths = arrays["lengths"].tolist()
+
+        offsets = arrays["offsets"].tolist()
+        docs, tf = arrays["docs"].tolist(), arrays["tf"].tolist()
+        buckets: List[List[int]] = [[] for _ in partition.doc_ids]
+        for i, term in enumerate(arrays["terms"].tolist()):
+            entries = list(zip(docs[offsets[i]:offsets[i + 1]], tf[offsets[i]:offsets[i + 1]]))
+            partition._postings[term] = entries
+            partition.df[term] = len(entries)
+            if n_features is not None:
+                for doc, _ in entries:
+                    buckets[doc].append(term)
+
+        if n_features is not None and buckets:
+            partition.chunks.append(_bucket_rows(buckets, n_features))
+        return partition
+
+    def postings(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        (local doc indices, term frequencies) for a term, as arrays.
+        """
+        if term not in self._frozen:
+            entries = self._postings.get(term)
+            if not entries:
+                return None
+            docs, counts = zip(*entries)
+            self._frozen[term] = (np.array(docs), np.array(counts, dtype=np.float64))
+        return self._frozen[term]
+
+
+class InvertedIndex:
+    """
+    Rolling-window inverted index with BM25 scoring.
+
+    Attributes:
+        window_days: Calendar days kept (the canon 30d corpus)
+        df: Global document frequency per term over the window (an
+            IdfSketch over the buckets in hashed mode)
+        n_docs: Documents in the window
+        hashing: Optional HashingVectorizer; terms become bucket ids
+    """
+
+    def __init__(
+        self,
+        window_days: int = CORPUS_DAYS,
+        k1: float = BM25_K1,
+        b: float = BM25_B,
+        ngram_range: Tuple[int, int] = NGRAM_RANGE,
+        hashing: Optional["HashingVectorizer"] = None,
+    ):
+        self.window_days = window_days
+        self.k1 = k1
+        self.b = b
+        self.ngram_range = hashing.ngram_range if hashing is not None else ngram_range
+        self.hashing = hashing
+
+        self.df: Union[Counter, "IdfSketch"] = Counter()
+        if hashing is not None:
+            # Imported here: hashing builds on this module
+            from stage1.nlp.hashing import IdfSketch
+
+            self.df = IdfSketch(hashing.n_features)
+        self.n_docs = 0
+        self._total_length = 0
+        self._days: Dict[date, _DayPartition] = {}
+
+    # -------------------------
+    # Maintenance
+    # -------------------------
+
+    def _terms(self, document: Document) -> list:
+        if self.hashing is not None:
+            return self.hashing.bucket_terms(document)
+        return analyze(document, self.ngram_range)
+
+    @property
+    def days(self) -> List[date]:
+        return sorted(self._days)
+
+    @property
+    def avg_length(self) -> float:
+        return self._total_length / self.n_docs if self.n_docs else 0.0
+
+    def add_documents(
+        self,
+        day: Union[str, date, pd.Timestamp],
+        documents: Iterable[Document],
+        doc_ids: Optional[Sequence[str]] = None,
+    ) -> int:
+        """
+        Index one day's documents and evict days outside the window.
+
+        Args:
+            day: Publication day of the documents
+            documents: Raw texts or token lists
+            doc_ids: Optional ids (default "<day>:<n>")
+
+        Returns:
+            Documents added
+        """
+        day = _as_day(day)
+        partition = self._days.setdefault(day, _DayPartition())
+
+        documents = list(documents)
+        if doc_ids is None:
+            start = len(partition.doc_ids)
+            doc_ids = [f"{day.isoformat()}:{start + i}" for i in range(len(documents))]
+        elif len(doc_ids) != len(documents):
+            raise ValueError("doc_ids must match documents")
+
+        buckets: List[List[int]] = []
+        for doc_id, document in zip(doc_ids, documents):
+            terms = self._terms(document)
+            tf = partition.add(doc_id, terms)
+            if self.hashing is not None:
+                buckets.append(list(tf))
+            else:
+                self.df.update(tf.keys())
+            self.n_docs += 1
+            self._total_length += len(terms)
+
+        if buckets:
+            rows = _bucket_rows(buckets, self.hashing.n_features)
+            self.df.update(rows)
+            partition.chunks.append(rows)
+
+        self.evict_before(max(self._days) - timedelta(days=self.window_days - 1))
+        return len(documents)
+
+    def day_size(self, day: Union[str, date, pd.Timestamp]) -> int:
+        """
+        Documents indexed for one day.
+        """
+        partition = self._days.get(_as_day(day))
+        return len(partition.doc_ids) if partition is not None else 0
+
+    def save_day(self, day: Union[str, date, pd.Timestamp], path: Union[str, Path]) -> None:
+        """
+        Save one day's partition (postings, lengths) as .npz.
+        """
+        path = Path(path)
+        # Per-process temporary: concurrent shard jobs share the corpus
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, **self._days[_as_day(day)].arrays())
+        os.replace(tmp, path)
+
+    def load_day(self, day: Union[str, date, pd.Timestamp], path: Union[str, Path]) -> int:
+        """
+        Merge a partition saved by save_day() in place of re-indexing
+        the day's documents, and evict days outside the window.
+
+        Returns:
+            Documents added
+        """
+        day = _as_day(day)
+        if day in self._days:
+            raise ValueError(f"Day already indexed: {day}")
+
+        with np.load(path, allow_pickle=False) as data:
+            partition = _DayPartition.from_arrays(
+                data, self.hashing.n_features if self.hashing is not None else None
+            )
+
+        self._days[day] = partition
+        if self.hashing is not None:
+            for rows in partition.chunks:
+                self.df.update(rows)
+        else:
+            self.df.update(partition.df)
+        self.n_docs += len(partition.doc_ids)
+        self._total_length += sum(partition.lengths)
+
+        self.evict_before(max(self._days) - timedelta(days=self.window_days - 1))
+        return len(partition.doc_ids)
+
+    def evict_before(self, cutoff: Union[str, date, pd.Timestamp]) -> int:
+        """
+        Drop every day earlier than `cutoff`, subtracting its statistics.
+
+        Returns:
+            Documents evicted
+        """
+        cutoff = _as_day(cutoff)
+        evicted = 0
+
+        for day in [d for d in self._days if d < cutoff]:
+            partition = self._days.pop(day)
+            if self.hashing is not None:
+                for rows in partition.chunks:
+                    self.df.subtract(rows)
+            else:
+                self.df.subtract(partition.df)
+            self.n_docs -= len(partition.doc_ids)
+            self._total_length -= sum(partition.lengths)
+            evicted += len(partition.doc_ids)
+
+        if evicted and self.hashing is None:
+            self.df = +self.df  # drop zero counts
+        return evicted
+
+    # -------------------------
+    # Scoring
+    # -------------------------
+
+    def doc_freq(self, term) -> int:
+        if self.hashing is not None:
+            return int(self.df.df[term])
+        return self.df.get(term, 0)
+
+    def idf(self, term: str) -> float:
+        """
+        BM25 idf (non-negative form): log(1 + (N − df + 0.5) / (df + 0.5)).
+        """
+        df = self.doc_freq(term)
+        return float(np.log1p((self.n_docs - df + 0.5) / (df + 0.5)))
+
+    def score(self, query: Document) -> Tuple[List[str], np.ndarray]:
+        """
+        Normalized BM25 score of every document in the window.
+
+        Each term's saturated tf component is bounded by (k1 + 1),
+        so dividing by Σ idf·(k1 + 1) over the query maps scores
+        into [0,1].
+
+        Returns:
+            (doc ids, (n_docs,) scores ∈ [0,1]) in day order
+        """
+        terms = sorted(set(self._terms(query)))
+        idf = {t: self.idf(t) for t in terms if self.doc_freq(t)}
+
+        doc_ids: List[str] = []
+        blocks: List[np.ndarray] = []
+        bound = sum(idf.values()) * (self.k1 + 1)
+        avg = self.avg_length or 1.0
+
+        for day in self.days:
+            partition = self._days[day]
+            doc_ids.extend(partition.doc_ids)
+            scores = np.zeros(len(partition.doc_ids))
+
+            if bound > 0:
+                lengths = np.asarray(partition.lengths, dtype=np.float64)
+                norm = self.k1 * (1 - self.b + self.b * lengths / avg)
+
+                for term, weight in idf.items():
+                    posting = partition.postings(term)
+                    if posting is None:
+                        continue
+                    docs, tf = posting
+                    scores[docs] += weight * tf * (self.k1 + 1) / (tf + norm[docs])
+
+                scores /= bound
+
+            blocks.append(scores)
+
+        return doc_ids, np.concatenate(blocks) if blocks else np.zeros(0)
+
+    def relevance(self, query: Document, top_k: int = TOP_K) -> float:
+        """
+        N_relevance: mean of the top-k normalized BM25 scores.
+
+        Documents not matching the query count as 0; with fewer than
+        top_k documents in the window, the mean is over all of them.
+        """
+        _, scores = self.score(query)
+        if not len(scores):
+            return 0.0
+
+        k = min(top_k, len(scores))
+        top = np.partition(scores, len(scores) - k)[-k:]
+        return min(max(float(top.mean()), 0.0), 1.0)
+
+
+def entity_query(asset: Dict[str, str]) -> List[str]:
+    """
+    Query tokens for one universe entry: ticker plus asset name.
+    """
+    ticker = asset["ticker"].lower()
+    name = asset.get("asset_name", "")
+    return [ticker] + _TOKEN_RE.findall(name.lower())
+
+
+def relevance_scores(
+    index: InvertedIndex,
+    universe: List[Dict[str, str]],
+    top_k: int = TOP_K,
+) -> Dict[str, float]:
+    """
+    N_relevance per universe entity.
+    """
+    return {
+        asset["ticker"]: index.relevance(entity_query(asset), top_k)
+        for asset in universe
+    }
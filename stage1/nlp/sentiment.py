@@ -4,13 +4,37 @@ Classical NLP Sentiment Polarity Module
 Computes sentiment strength using a deterministic
 lexicon-based approach.
 
+Weighted-lexicon mode scores a whole document batch at once: the
+batch becomes a sparse doc-term matrix over the lexicon terms, and
+per-document polarity is two sparse matrix–vector products. The
+lexicon is a local CSV (config/nlp.yaml: sentiment.lexicon_path),
+falling back to the built-in word lists.
+
 Canon reference:
-- N_sent
+- Lexicon polarity p_i
+- S = mean(p_i) * σ_real, σ_real = std(log returns, 20d)
+- N_sent = clip(|S| / 2, 0, 1)
 - All outputs ∈ [0,1]
 - Deterministic, missing data excluded
 """
 
-from typing import List
+from typing import Dict, List, Optional, Sequence, Union
+import csv
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from stage1.ingestion.price_panel import PricePanel
+from stage1.nlp.relevance_index import Document, analyze, tokenize_batch
+from stage1.nlp.token_counts import TokenCounts, as_counts
+from stage1.quant.panel_ops import right_align
+from utils.io import load_yaml_config
+
+NLP_CONFIG = "config/nlp.yaml"
+VOL_WINDOW = 20
+STRESS_SCALE = 2.0
+
+_EDGE_BASE = 1 << 32
 
 
 # Minimal, deterministic sentiment lexicon
@@ -25,34 +49,225 @@ NEGATIVE_WORDS = {
 }
 
 
-def sentiment_signal(documents: List[List[str]]) -> float:
+def sentiment_signal(documents: Union[List[List[str]], TokenCounts]) -> float:
     """
     Compute sentiment polarity signal.
 
     Args:
-        documents: Tokenized documents
+        documents: Tokenized documents, or their TokenCounts record
 
     Returns:
         Normalized sentiment signal ∈ [0,1]
     """
-    if not documents:
+    if not isinstance(documents, TokenCounts) and not documents:
         return 0.0
 
-    pos_count = 0
-    neg_count = 0
-
-    for doc in documents:
-        for token in doc:
-            if token in POSITIVE_WORDS:
-                pos_count += 1
-            elif token in NEGATIVE_WORDS:
-                neg_count += 1
+    counts = as_counts(documents)
 
-    total = pos_count + neg_count
+    total = counts.pos + counts.neg
     if total == 0:
         return 0.0
 
-    imbalance = abs(pos_count - neg_count) / total
+    imbalance = abs(counts.pos - counts.neg) / total
 
     # Already normalized to [0,1]
     return min(max(imbalance, 0.0), 1.0)
+
+
+# -------------------------
+# Weighted lexicon
+# -------------------------
+
+def _normalize_term(term: str) -> str:
+    return " ".join(analyze(term, (1, 1), frozenset()))
+
+
+def load_lexicon(path: Optional[str] = None) -> Dict[str, float]:
+    """
+    Weighted sentiment lexicon: term -> weight ∈ [-1, 1].
+
+    Args:
+        path: CSV of `term,weight` rows (header and "#" comments
+            allowed; multi-word terms allowed). Default:
+            config/nlp.yaml sentiment.lexicon_path, or the built-in
+            word lists (±1) when none is configured.
+
+    Raises:
+        RuntimeError if the file cannot be read or a weight is invalid
+    """
+    if path is None:
+        path = (load_yaml_config(NLP_CONFIG).get("sentiment") or {}).get("lexicon_path")
+
+    if not path:
+        lexicon = {t: 1.0 for t in POSITIVE_WORDS}
+        lexicon.update({t: -1.0 for t in NEGATIVE_WORDS})
+        return lexicon
+
+    lexicon: Dict[str, float] = {}
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = [r for r in csv.reader(f) if r and not r[0].lstrip().startswith("#")]
+    except OSError as e:
+        raise RuntimeError(f"Failed to load sentiment lexicon: {path}") from e
+
+    for n, row in enumerate(rows):
+        try:
+            weight = float(row[1])
+        except (IndexError, ValueError):
+            if n == 0:
+                continue  # header
+            raise RuntimeError(f"Invalid lexicon row {n + 1} in {path}: {row}")
+
+        if not -1.0 <= weight <= 1.0:
+            raise RuntimeError(f"Lexicon weight outside [-1, 1] in {path}: {row}")
+
+        term = _normalize_term(row[0])
+        if term and weight:
+            lexicon[term] = weight
+
+    return lexicon
+
+
+class LexiconScorer:
+    """
+    Batch polarity scoring against a weighted lexicon.
+
+    Multi-word terms are matched with a token trie walked for every
+    position of the batch at once (one vectorized step per term
+    length), so scoring cost is one dict lookup per token.
+
+    Attributes:
+        terms: Lexicon terms (doc-term matrix columns)
+        weights: (L,) term weights
+    """
+
+    def __init__(self, lexicon: Optional[Dict[str, float]] = None):
+        lexicon = lexicon if lexicon is not None else load_lexicon()
+        self.terms: List[str] = sorted(lexicon)
+        self.weights = np.array([lexicon[t] for t in self.terms], dtype=np.float64)
+        self.max_ngram = max((len(t.split()) for t in self.terms), default=1)
+
+        # Token trie over lexicon terms: edge key = state · 2^32 + word id
+        self._words: Dict[str, int] = {}
+        edges: Dict[int, int] = {}
+        terminal = [-1]
+        for column, term in enumerate(self.terms):
+            state = 0
+            for word in term.split():
+                key = state * _EDGE_BASE + self._words.setdefault(word, len(self._words))
+                if key not in edges:
+                    edges[key] = len(terminal)
+                    terminal.append(-1)
+                state = edges[key]
+            terminal[state] = column
+
+        keys = sorted(edges)
+        self._edge_keys = np.array(keys, dtype=np.int64)
+        self._edge_states = np.array([edges[k] for k in keys], dtype=np.int64)
+        self._terminal = np.array(terminal, dtype=np.int64)
+
+    def _word_ids(self, documents: Sequence[Document]):
+        """
+        Lexicon word id per token (−1 otherwise), concatenated, plus
+        the document of each token.
+        """
+        tokens, lengths = tokenize_batch(documents, frozenset())
+        lookup = self._words.get
+        ids = np.array([lookup(t, -1) for t in tokens], dtype=np.int64)
+        return ids, np.repeat(np.arange(len(lengths)), lengths)
+
+    def doc_term_matrix(self, documents: Sequence[Document]) -> csr_matrix:
+        """
+        (n_docs, L) sparse lexicon-term counts.
+        """
+        ids, doc = self._word_ids(documents)
+
+        rows: List[np.ndarray] = []
+        cols: List[np.ndarray] = []
+        if len(self._edge_keys):
+            start = np.nonzero(ids >= 0)[0]
+            state = np.zeros(len(start), dtype=np.int64)
+
+            for k in range(self.max_ngram):
+                pos = start + k
+                alive = pos < len(ids)
+                alive[alive] &= doc[pos[alive]] == doc[start[alive]]
+                start, pos, state = start[alive], pos[alive], state[alive]
+
+                key = state * _EDGE_BASE + ids[pos]
+                j = np.minimum(np.searchsorted(self._edge_keys, key), len(self._edge_keys) - 1)
+                found = (self._edge_keys[j] == key) & (ids[pos] >= 0)
+                start, state = start[found], self._edge_states[j[found]]
+
+                term = self._terminal[state]
+                matched = term >= 0
+                rows.append(doc[start[matched]])
+                cols.append(term[matched])
+
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        cols = np.concatenate(cols) if cols else np.zeros(0, dtype=np.int64)
+
+        # Duplicate (row, col) entries are summed into term counts
+        return csr_matrix(
+            (np.ones(len(rows)), (rows, cols)),
+            shape=(len(documents), len(self.terms)),
+        )
+
+    def polarity(self, documents: Sequence[Document]) -> np.ndarray:
+        """
+        Per-document polarity p_i = Σ w·tf / Σ |w|·tf ∈ [-1, 1]
+        (NaN for documents without lexicon terms).
+        """
+        X = self.doc_term_matrix(documents)
+        signed = X @ self.weights
+        mass = X @ np.abs(self.weights)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(mass > 0, signed / mass, np.nan)
+
+
+# -------------------------
+# Vol-adjusted sentiment stress
+# -------------------------
+
+def realized_volatility(panel: PricePanel, window: int = VOL_WINDOW) -> Dict[str, float]:
+    """
+    σ_real = population std of each asset's last `window` log returns
+    (assets with fewer returns are excluded).
+    """
+    if len(panel.dates) <= window:
+        return {}
+
+    rets = right_align(panel.log_returns())[-window:]
+    full = ~np.isnan(rets).any(axis=0)
+    sigma = np.where(full, np.nan_to_num(rets).std(axis=0), np.nan)
+
+    return {t: float(s) for t, s, ok in zip(panel.tickers, sigma, full) if ok}
+
+
+def sentiment_stress(
+    polarity: np.ndarray,
+    postings: Dict[str, np.ndarray],
+    sigma: Dict[str, float],
+) -> Dict[str, Dict[str, float]]:
+    """
+    Vol-adjusted sentiment per asset.
+
+    Args:
+        polarity: (n_docs,) document polarity (NaN = no lexicon terms)
+        postings: Asset -> indices of its documents
+        sigma: Asset -> σ_real
+
+    Returns:
+        Asset -> {S, N_sent} for assets with scored documents and σ_real
+    """
+    out = {}
+    for ticker, rows in postings.items():
+        p = polarity[rows]
+        p = p[~np.isnan(p)]
+        if not len(p) or ticker not in sigma:
+            continue
+
+        S = float(p.mean()) * sigma[ticker]
+        out[ticker] = {"S": S, "N_sent": min(max(abs(S) / STRESS_SCALE, 0.0), 1.0)}
+    return out
@@ -0,0 +1,230 @@
+"""
+Classical NLP Token Counts — Single-Pass Counting Record
+
+One streaming pass over a document batch produces a compact counts
+record shared by every lexical NLP component (sentiment, conflict,
+burst), instead of each component re-walking the tokens.
+
+Tokens are interned into integer ids by a Vocabulary; the record
+holds the sparse term-frequency vector as sorted (ids, counts)
+arrays, polarity counts, and document/token totals.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+
+class Vocabulary:
+    """
+    Token interning table: token <-> integer id, plus a per-id
+    lexicon polarity (+1 positive, -1 negative, 0 neutral).
+
+    Lexicon tokens are interned first, so they hold the lowest ids.
+    """
+
+    def __init__(self, positive: Iterable[str] = (), negative: Iterable[str] = ()):
+        self._ids: Dict[str, int] = {}
+        self.tokens: List[str] = []
+
+        seed = [(t, 1) for t in sorted(positive)] + [(t, -1) for t in sorted(negative)]
+        for token, _ in seed:
+            self.intern(token)
+        self._lexicon = np.array([p for _, p in seed], dtype=np.int8)
+        self._polarity = self._lexicon
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def get(self, token: str) -> Optional[int]:
+        return self._ids.get(token)
+
+    def intern(self, token: str) -> int:
+        token_id = self._ids.get(token)
+        if token_id is None:
+            token_id = len(self.tokens)
+            self._ids[token] = token_id
+            self.tokens.append(token)
+        return token_id
+
+    def ids(self, tokens: Sequence[str]) -> List[int]:
+        """
+        Intern a token sequence (one dict lookup per known token).
+        """
+        lookup = self._ids.get
+        out = []
+        for token in tokens:
+            token_id = lookup(token)
+            out.append(self.intern(token) if token_id is None else token_id)
+        return out
+
+    def polarity(self) -> np.ndarray:
+        """
+        (V,) lexicon polarity per id; tokens interned later are neutral.
+        """
+        if len(self._polarity) != len(self.tokens):
+            polarity = np.zeros(len(self.tokens), dtype=np.int8)
+            polarity[: len(self._lexicon)] = self._lexicon
+            self._polarity = polarity
+        return self._polarity
+
+
+_DEFAULT_VOCABULARY: Optional[Vocabulary] = None
+
+
+def lexicon_vocabulary() -> Vocabulary:
+    """
+    Fresh vocabulary seeded with the sentiment lexicon.
+    """
+    # Imported here: sentiment itself consumes TokenCounts
+    from stage1.nlp.sentiment import NEGATIVE_WORDS, POSITIVE_WORDS
+
+    return Vocabulary(POSITIVE_WORDS, NEGATIVE_WORDS)
+
+
+def default_vocabulary() -> Vocabulary:
+    """
+    Process-wide vocabulary seeded with the sentiment lexicon, so
+    records built separately share ids.
+
+    It only grows: long-lived owners (CorpusStore) hold their own
+    vocabulary instead, and reset_default_vocabulary() releases it.
+    """
+    global _DEFAULT_VOCABULARY
+    if _DEFAULT_VOCABULARY is None:
+        _DEFAULT_VOCABULARY = lexicon_vocabulary()
+    return _DEFAULT_VOCABULARY
+
+
+def reset_default_vocabulary() -> None:
+    """
+    Drop the process-wide vocabulary (records built before the reset
+    keep referring to the old one).
+    """
+    global _DEFAULT_VOCABULARY
+    _DEFAULT_VOCABULARY = None
+
+
+class TokenCounts:
+    """
+    Counts record for one document batch.
+
+    Attributes:
+        vocab: Vocabulary the ids refer to
+        ids: (V,) sorted unique token ids present
+        tf: (V,) term frequency per id
+        n_docs: Documents in the batch
+        n_tokens: Tokens in the batch
+        pos: Positive-lexicon tokens
+        neg: Negative-lexicon tokens
+    """
+
+    def __init__(
+        self,
+        vocab: Vocabulary,
+        ids: np.ndarray,
+        tf: np.ndarray,
+        n_docs: int,
+        pos: int,
+        neg: int,
+    ):
+        self.vocab = vocab
+        self.ids = ids
+        self.tf = tf
+        self.n_docs = n_docs
+        self.n_tokens = int(tf.sum())
+        self.pos = pos
+        self.neg = neg
+
+    @classmethod
+    def from_documents(
+        cls,
+        documents: Iterable[Sequence[str]],
+        vocab: Optional[Vocabulary] = None,
+        weights: Optional[Sequence[int]] = None,
+    ) -> "TokenCounts":
+        """
+        Single streaming pass: intern every token once, then count
+        term frequencies and polarity with NumPy.
+
+        Args:
+            documents: Tokenized documents
+            vocab: Interning table (default: process-wide vocabulary)
+            weights: Optional copies per document (e.g. dedup counts);
+                each document counts `weight` times
+        """
+        vocab = vocab or default_vocabulary()
+
+        stream: List[int] = []
+        lengths: List[int] = []
+        for doc in documents:
+            ids = vocab.ids(doc)
+            stream.extend(ids)
+            lengths.append(len(ids))
+
+        return cls.from_ids(
+            np.asarray(stream, dtype=np.int64), lengths, vocab, weights
+        )
+
+    @classmethod
+    def from_ids(
+        cls,
+        stream_ids: np.ndarray,
+        lengths: Sequence[int],
+        vocab: Optional[Vocabulary] = None,
+        weights: Optional[Sequence[int]] = None,
+    ) -> "TokenCounts":
+        """
+        Count already-interned documents (e.g. read from the corpus store).
+
+        Args:
+            stream_ids: Token ids of all documents, concatenated
+            lengths: Tokens per document
+            vocab: Vocabulary the ids refer to
+            weights: Optional copies per document
+        """
+        vocab = vocab or default_vocabulary()
+        stream_ids = np.asarray(stream_ids, dtype=np.int64)
+
+        if weights is None:
+            n_docs = len(lengths)
+            ids, tf = np.unique(stream_ids, return_counts=True)
+        else:
+            weights = np.asarray(weights, dtype=np.int64)
+            if len(weights) != len(lengths):
+                raise ValueError("weights must match documents")
+            n_docs = int(weights.sum())
+            ids, inverse = np.unique(stream_ids, return_inverse=True)
+            tf = np.bincount(
+                inverse, weights=np.repeat(weights, lengths), minlength=len(ids)
+            ).astype(np.int64)
+
+        polarity = vocab.polarity()[ids]
+
+        return cls(
+            vocab,
+            ids,
+            tf,
+            n_docs,
+            pos=int(tf[polarity > 0].sum()),
+            neg=int(tf[polarity < 0].sum()),
+        )
+
+    def frequency(self, token: str) -> int:
+        """
+        Term frequency of one token (0 if absent).
+        """
+        token_id = self.vocab.get(token)
+        if token_id is None:
+            return 0
+        j = np.searchsorted(self.ids, token_id)
+        return int(self.tf[j]) if j < len(self.ids) and self.ids[j] == token_id else 0
+
+
+def as_counts(documents, vocab: Optional[Vocabulary] = None) -> TokenCounts:
+    """
+    Accept either a TokenCounts record or tokenized documents.
+    """
+    if isinstance(documents, TokenCounts):
+        return documents
+    return TokenCounts.from_documents(documents, vocab)
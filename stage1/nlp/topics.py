@@ -0,0 +1,466 @@
+"""
+Classical NLP Topics — Incremental Clustering for Narrative Conflict
+
+Mini-batch (spherical) k-means over sparse, L2-normalized TF-IDF
+document vectors. Each day's documents update the centroids once;
+the 37-day window is never re-clustered.
+
+With a HashingVectorizer the feature space is the fixed hashed
+width instead of a capped vocabulary, so an unbounded corpus never
+grows the model. Centroids and the 37 day snapshots are dense
+k × width, so the topic model has its own width cap
+(TOPIC_MAX_FEATURES) and refuses wider vectorizers; topic_vectorizer()
+narrows the configured one.
+
+Every update stores a snapshot of the centroids and a per-entity
+histogram of topic assignments for that day. An entity's topic
+profile over a window is the assignment-weighted sum of the day
+snapshots, so narrative drift is measured against the topics as
+they stood when the documents arrived. Profile cosines are taken
+through the snapshot Gram matrix, never materializing an
+(entities × width) profile.
+
+Canon reference:
+- Cluster cosine distance between last 7d and prior 30d topics
+- N_conflict = clip(distance / 0.6, 0, 1)
+- All outputs ∈ [0,1]
+- Deterministic, missing data excluded (empty window ⇒ no score)
+"""
+
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+
+from stage1.nlp.hashing import HashingVectorizer, IdfSketch, configured_vectorizer
+from stage1.nlp.relevance_index import Document, NGRAM_RANGE, analyze
+from stage1.nlp.token_counts import Vocabulary
+
+TOPIC_K = 10
+MAX_FEATURES = 5000
+
+# Widest feature space the topic model accepts (dense k × width state)
+TOPIC_MAX_FEATURES = 1 << 13
+SHORT_DAYS = 7
+PRIOR_DAYS = 30
+CONFLICT_SCALE = 0.6
+
+DEFAULT_STATE_PATH = os.getenv("FIA_TOPIC_STATE", ".cache/nlp/topic_state.npz")
+
+
+def topic_vectorizer() -> Optional[HashingVectorizer]:
+    """
+    The configured HashingVectorizer narrowed to TOPIC_MAX_FEATURES
+    (None for the vocabulary TF-IDF method).
+    """
+    hashing = configured_vectorizer()
+    if hashing is None or hashing.n_features <= TOPIC_MAX_FEATURES:
+        return hashing
+    return HashingVectorizer(TOPIC_MAX_FEATURES, hashing.ngram_range, hashing.stop_words)
+
+
+class TopicModel:
+    """
+    Incremental topic model with per-day centroid snapshots.
+
+    Attributes:
+        k: Number of topics
+        max_features: Feature cap; terms first seen after the cap is
+            reached are ignored (config/nlp.yaml: max_features)
+        idf: Running document frequencies over the features
+        centroids: (k, max_features) current topic centroids
+        counts: (k,) documents absorbed per centroid
+        hashing: Optional HashingVectorizer (max_features = its width)
+        day: Latest day updated
+    """
+
+    def __init__(
+        self,
+        k: int = TOPIC_K,
+        max_features: int = MAX_FEATURES,
+        ngram_range: Tuple[int, int] = NGRAM_RANGE,
+        hashing: Optional[HashingVectorizer] = None,
+    ):
+        if hashing is not None:
+            max_features, ngram_range = hashing.n_features, hashing.ngram_range
+        if max_features > TOPIC_MAX_FEATURES:
+            raise ValueError(
+                f"Topic feature width {max_features} exceeds {TOPIC_MAX_FEATURES} "
+                "(use topic_vectorizer())"
+            )
+
+        self.k = k
+        self.max_features = max_features
+        self.ngram_range = ngram_range
+        self.hashing = hashing
+
+        self.vocab = Vocabulary()
+        self.idf = IdfSketch(max_features)
+
+        self.centroids = np.zeros((k, max_features))
+        self.counts = np.zeros(k, dtype=np.int64)
+        self.seeded = 0
+
+        self.day: Optional[date] = None
+        self._snapshots: Dict[date, np.ndarray] = {}
+        self._histograms: Dict[date, Dict[str, np.ndarray]] = {}
+
+    # -------------------------
+    # Vectorization
+    # -------------------------
+
+    def _term_ids(self, document: Document) -> List[int]:
+        lookup = self.vocab.get
+        ids = []
+        for term in analyze(document, self.ngram_range):
+            term_id = lookup(term)
+            if term_id is None and len(self.vocab.tokens) < self.max_features:
+                term_id = self.vocab.intern(term)
+            if term_id is not None:
+                ids.append(term_id)
+        return ids
+
+    def _vectorize(self, documents: Sequence[Document]):
+        """
+        CSR-style TF-IDF rows (L2-normalized); updates the idf sketch first.
+
+        Returns:
+            (indptr (n+1,), indices, data)
+        """
+        if self.hashing is not None:
+            X = self.hashing.transform(documents)
+            indices, tf = X.indices.astype(np.int64), X.data
+            rows = np.repeat(np.arange(len(documents)), np.diff(X.indptr))
+            indptr = X.indptr
+        else:
+            stream: List[int] = []
+            lengths: List[int] = []
+            for document in documents:
+                ids = self._term_ids(document)
+                stream.extend(ids)
+                lengths.append(len(ids))
+
+            # One unique over (row, term) keys gives sorted CSR entries
+            keys = np.repeat(np.arange(len(lengths)), lengths) * self.max_features
+            keys += np.asarray(stream, dtype=np.int64)
+            keys, tf = np.unique(keys, return_counts=True)
+            rows, indices = np.divmod(keys, self.max_features)
+            tf = tf.astype(np.float64)
+            indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=len(documents)))])
+            X = csr_matrix((tf, indices, indptr), shape=(len(documents), self.max_features))
+
+        # Smoothed idf: log((1 + N) / (1 + df)) + 1
+        self.idf.update(X)
+        data = tf * self.idf.idf(indices)
+
+        # Signed hashing can cancel a document to zero: leave it zero
+        norms = np.sqrt(np.bincount(rows, weights=data ** 2, minlength=len(documents)))[rows]
+        data = np.divide(data, norms, out=np.zeros_like(data), where=norms > 0)
+        return np.asarray(indptr, dtype=np.int64), indices, data
+
+    # -------------------------
+    # Clustering
+    # -------------------------
+
+    def _seed(self, indptr, indices, data) -> None:
+        """
+        Fill empty centroids with the first distinct documents.
+        """
+        for i in range(len(indptr) - 1):
+            if self.seeded == self.k:
+                return
+            lo, hi = indptr[i], indptr[i + 1]
+            if lo == hi:
+                continue
+
+            vector = np.zeros(self.max_features)
+            vector[indices[lo:hi]] = data[lo:hi]
+            if self.seeded and (self.centroids[: self.seeded] @ vector).max() > 1 - 1e-9:
+                continue
+
+            self.centroids[self.seeded] = vector
+            self.seeded += 1
+
+    def _assign(self, indptr, indices, data) -> np.ndarray:
+        """
+        Nearest centroid (cosine) per document; −1 for empty documents.
+        """
+        n = len(indptr) - 1
+        labels = np.full(n, -1)
+        lengths = np.diff(indptr)
+        nonempty = np.nonzero(lengths)[0]
+        if not len(nonempty) or not self.seeded:
+            return labels
+
+        norms = np.linalg.norm(self.centroids, axis=1)
+        unit = np.divide(
+            self.centroids, norms[:, None],
+            out=np.zeros_like(self.centroids), where=norms[:, None] > 0,
+        )
+
+        contributions = data[:, None] * unit[:, indices].T  # (nnz, k)
+        sims = np.add.reduceat(contributions, indptr[nonempty], axis=0)
+        sims[:, self.seeded:] = -np.inf
+        labels[nonempty] = sims.argmax(axis=1)
+        return labels
+
+    def partial_fit(self, documents: Sequence[Document]) -> np.ndarray:
+        """
+        One mini-batch k-means step over a batch of documents.
+
+        All documents are assigned with the pre-update centroids; each
+        centroid then moves to the running mean of every document it
+        has absorbed (per-centroid learning rate 1 / count).
+
+        Returns:
+            (n,) topic label per document (−1 if it has no features)
+        """
+        indptr, indices, data = self._vectorize(documents)
+        self._seed(indptr, indices, data)
+        labels = self._assign(indptr, indices, data)
+
+        rows = np.repeat(labels, np.diff(indptr))
+        keep = rows >= 0
+        sums = np.bincount(
+            rows[keep] * self.max_features + indices[keep],
+            weights=data[keep],
+            minlength=self.k * self.max_features,
+        ).reshape(self.k, self.max_features)
+        m = np.bincount(labels[labels >= 0], minlength=self.k)
+
+        total = self.counts + m
+        moved = m > 0
+        self.centroids[moved] = (
+            self.counts[moved, None] * self.centroids[moved] + sums[moved]
+        ) / total[moved, None]
+        self.counts = total
+        return labels
+
+    # -------------------------
+    # Daily updates
+    # -------------------------
+
+    def update(
+        self,
+        day: Union[str, date, pd.Timestamp],
+        documents: Sequence[Document],
+        entities: Sequence[Sequence[str]],
+    ) -> np.ndarray:
+        """
+        Absorb one day's documents and record per-entity topic counts.
+
+        Args:
+            day: Publication day (not earlier than the last update)
+            documents: Raw texts or token lists
+            entities: Entities linked to each document
+
+        Returns:
+            (n,) topic label per document
+        """
+        day = pd.Timestamp(day).date()
+        if self.day is not None and day < self.day:
+            raise RuntimeError(f"Topic update for {day} precedes state day {self.day}")
+        if len(entities) != len(documents):
+            raise ValueError("entities must match documents")
+
+        labels = self.partial_fit(documents)
+
+        histograms = self._histograms.setdefault(day, {})
+        for label, linked in zip(labels, entities):
+            if label < 0:
+                continue
+            for entity in linked:
+                if entity not in histograms:
+                    histograms[entity] = np.zeros(self.k, dtype=np.int64)
+                histograms[entity][label] += 1
+
+        self._snapshots[day] = self.centroids.astype(np.float32)
+        self.day = day
+
+        cutoff = day - timedelta(days=SHORT_DAYS + PRIOR_DAYS - 1)
+        for old in [d for d in self._snapshots if d < cutoff]:
+            del self._snapshots[old]
+            self._histograms.pop(old, None)
+        return labels
+
+    def adopt(self, other: "TopicModel", entities: Sequence[str]) -> None:
+        """
+        Take the topic histograms of `entities` from a model updated
+        with the same documents (a shard's copy of this state).
+        """
+        if other.day != self.day:
+            raise RuntimeError("Topic states were not updated over the same days")
+
+        wanted = set(entities)
+        for day, histograms in other._histograms.items():
+            target = self._histograms.setdefault(day, {})
+            for entity, counts in histograms.items():
+                if entity in wanted:
+                    target[entity] = counts
+
+    # -------------------------
+    # Scores
+    # -------------------------
+
+    def _histogram_matrix(
+        self,
+        entities: List[str],
+        days: List[date],
+        start: date,
+        end: date,
+    ) -> np.ndarray:
+        """
+        (E, D·k) topic assignments per entity and snapshot row, for
+        days in [start, end]; profile = this @ stacked snapshots.
+        """
+        index = {e: i for i, e in enumerate(entities)}
+        H = np.zeros((len(entities), len(days) * self.k))
+
+        for j, day in enumerate(days):
+            if not start <= day <= end:
+                continue
+            for entity, counts in self._histograms.get(day, {}).items():
+                if entity in index:
+                    H[index[entity], j * self.k:(j + 1) * self.k] = counts
+        return H
+
+    def entities(self) -> List[str]:
+        return sorted({e for h in self._histograms.values() for e in h})
+
+    def distances(self) -> Dict[str, Optional[float]]:
+        """
+        Cosine distance between each entity's last-7d and prior-30d
+        topic profiles (None if either window has no documents).
+        """
+        if self.day is None:
+            return {}
+
+        entities = self.entities()
+        short_start = self.day - timedelta(days=SHORT_DAYS - 1)
+        prior_end = short_start - timedelta(days=1)
+        prior_start = prior_end - timedelta(days=PRIOR_DAYS - 1)
+
+        days = sorted(self._snapshots)
+        snapshots = np.concatenate([self._snapshots[d] for d in days]).astype(np.float64)
+        gram = snapshots @ snapshots.T  # (D·k, D·k)
+
+        short = self._histogram_matrix(entities, days, short_start, self.day)
+        prior = self._histogram_matrix(entities, days, prior_start, prior_end)
+
+        short_gram = short @ gram
+        dots = (short_gram * prior).sum(axis=1)
+        norms = np.sqrt(
+            np.maximum((short_gram * short).sum(axis=1), 0.0)
+            * np.maximum(((prior @ gram) * prior).sum(axis=1), 0.0)
+        )
+
+        present = norms > 0
+        cosine = np.divide(dots, norms, out=np.zeros_like(dots), where=present)
+        distance = 1.0 - cosine
+        return {
+            e: float(max(d, 0.0)) if ok else None
+            for e, d, ok in zip(entities, distance, present)
+        }
+
+    def conflict(self) -> Dict[str, Optional[float]]:
+        """
+        N_conflict = clip(distance / 0.6, 0, 1) per entity.
+        """
+        return {
+            e: None if d is None else min(max(d / CONFLICT_SCALE, 0.0), 1.0)
+            for e, d in self.distances().items()
+        }
+
+    # -------------------------
+    # Persistence
+    # -------------------------
+
+    def save(self, path: Union[str, Path] = DEFAULT_STATE_PATH) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        days = sorted(self._snapshots)
+        rows = [
+            (i, entity, counts)
+            for i, day in enumerate(days)
+            for entity, counts in sorted(self._histograms.get(day, {}).items())
+        ]
+
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                k=self.k,
+                max_features=self.max_features,
+                ngram_range=np.array(self.ngram_range),
+                hashing=self.hashing is not None,
+                tokens=np.array(self.vocab.tokens, dtype=str),
+                df=self.idf.df,
+                n_docs=self.idf.n_docs,
+                centroids=self.centroids,
+                counts=self.counts,
+                seeded=self.seeded,
+                day=np.array(
+                    "NaT" if self.day is None else self.day.isoformat(),
+                    dtype="datetime64[D]",
+                ),
+                days=np.array([d.isoformat() for d in days], dtype="datetime64[D]"),
+                snapshots=(
+                    np.stack([self._snapshots[d] for d in days])
+                    if days else np.zeros((0, self.k, self.max_features), dtype=np.float32)
+                ),
+                hist_day=np.array([r[0] for r in rows], dtype=np.int64),
+                hist_entity=np.array([r[1] for r in rows], dtype=str),
+                hist_counts=(
+                    np.stack([r[2] for r in rows])
+                    if rows else np.zeros((0, self.k), dtype=np.int64)
+                ),
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path] = DEFAULT_STATE_PATH) -> "TopicModel":
+        """
+        Restore saved state, or a fresh model (configured features,
+        narrowed by topic_vectorizer()) if none exists.
+        """
+        path = Path(path)
+        if not path.exists():
+            return cls(hashing=topic_vectorizer())
+
+        with np.load(path, allow_pickle=False) as data:
+            ngram_range = tuple(int(n) for n in data["ngram_range"])
+            hashing = (
+                HashingVectorizer(int(data["max_features"]), ngram_range)
+                if "hashing" in data.files and bool(data["hashing"])
+                else None
+            )
+            model = cls(
+                int(data["k"]),
+                int(data["max_features"]),
+                ngram_range,
+                hashing,
+            )
+            model.vocab.ids(data["tokens"].tolist())
+            model.idf.df = data["df"]
+            model.idf.n_docs = int(data["n_docs"])
+            model.centroids = data["centroids"]
+            model.counts = data["counts"]
+            model.seeded = int(data["seeded"])
+
+            day = data["day"][()]
+            model.day = None if np.isnat(day) else pd.Timestamp(day).date()
+
+            days = [pd.Timestamp(d).date() for d in data["days"]]
+            model._snapshots = dict(zip(days, data["snapshots"]))
+            model._histograms = {d: {} for d in days}
+            for i, entity, counts in zip(
+                data["hist_day"], data["hist_entity"].tolist(), data["hist_counts"]
+            ):
+                model._histograms[days[i]][entity] = counts
+
+        return model
@@ -8,46 +8,67 @@ Canon reference:
 - Correlation breakdown via rolling off-diagonal deltas
 - All outputs ∈ [0,1]
 - Deterministic, missing data excluded
-"""
 
-from typing import Dict, List
-import statistics
+Both window correlation matrices are computed at once as products
+of column-standardized return matrices. The canon rolling form
+(ΔC over a 20d correlation matrix vs its 60-value history) is kept
+incrementally via running cross-product sums.
+"""
 
+from typing import Dict, List, Union
 
-def _returns(series: List[float]) -> List[float]:
-    return [
-        (series[i] - series[i - 1]) / series[i - 1]
-        for i in range(1, len(series))
-        if series[i - 1] != 0
-    ]
+import numpy as np
 
+from stage1.ingestion.price_panel import PricePanel
+from stage1.quant.panel_ops import right_align
+from utils.math import ZERO_VARIANCE_RTOL, standardize_columns
 
-def _correlation(x: List[float], y: List[float]) -> float:
-    if len(x) != len(y) or len(x) < 2:
-        raise ValueError("Invalid series length")
 
-    mean_x = statistics.mean(x)
-    mean_y = statistics.mean(y)
+def _returns(series: np.ndarray) -> np.ndarray:
+    """
+    Simple returns; steps from a zero price are excluded.
+    """
+    p = np.asarray(series, dtype=np.float64)
+    prev, curr = p[:-1], p[1:]
+    nonzero = prev != 0
+    return (curr[nonzero] - prev[nonzero]) / prev[nonzero]
 
-    num = sum((a - mean_x) * (b - mean_y) for a, b in zip(x, y))
-    den_x = sum((a - mean_x) ** 2 for a in x)
-    den_y = sum((b - mean_y) ** 2 for b in y)
 
-    if den_x == 0 or den_y == 0:
-        raise ValueError("Zero variance")
+def _return_matrix(
+    price_series: Union[PricePanel, Dict[str, List[float]]],
+    length: int,
+) -> np.ndarray:
+    """
+    Last `length` returns of every asset with enough history, as a
+    (length, M) matrix. Assets with shorter histories are excluded.
+    """
+    if isinstance(price_series, PricePanel):
+        r = price_series.returns()
+        r[~np.isfinite(r)] = np.nan
+        aligned = right_align(r)[-length:]
+        if len(aligned) < length:
+            return np.empty((length, 0))
+        return aligned[:, ~np.isnan(aligned).any(axis=0)]
 
-    return num / (den_x * den_y) ** 0.5
+    columns = [
+        r[-length:]
+        for r in (_returns(p) for p in price_series.values())
+        if len(r) >= length
+    ]
+    if not columns:
+        return np.empty((length, 0))
+    return np.column_stack(columns)
 
 
 def correlation_breakdown_signal(
-    price_series: Dict[str, List[float]],
+    price_series: Union[PricePanel, Dict[str, List[float]]],
     window: int,
 ) -> float:
     """
     Compute correlation breakdown signal.
 
     Args:
-        price_series: Mapping asset -> ordered price series
+        price_series: PricePanel or mapping asset -> ordered price series
         window: Rolling window length for correlation
 
     Returns:
@@ -56,39 +77,197 @@ def correlation_breakdown_signal(
     if len(price_series) < 2:
         return 0.0
 
-    returns = {}
-    for asset, prices in price_series.items():
-        r = _returns(prices)
-        if len(r) >= window * 2:
-            returns[asset] = r
-
-    assets = list(returns.keys())
-    if len(assets) < 2:
+    returns = _return_matrix(price_series, 2 * window)
+    if returns.shape[1] < 2:
         return 0.0
 
-    deltas = []
-
-    for i in range(len(assets)):
-        for j in range(i + 1, len(assets)):
-            a, b = assets[i], assets[j]
-            r1, r2 = returns[a], returns[b]
-
-            try:
-                corr_prev = _correlation(
-                    r1[-2 * window:-window],
-                    r2[-2 * window:-window],
-                )
-                corr_curr = _correlation(
-                    r1[-window:],
-                    r2[-window:],
-                )
-                deltas.append(abs(corr_curr - corr_prev))
-            except ValueError:
-                continue
-
-    if not deltas:
+    z_prev, valid_prev = standardize_columns(returns[:window])
+    z_curr, valid_curr = standardize_columns(returns[window:])
+
+    # Pairs with zero variance in either window are excluded
+    valid = valid_prev & valid_curr
+    k = int(valid.sum())
+    if k < 2:
         return 0.0
 
+    z_prev, z_curr = z_prev[:, valid], z_curr[:, valid]
+    deltas = np.abs(z_curr.T @ z_curr - z_prev.T @ z_prev)
+    np.fill_diagonal(deltas, 0.0)
+
     # Normalize into [0,1]
-    value = sum(deltas) / len(deltas)
+    value = float(deltas.sum() / 2.0) / (k * (k - 1) / 2)
     return min(max(value, 0.0), 1.0)
+
+
+# ---------------------------------------------------------------------
+# Canon rolling correlation (ΔC = |C_t − mean(C_{t−60:t})|)
+# ---------------------------------------------------------------------
+
+CANON_CORR_WINDOW = 20
+CANON_CORR_LOOKBACK = 60
+CANON_CORR_SCALE = 0.4
+
+
+class RollingCorrelation:
+    """
+    Rolling N×N correlation over the last `window` rows, maintained
+    through running sums and cross-products.
+
+    Each update adds the incoming row and retires the outgoing one,
+    costing O(N²) instead of recomputing the window. Sums are rebuilt
+    exactly from the buffer every `rebase_every` updates to bound
+    floating-point drift on long runs.
+    """
+
+    def __init__(self, n_assets: int, window: int, rebase_every: int = 252):
+        self.window = window
+        self.rebase_every = rebase_every
+        self._buffer = np.zeros((window, n_assets))
+        self._sum = np.zeros(n_assets)
+        self._cross = np.zeros((n_assets, n_assets))
+        self._count = 0
+        self._updates = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._count >= self.window
+
+    def update(self, row: np.ndarray) -> None:
+        slot = self._updates % self.window
+
+        if self._count >= self.window:
+            old = self._buffer[slot]
+            self._sum -= old
+            self._cross -= np.outer(old, old)
+        else:
+            self._count += 1
+
+        self._buffer[slot] = row
+        self._sum += row
+        self._cross += np.outer(row, row)
+        self._updates += 1
+
+        if self._updates % self.rebase_every == 0:
+            rows = self._buffer[: self._count]
+            self._sum = rows.sum(axis=0)
+            self._cross = rows.T @ rows
+
+    def matrix(self) -> np.ndarray:
+        """
+        Current correlation matrix (NaN rows/cols for zero variance).
+        """
+        n = self._count
+        mean = self._sum / n
+        cov = self._cross / n - np.outer(mean, mean)
+
+        var = np.diag(cov).copy()
+        scale = np.abs(self._buffer[:n]).max(axis=0, initial=0.0)
+        valid = np.sqrt(np.maximum(var, 0.0)) > ZERO_VARIANCE_RTOL * scale
+
+        std = np.where(valid, np.sqrt(np.where(valid, var, 1.0)), np.nan)
+        return cov / np.outer(std, std)
+
+    def average_correlation(self) -> float:
+        """
+        Average off-diagonal correlation C_t over non-degenerate assets.
+        """
+        corr = self.matrix()
+        valid = ~np.isnan(np.diag(corr))
+        k = int(valid.sum())
+        if k < 2:
+            return float("nan")
+
+        sub = corr[np.ix_(valid, valid)]
+        return float((sub.sum() - np.trace(sub)) / (k * (k - 1)))
+
+
+def _aligned_returns(
+    price_series: Union[PricePanel, Dict[str, List[float]]],
+    length: int,
+) -> np.ndarray:
+    """
+    Trailing `length` returns per asset, date-aligned for a panel
+    (assets with gaps in the block are excluded) and right-aligned
+    for undated series.
+    """
+    if not isinstance(price_series, PricePanel):
+        return _return_matrix(price_series, length)
+
+    r = price_series.returns()[-length:]
+    if len(r) < length:
+        return np.empty((length, 0))
+    return r[:, np.isfinite(r).all(axis=0)]
+
+
+def correlation_history(
+    returns: np.ndarray,
+    window: int = CANON_CORR_WINDOW,
+) -> np.ndarray:
+    """
+    Average off-diagonal rolling correlation C_t for every row at
+    which a full window is available.
+
+    Args:
+        returns: (T, N) fully-populated return matrix
+
+    Returns:
+        (T - window + 1,) C_t series (NaN where undefined)
+    """
+    engine = RollingCorrelation(returns.shape[1], window)
+    history = []
+
+    for row in returns:
+        engine.update(row)
+        if engine.ready:
+            history.append(engine.average_correlation())
+
+    return np.asarray(history)
+
+
+def rolling_correlation_signal(
+    price_series: Union[PricePanel, Dict[str, List[float]]],
+    window: int = CANON_CORR_WINDOW,
+    lookback: int = CANON_CORR_LOOKBACK,
+) -> dict:
+    """
+    Canon correlation breakdown Q_corr with its C_t history.
+
+    Args:
+        price_series: PricePanel or mapping asset -> ordered price series
+        window: Rolling correlation window (trading days)
+        lookback: Number of prior C values forming the baseline
+
+    Returns:
+        {q_corr ∈ [0,1], delta_c, history: C_t series (oldest → newest)}
+    """
+    returns = _aligned_returns(price_series, window + lookback)
+    return rolling_correlation_from_returns(returns, window)
+
+
+def rolling_correlation_from_returns(
+    returns: np.ndarray,
+    window: int = CANON_CORR_WINDOW,
+) -> dict:
+    """
+    Canon Q_corr from a fully-populated (window + lookback, N) return
+    block; every C_t before the last forms the baseline.
+    """
+    empty = {"q_corr": 0.0, "delta_c": None, "history": []}
+
+    if returns.shape[1] < 2 or len(returns) <= window:
+        return empty
+
+    history = correlation_history(returns, window)
+    current, baseline = history[-1], history[:-1]
+    baseline = baseline[~np.isnan(baseline)]
+
+    if np.isnan(current) or len(baseline) == 0:
+        return {**empty, "history": history.tolist()}
+
+    delta_c = abs(current - float(baseline.mean()))
+
+    return {
+        "q_corr": min(max(delta_c / CANON_CORR_SCALE, 0.0), 1.0),
+        "delta_c": delta_c,
+        "history": history.tolist(),
+    }
@@ -10,9 +10,14 @@ Canon reference:
 - Deterministic, missing data excluded
 """
 
-from typing import List
+from typing import Dict, List, Optional, Union
 import statistics
 
+import numpy as np
+
+from stage1.ingestion.price_panel import PricePanel
+from stage1.quant.panel_ops import right_align, rolling_moments
+
 
 def mean_reversion_signal(
     price_series: List[float],
@@ -46,3 +51,51 @@ def mean_reversion_signal(
 
     # Normalize into [0,1]
     return min(max(deviation, 0.0), 1.0)
+
+
+def mean_reversion_matrix(
+    prices: np.ndarray,
+    window: int,
+    window_mean: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Latest mean reversion signal for every column of a price panel.
+
+    Args:
+        prices: (T, N) right-aligned price matrix
+        window: Lookback window for moving average
+        window_mean: Optional precomputed rolling mean of `prices`
+
+    Returns:
+        (N,) signals ∈ [0,1]; 0.0 where history is insufficient
+    """
+    T, N = prices.shape
+    counts = (~np.isnan(prices)).sum(axis=0)
+    if T <= window:
+        return np.zeros(N)
+
+    if window_mean is None:
+        window_mean = rolling_moments(prices, window)[0]
+
+    mean = window_mean[-1]
+    current = prices[-1]
+
+    valid = (counts > window) & (mean != 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deviation = np.abs(current - mean) / mean
+
+    return np.where(valid, np.clip(deviation, 0.0, 1.0), 0.0)
+
+
+def mean_reversion_panel(
+    prices: Union[PricePanel, Dict[str, List[float]]],
+    window: int,
+) -> Dict[str, float]:
+    """
+    Mean reversion signal for every asset.
+    """
+    if not isinstance(prices, PricePanel):
+        prices = PricePanel.from_lists(prices)
+
+    signals = mean_reversion_matrix(right_align(prices.values, prices.mask), window)
+    return dict(zip(prices.tickers, signals.tolist()))
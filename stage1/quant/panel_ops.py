@@ -0,0 +1,113 @@
+"""
+Panel Operations — Shared Vectorized Primitives
+
+Whole-panel NumPy building blocks used by the quant engine and
+the standalone quant modules. All functions operate on (T, N)
+time × asset matrices with NaN marking missing observations.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+def right_align(values: np.ndarray, valid: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Compress each column's valid entries to the bottom of the matrix.
+
+    Row order within a column is preserved; the freed top rows are NaN.
+    The result lets "last w observations" be read as values[-w:] for
+    every asset at once, regardless of calendar gaps.
+    """
+    if valid is None:
+        valid = ~np.isnan(values)
+
+    T = values.shape[0]
+    order = np.argsort(valid, axis=0, kind="stable")
+    aligned = np.take_along_axis(values, order, axis=0)
+
+    counts = valid.sum(axis=0)
+    rows = np.arange(T)[:, None]
+    return np.where(rows >= T - counts, aligned, np.nan)
+
+
+def restore_alignment(aligned: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """
+    Inverse of right_align: scatter each column's compressed rows
+    back to the positions marked valid; other positions are NaN.
+    """
+    order = np.argsort(valid, axis=0, kind="stable")
+    out = np.empty_like(aligned)
+    np.put_along_axis(out, order, aligned, axis=0)
+    return np.where(valid, out, np.nan)
+
+
+def log_returns(prices: Sequence[float]) -> np.ndarray:
+    """
+    Log returns of one ordered series; steps touching a non-positive
+    price are excluded.
+    """
+    p = np.asarray(prices, dtype=np.float64)
+    prev, curr = p[:-1], p[1:]
+    valid = (prev > 0) & (curr > 0)
+    return np.log(curr[valid] / prev[valid])
+
+
+def rolling_moments(values: np.ndarray, window: int, ddof: int = 0):
+    """
+    Rolling mean and standard deviation down each column in O(T)
+    via prefix sums.
+
+    Row t holds the statistics of rows t-window+1..t; rows whose
+    window is incomplete or touches a NaN are NaN. Columns are
+    centered on their mean first to limit cancellation in the sum
+    of squares, and variances within prefix-sum rounding error of
+    zero are snapped to exactly zero.
+
+    Returns:
+        (mean, std), each (T, N)
+    """
+    T, N = values.shape
+    mean = np.full((T, N), np.nan)
+    std = np.full((T, N), np.nan)
+    if T < window or window <= ddof:
+        return mean, std
+
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    center = filled.sum(axis=0) / np.maximum(valid.sum(axis=0), 1)
+    x = np.where(valid, values - center, 0.0)
+
+    zero = np.zeros((1, N))
+    s1 = np.concatenate([zero, np.cumsum(x, axis=0)])
+    s2 = np.concatenate([zero, np.cumsum(x * x, axis=0)])
+    n = np.concatenate([zero, np.cumsum(valid, axis=0)])
+
+    w1 = s1[window:] - s1[:-window]
+    w2 = s2[window:] - s2[:-window]
+    full = (n[window:] - n[:-window]) == window
+
+    spread = w2 - w1 * w1 / window
+    noise = 8 * np.finfo(np.float64).eps * T * s2[window:]
+    var = np.where(spread > noise, spread, 0.0) / (window - ddof)
+    mean[window - 1:] = np.where(full, w1 / window + center, np.nan)
+    std[window - 1:] = np.where(full, np.sqrt(var), np.nan)
+    return mean, std
+
+
+def rolling_std(values: np.ndarray, window: int, ddof: int = 0) -> np.ndarray:
+    """
+    Rolling standard deviation down each column (see rolling_moments).
+    """
+    return rolling_moments(values, window, ddof)[1]
+
+
+def ema_weights(length: int, alpha: float) -> np.ndarray:
+    """
+    Weights reproducing a recursive EMA seeded with the first value:
+    ema = (1-α)^(L-1)·v_0 + Σ_{k≥1} α(1-α)^(L-1-k)·v_k
+    """
+    powers = (1 - alpha) ** np.arange(length - 1, -1, -1, dtype=np.float64)
+    weights = alpha * powers
+    weights[0] = powers[0]
+    return weights
@@ -0,0 +1,127 @@
+"""
+Sharded Quant Execution
+
+Runs per-asset panel functions across a process pool. The price
+panel is published once as a memory-mapped file; workers map it
+read-only and compute on their own contiguous column shard, so the
+panel is never pickled to workers.
+
+Shards are merged in panel column order, so the result is
+identical to calling the function on the full panel whenever the
+function depends only on each asset's own column — the quant
+engine's per-asset regimes and the per-asset module panels
+(tail_risk_panel, volatility_regime_panel, price_zscore_panel,
+mean_reversion_panel).
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+import os
+import tempfile
+
+import numpy as np
+
+from stage1.ingestion.price_panel import PricePanel
+
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+
+class SharedPanel:
+    """
+    Context manager publishing a panel's values as a memory-mapped
+    file. `descriptor` is the small picklable handle sent to workers.
+    """
+
+    def __init__(self, panel: PricePanel):
+        self._panel = panel
+        self._dir = None
+        self.descriptor: Dict = {}
+
+    def __enter__(self) -> "SharedPanel":
+        self._dir = tempfile.TemporaryDirectory(prefix="fia-panel-")
+        path = Path(self._dir.name) / "values.f8"
+
+        values = self._panel.values
+        mapped = np.memmap(path, dtype=values.dtype, mode="w+", shape=values.shape)
+        mapped[:] = values
+        mapped.flush()
+        del mapped
+
+        self.descriptor = {
+            "path": str(path),
+            "dtype": values.dtype.str,
+            "shape": values.shape,
+            "dates": self._panel.dates,
+            "tickers": self._panel.tickers,
+        }
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._dir.cleanup()
+
+
+def attach_shard(descriptor: Dict, start: int, stop: int) -> PricePanel:
+    """
+    Panel over columns [start, stop) of a published panel.
+    """
+    values = np.memmap(
+        descriptor["path"],
+        dtype=np.dtype(descriptor["dtype"]),
+        mode="r",
+        shape=tuple(descriptor["shape"]),
+    )
+    return PricePanel(
+        descriptor["dates"],
+        descriptor["tickers"][start:stop],
+        values[:, start:stop],
+        np.dtype(descriptor["dtype"]).type,
+    )
+
+
+def _run_shard(fn: Callable, descriptor: Dict, start: int, stop: int, kwargs: Dict) -> Dict:
+    return fn(attach_shard(descriptor, start, stop), **kwargs)
+
+
+def shard_bounds(n_assets: int, shards: int) -> List[Tuple[int, int]]:
+    """
+    Contiguous, near-equal [start, stop) column ranges.
+    """
+    shards = max(1, min(shards, n_assets))
+    edges = np.linspace(0, n_assets, shards + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(edges[:-1], edges[1:]) if b > a]
+
+
+def map_panel_shards(
+    fn: Callable[..., Dict],
+    panel: PricePanel,
+    workers: int = DEFAULT_WORKERS,
+    **kwargs,
+) -> Dict:
+    """
+    Apply a per-asset panel function across a process pool.
+
+    Args:
+        fn: Module-level callable (panel, **kwargs) -> {ticker: result}
+        panel: Full price panel
+        workers: Process count (one contiguous shard per worker)
+
+    Returns:
+        Merged {ticker: result} in panel column order
+    """
+    bounds = shard_bounds(len(panel), workers)
+    if len(bounds) <= 1:
+        return fn(panel, **kwargs)
+
+    with SharedPanel(panel) as shared:
+        with ProcessPoolExecutor(max_workers=len(bounds)) as pool:
+            futures = [
+                pool.submit(_run_shard, fn, shared.descriptor, start, stop, kwargs)
+                for start, stop in bounds
+            ]
+            parts = [f.result() for f in futures]
+
+    merged: Dict = {}
+    for part in parts:
+        merged.update(part)
+    return merged
@@ -8,37 +8,74 @@ Canon reference:
 - Multi-horizon price Z-scores normalized by |z| / 4
 - All outputs ∈ [0,1]
 - Deterministic, missing data excluded
+
+Z-scores for every horizon, timestamp and asset share one set of
+prefix sums, so a full Q_price history costs the same order as
+the latest value.
 """
 
-from typing import List
-import statistics
+from typing import Dict, List, Sequence, Union
+
+import numpy as np
+
+from stage1.ingestion.price_panel import PricePanel
+from stage1.quant.panel_ops import restore_alignment, right_align, rolling_moments
 
+# Canon horizons h ∈ {1d, 5d, 20d, 60d}
+CANON_HORIZONS = [1, 5, 20, 60]
 
-def _zscore(series: List[float]) -> float:
+
+def zscore_matrix(prices: np.ndarray, horizon: int) -> np.ndarray:
     """
-    Compute the Z-score of the most recent value in a series.
+    Z-score of each price against the `horizon` prices before it.
+
+    Args:
+        prices: (T, N) right-aligned price matrix
 
     Returns:
-        Z-score (can be negative or positive)
+        (T, N) z-scores; NaN where the window is incomplete or has
+        zero variance
     """
-    if len(series) < 2:
-        raise ValueError("Insufficient data for z-score")
+    T, N = prices.shape
+    z = np.full((T, N), np.nan)
+    if T <= horizon:
+        return z
 
-    mean = statistics.mean(series[:-1])
-    stdev = statistics.pstdev(series[:-1])
+    mean, std = rolling_moments(prices, horizon, ddof=0)
+    mean, std = mean[:-1], std[:-1]
 
-    if stdev == 0:
-        raise ValueError("Zero variance in series")
+    nonzero = std > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z[1:] = np.where(nonzero, (prices[1:] - mean) / std, np.nan)
 
-    return (series[-1] - mean) / stdev
+    return z
 
 
-def _normalize_z(z: float) -> float:
+def price_stress_matrix(
+    prices: np.ndarray,
+    horizons: Sequence[int] = CANON_HORIZONS,
+) -> np.ndarray:
     """
-    Normalize Z-score per canon: |z| / 4, clamped to [0,1].
+    Q_price at every timestamp: mean over valid horizons of
+    min(1, |z_h| / 4). 0.0 where no horizon is valid; NaN where
+    there is no price.
+
+    Args:
+        prices: (T, N) right-aligned price matrix
     """
-    value = abs(z) / 4.0
-    return min(max(value, 0.0), 1.0)
+    total = np.zeros(prices.shape)
+    count = np.zeros(prices.shape)
+
+    for h in horizons:
+        z = zscore_matrix(prices, h)
+        valid = ~np.isnan(z)
+        total += np.where(valid, np.minimum(np.abs(z) / 4.0, 1.0), 0.0)
+        count += valid
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        q = np.where(count > 0, total / count, 0.0)
+
+    return np.where(np.isnan(prices), np.nan, q)
 
 
 def price_zscore_signal(
@@ -59,21 +96,44 @@ def price_zscore_signal(
         - Horizons with insufficient data are skipped
         - If all horizons are invalid, returns 0.0
     """
-    scores = []
+    if len(price_series) == 0:
+        return 0.0
 
-    for h in horizons:
-        if len(price_series) <= h:
-            continue
+    prices = np.asarray(price_series, dtype=np.float64)[:, None]
+    return float(price_stress_matrix(prices, horizons)[-1, 0])
 
-        window = price_series[-(h + 1):]
 
-        try:
-            z = _zscore(window)
-            scores.append(_normalize_z(z))
-        except ValueError:
-            continue
+def price_zscore_history(
+    prices: Union[PricePanel, Dict[str, List[float]]],
+    horizons: Sequence[int] = CANON_HORIZONS,
+) -> np.ndarray:
+    """
+    Full Q_price history for every asset on the panel's date grid.
 
-    if not scores:
-        return 0.0
+    Each asset's z-scores use its own previous valid closes.
 
-    return sum(scores) / len(scores)
+    Returns:
+        (T, N) Q_price matrix aligned with the panel (NaN where no close)
+    """
+    if not isinstance(prices, PricePanel):
+        prices = PricePanel.from_lists(prices)
+
+    aligned = right_align(prices.values, prices.mask)
+    return restore_alignment(price_stress_matrix(aligned, horizons), prices.mask)
+
+
+def price_zscore_panel(
+    prices: Union[PricePanel, Dict[str, List[float]]],
+    horizons: Sequence[int] = CANON_HORIZONS,
+) -> Dict[str, float]:
+    """
+    Latest Q_price for every asset.
+    """
+    if not isinstance(prices, PricePanel):
+        prices = PricePanel.from_lists(prices)
+
+    latest = price_stress_matrix(right_align(prices.values, prices.mask), horizons)[-1]
+    return {
+        t: 0.0 if np.isnan(q) else float(q)
+        for t, q in zip(prices.tickers, latest.tolist())
+    }
@@ -4,102 +4,188 @@ Quant Engine — Multi-Resolution Regime + Topology
 Outputs:
 - Per-asset regimes (5d / 20d / 60d)
 - Trend breaks, volatility structure
-- Cross-asset correlation graph
+- Sparse cross-asset correlation graph (top-k neighbours + clusters)
+- Rolling average-correlation history and canon Q_corr
 - Deterministic anomaly flags
+
+Consumes the date-aligned PricePanel; cross-asset statistics are
+aligned by date, not by position. Regime statistics for all assets
+and windows are computed in a single vectorized pass.
 """
 
-from typing import Dict, List
-import pandas as pd
+from typing import Dict, List, Union
 import numpy as np
 
+from stage1.ingestion.price_panel import PricePanel
+from stage1.quant.correlation_breakdown import rolling_correlation_signal
+from stage1.quant.panel_ops import right_align
+from stage1.quant.parallel import map_panel_shards
+from stage1.quant.topology import sparse_topology
+
 WINDOWS = [5, 20, 60]
 
 
-def _returns(prices: pd.Series) -> pd.Series:
-    return prices.pct_change().dropna()
+def _regime_panel(aligned: np.ndarray, windows: List[int]) -> Dict[int, dict]:
+    """
+    Regime statistics for every asset and window in one pass.
+
+    Args:
+        aligned: (T, N) right-aligned returns (see panel_ops.right_align)
+        windows: Regime window lengths
+
+    Returns:
+        window -> {valid, mean, vol, trend, zscore} arrays of shape (N,)
+    """
+    counts = (~np.isnan(aligned)).sum(axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        full_mean = np.nanmean(aligned, axis=0)
+        full_std = np.nanstd(aligned, axis=0, ddof=1)
+        zscore = (aligned[-1] - full_mean) / (full_std + 1e-9)
+
+        stats = {}
+        for w in windows:
+            tail = aligned[-w:]
+            valid = counts >= w
+            mean = tail.mean(axis=0)
+            vol = tail.std(axis=0, ddof=1)
+            stats[w] = {
+                "valid": valid,
+                "mean": mean,
+                "vol": vol,
+                "trend": np.sign(mean),
+                "zscore": zscore,
+            }
+
+    return stats
+
+
+def per_asset_regimes(
+    panel: PricePanel,
+    windows: List[int],
+    detect_anomalies: bool,
+) -> Dict[str, dict]:
+    """
+    Per-asset regime payloads for every column of the panel.
+
+    Depends only on each asset's own column, so disjoint column
+    shards can be computed independently and merged.
+    """
+    returns = panel.returns()
+
+    labels = {w: f"{w}d" for w in windows}
+    lists = {}
+    if len(panel):
+        stats = _regime_panel(right_align(returns), windows)
+        lists = {
+            w: {k: v.tolist() for k, v in stats[w].items()}
+            for w in windows
+        }
 
+    per_asset = {}
+    for j, ticker in enumerate(panel.tickers):
+        regimes = {}
+        trends = set()
+        vols = {}
+        anomaly = False
+
+        for w in windows:
+            st = lists[w]
+            if not st["valid"][j]:
+                regimes[labels[w]] = {"valid": False}
+                continue
+
+            regimes[labels[w]] = {
+                "valid": True,
+                "mean": st["mean"][j],
+                "vol": st["vol"][j],
+                "trend": int(st["trend"][j]),
+                "zscore": st["zscore"][j],
+            }
+
+            # ---- Trend break / volatility structure / anomaly ----
+            trends.add(int(st["trend"][j]))
+            vols[labels[w]] = st["vol"][j]
+            anomaly = anomaly or abs(st["zscore"][j]) > 3
 
-def _regime_stats(r: pd.Series, w: int) -> dict:
-    if len(r) < w:
-        return {"valid": False}
+        per_asset[ticker] = {
+            "regimes": regimes,
+            "trend_break": len(trends) > 1,
+            "volatility_structure": vols,
+            "anomaly": detect_anomalies and anomaly,
+        }
 
-    rw = r.rolling(w)
-    vol = rw.std().iloc[-1]
-    mean = rw.mean().iloc[-1]
-    trend = int(np.sign(mean))
+    return per_asset
 
-    z = (r.iloc[-1] - r.mean()) / (r.std() + 1e-9)
+
+def eligible_panel(panel: PricePanel, windows: List[int] = WINDOWS) -> PricePanel:
+    """
+    Assets with enough history for the longest regime window.
+    """
+    eligible = [
+        t for t, n in zip(panel.tickers, panel.counts()) if n >= max(windows)
+    ]
+    return panel if len(eligible) == len(panel) else panel.subset(eligible)
+
+
+def cross_asset_topology(panel: PricePanel) -> dict:
+    """
+    Sparse correlation graph and rolling correlation history over
+    the whole (eligible) universe. Needs every asset at once, so it
+    is the one quant step that cannot run per shard.
+    """
+    if len(panel) < 2:
+        return {}
+
+    returns = panel.returns()
+
+    # Dates on which every eligible asset has a return
+    complete = returns[np.isfinite(returns).all(axis=1)]
+
+    # ---- Canon rolling correlation (C_t history, Q_corr) ----
+    rolling = rolling_correlation_signal(panel)
+    history = rolling["history"]
+    history_dates = panel.dates[len(panel.dates) - len(history):]
 
     return {
-        "valid": True,
-        "mean": float(mean),
-        "vol": float(vol),
-        "trend": trend,
-        "zscore": float(z),
+        **sparse_topology(complete, panel.tickers),
+        "correlation_history": {
+            "dates": [str(d) for d in history_dates],
+            "values": [None if np.isnan(c) else c for c in history],
+        },
+        "q_corr": rolling["q_corr"],
     }
 
 
 def run_quant_analysis(
-    prices: Dict[str, List[float]],
+    prices: Union[PricePanel, Dict[str, List[float]]],
     windows: List[int] = WINDOWS,
     detect_regimes: bool = True,
     detect_anomalies: bool = True,
     build_cross_asset_stats: bool = True,
+    workers: int = 1,
 ) -> dict:
-    # ---- HARD INPUT VALIDATION ----
-    series: Dict[str, pd.Series] = {}
-    for ticker, price_series in prices.items():
-        if not isinstance(price_series, list) or len(price_series) < max(windows):
-            continue
-        series[ticker] = pd.Series(price_series)
-
-    returns = {k: _returns(s) for k, s in series.items()}
-
-    per_asset = {}
-    for ticker, r in returns.items():
-        regimes = {f"{w}d": _regime_stats(r, w) for w in windows}
-
-        # ---- Trend break: sign flip across resolutions ----
-        trends = [
-            regimes[f"{w}d"]["trend"]
-            for w in windows
-            if regimes[f"{w}d"]["valid"]
-        ]
-        trend_break = len(set(trends)) > 1 if trends else False
-
-        # ---- Volatility structure ----
-        vols = {
-            f"{w}d": regimes[f"{w}d"]["vol"]
-            for w in windows
-            if regimes[f"{w}d"]["valid"]
-        }
-
-        # ---- Deterministic anomaly ----
-        anomaly = detect_anomalies and any(
-            abs(regimes[f"{w}d"].get("zscore", 0)) > 3
-            for w in windows
-            if regimes[f"{w}d"]["valid"]
+    if not isinstance(prices, PricePanel):
+        prices = PricePanel.from_lists(
+            {t: p for t, p in prices.items() if isinstance(p, list)}
         )
 
-        per_asset[ticker] = {
-            "regimes": regimes,
-            "trend_break": trend_break,
-            "volatility_structure": vols,
-            "anomaly": anomaly,
-        }
+    # ---- HARD INPUT VALIDATION ----
+    panel = eligible_panel(prices, windows)
+
+    if workers > 1 and len(panel) > 1:
+        per_asset = map_panel_shards(
+            per_asset_regimes,
+            panel,
+            workers,
+            windows=windows,
+            detect_anomalies=detect_anomalies,
+        )
+    else:
+        per_asset = per_asset_regimes(panel, windows, detect_anomalies)
 
     # ---- Cross-asset topology ----
-    topology = {}
-    if build_cross_asset_stats and len(returns) > 1:
-        df = pd.DataFrame(returns).dropna()
-        corr = df.corr()
-
-        topology = {
-            "correlation": corr.to_dict(),
-            "coherent_clusters": (
-                (corr.abs() > 0.6).sum(axis=1)
-            ).to_dict(),
-        }
+    topology = cross_asset_topology(panel) if build_cross_asset_stats else {}
 
     return {
         "per_asset": per_asset,
@@ -0,0 +1,230 @@
+"""
+Quant Signal Registry — Shared-Intermediate Kernel Pipeline
+
+Runs every registered Q-component kernel over one PricePanel.
+Intermediates (returns, log returns, right-aligned matrices,
+rolling moments, validity masks) are computed once per panel and
+shared by all kernels; per-asset components feed aggregate_q in a
+single batch.
+
+Canon reference:
+- Q = mean(Q_price, Q_vol, Q_corr, Q_mr, Q_tail)
+- Missing data ⇒ component excluded, never imputed
+"""
+
+from typing import Callable, Dict, Iterable, Optional, Tuple
+import time
+
+import numpy as np
+
+from stage1.ingestion.price_panel import PricePanel
+from stage1.quant.correlation_breakdown import (
+    CANON_CORR_LOOKBACK,
+    CANON_CORR_WINDOW,
+    rolling_correlation_from_returns,
+)
+from stage1.quant.mean_reversion import mean_reversion_matrix
+from stage1.quant.panel_ops import right_align, rolling_moments
+from stage1.quant.price_zscore import CANON_HORIZONS, price_stress_matrix
+from stage1.quant.tail_risk import MIN_RETURNS, monte_carlo_expected_shortfall, normalize_mc_tail
+from stage1.quant.volatility_regime import volatility_regime_matrix
+from stage1.synthesis.quant_aggregate import aggregate_q_batch
+
+VOL_REALIZED_WINDOW = 20
+VOL_EMA_WINDOW = 60
+MR_WINDOW = 60
+
+
+class SignalContext:
+    """
+    Lazily computed, cached intermediates for one panel.
+    """
+
+    def __init__(self, panel: PricePanel):
+        self.panel = panel
+        self._cache: Dict[Tuple, np.ndarray] = {}
+
+    def _cached(self, key: Tuple, compute: Callable[[], object]):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    @property
+    def n_assets(self) -> int:
+        return len(self.panel)
+
+    @property
+    def price_counts(self) -> np.ndarray:
+        return self._cached(("price_counts",), self.panel.counts)
+
+    @property
+    def returns(self) -> np.ndarray:
+        """(T, N) date-aligned simple returns."""
+        return self._cached(("returns",), self.panel.returns)
+
+    @property
+    def log_returns(self) -> np.ndarray:
+        """(T, N) date-aligned log returns."""
+        return self._cached(("log_returns",), self.panel.log_returns)
+
+    @property
+    def aligned_prices(self) -> np.ndarray:
+        """(T, N) right-aligned closes."""
+        return self._cached(
+            ("aligned_prices",),
+            lambda: right_align(self.panel.values, self.panel.mask),
+        )
+
+    @property
+    def aligned_log_returns(self) -> np.ndarray:
+        """(T, N) right-aligned log returns."""
+        return self._cached(("aligned_log_returns",), lambda: right_align(self.log_returns))
+
+    def price_moments(self, window: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Rolling (mean, pstd) of aligned closes."""
+        return self._cached(
+            ("price_moments", window),
+            lambda: rolling_moments(self.aligned_prices, window),
+        )
+
+    def log_return_moments(self, window: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Rolling (mean, pstd) of aligned log returns."""
+        return self._cached(
+            ("log_return_moments", window),
+            lambda: rolling_moments(self.aligned_log_returns, window),
+        )
+
+
+# ---------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------
+
+Kernel = Callable[[SignalContext], np.ndarray]
+
+KERNELS: Dict[str, Kernel] = {}
+
+
+def register_kernel(name: str) -> Callable[[Kernel], Kernel]:
+    """
+    Register a kernel producing one (N,) Q component per asset.
+    NaN marks an excluded (missing) value.
+    """
+    def decorator(fn: Kernel) -> Kernel:
+        if name in KERNELS:
+            raise RuntimeError(f"Duplicate quant kernel: {name}")
+        KERNELS[name] = fn
+        return fn
+
+    return decorator
+
+
+@register_kernel("Q_price")
+def _price_kernel(ctx: SignalContext) -> np.ndarray:
+    q = price_stress_matrix(ctx.aligned_prices, CANON_HORIZONS)
+    return q[-1] if len(q) else np.full(ctx.n_assets, np.nan)
+
+
+@register_kernel("Q_vol")
+def _vol_kernel(ctx: SignalContext) -> np.ndarray:
+    stats = volatility_regime_matrix(
+        ctx.aligned_log_returns,
+        ctx.price_counts,
+        VOL_REALIZED_WINDOW,
+        VOL_EMA_WINDOW,
+        rolling_vol=ctx.log_return_moments(VOL_REALIZED_WINDOW)[1],
+    )
+    return np.where(stats["valid"], stats["signal"], np.nan)
+
+
+@register_kernel("Q_corr")
+def _corr_kernel(ctx: SignalContext) -> np.ndarray:
+    # Universe-level component, shared by every asset in the block
+    block = ctx.returns[-(CANON_CORR_WINDOW + CANON_CORR_LOOKBACK):]
+    complete = np.isfinite(block).all(axis=0)
+
+    result = np.full(ctx.n_assets, np.nan)
+    if len(block) < CANON_CORR_WINDOW + CANON_CORR_LOOKBACK or complete.sum() < 2:
+        return result
+
+    q_corr = rolling_correlation_from_returns(block[:, complete], CANON_CORR_WINDOW)["q_corr"]
+    result[complete] = q_corr
+    return result
+
+
+@register_kernel("Q_mr")
+def _mr_kernel(ctx: SignalContext) -> np.ndarray:
+    signal = mean_reversion_matrix(
+        ctx.aligned_prices,
+        MR_WINDOW,
+        window_mean=ctx.price_moments(MR_WINDOW)[0],
+    )
+    return np.where(ctx.price_counts > MR_WINDOW, signal, np.nan)
+
+
+@register_kernel("Q_tail")
+def _tail_kernel(ctx: SignalContext) -> np.ndarray:
+    r = ctx.aligned_log_returns
+    counts = (~np.isnan(r)).sum(axis=0)
+    eligible = counts >= MIN_RETURNS
+
+    result = np.full(ctx.n_assets, np.nan)
+    if not eligible.any():
+        return result
+
+    r = r[:, eligible]
+    es, mean_return = monte_carlo_expected_shortfall(
+        np.nanmean(r, axis=0),
+        np.nanstd(r, axis=0, ddof=1),
+    )
+    result[eligible] = normalize_mc_tail(es, mean_return)
+    return result
+
+
+# ---------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------
+
+def run_signal_pipeline(
+    panel: PricePanel,
+    kernels: Optional[Iterable[str]] = None,
+) -> dict:
+    """
+    Run registered kernels over one panel and aggregate Q per asset.
+
+    Args:
+        panel: Price panel
+        kernels: Kernel names to run (default: all registered)
+
+    Returns:
+        {
+          per_asset: ticker -> {components: name -> value|None, q},
+          timings: kernel name -> seconds,
+        }
+    """
+    names = list(kernels) if kernels is not None else list(KERNELS)
+    ctx = SignalContext(panel)
+
+    components: Dict[str, np.ndarray] = {}
+    timings: Dict[str, float] = {}
+
+    for name in names:
+        started = time.perf_counter()
+        components[name] = np.asarray(KERNELS[name](ctx), dtype=np.float64)
+        timings[name] = round(time.perf_counter() - started, 6)
+
+    q = aggregate_q_batch(components) if components else np.zeros(len(panel))
+
+    values = {
+        name: [None if np.isnan(v) else v for v in arr.tolist()]
+        for name, arr in components.items()
+    }
+
+    per_asset = {
+        ticker: {
+            "components": {name: values[name][j] for name in names},
+            "q": float(q[j]),
+        }
+        for j, ticker in enumerate(panel.tickers)
+    }
+
+    return {"per_asset": per_asset, "timings": timings}
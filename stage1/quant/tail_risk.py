@@ -1,31 +1,122 @@
 """
 Tail Risk Quant Module
 
-Computes tail risk via Expected Shortfall (5%)
-using a deterministic historical simulation approach.
+Computes tail risk via Expected Shortfall (5%), either by
+Monte Carlo simulation of geometric Brownian motion (canon) or
+by deterministic historical simulation (fast fallback).
 
 Canon reference:
 - Monte Carlo tail risk via Expected Shortfall (5%)
+- 10,000 paths, geometric Brownian motion
+- Q_tail = clip(ES / |mean return|, 0, 1)
 - All outputs ∈ [0,1]
 - Deterministic, missing data excluded
 """
 
-from typing import List
-import math
+from typing import Dict, List, Tuple, Union
 
+import numpy as np
 
-def _log_returns(prices: List[float]) -> List[float]:
-    returns = []
-    for i in range(1, len(prices)):
-        if prices[i - 1] <= 0 or prices[i] <= 0:
-            continue
-        returns.append(math.log(prices[i] / prices[i - 1]))
-    return returns
+from stage1.ingestion.price_panel import PricePanel
+from stage1.quant.panel_ops import log_returns as _log_returns
+
+MIN_RETURNS = 10
+
+MC_PATHS = 10_000
+MC_HORIZON = 1
+MC_SEED = 7
+MC_CHUNK_PATHS = 2_000
+
+
+def _historical_es(returns: np.ndarray, alpha: float) -> float:
+    """
+    Mean of the worst alpha share of returns, without a full sort.
+    """
+    cutoff = int(len(returns) * alpha)
+    if cutoff == 0:
+        return 0.0
+
+    tail = np.partition(returns, cutoff - 1)[:cutoff]
+    return abs(float(tail.mean()))
+
+
+def monte_carlo_expected_shortfall(
+    mu: np.ndarray,
+    sigma: np.ndarray,
+    alpha: float = 0.05,
+    n_paths: int = MC_PATHS,
+    horizon: int = MC_HORIZON,
+    seed: int = MC_SEED,
+    chunk_paths: int = MC_CHUNK_PATHS,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Simulated Expected Shortfall for a whole universe of assets.
+
+    Each asset follows GBM with daily log-return mean `mu` and
+    volatility `sigma`. A GBM terminal value is exactly lognormal,
+    so one draw per path yields the horizon return. Paths are drawn
+    in chunks of `chunk_paths`, keeping only the running worst
+    alpha-tail per asset, so peak memory is O((chunk + tail) × N).
+
+    Every asset is driven by the same seeded standard-normal draws
+    (common random numbers), so an asset's result depends only on
+    its own (mu, sigma) — not on chunk size, universe composition or
+    how the universe is sharded across workers.
+
+    Args:
+        mu: (N,) mean daily log return per asset
+        sigma: (N,) daily log-return volatility per asset
+        alpha: Tail probability
+        n_paths: Simulated paths per asset
+        horizon: Horizon in trading days
+        seed: Generator seed
+        chunk_paths: Paths simulated per batch
+
+    Returns:
+        (es, mean_return): (N,) expected shortfall as a positive loss,
+        and (N,) mean simulated horizon return
+    """
+    mu = np.asarray(mu, dtype=np.float64)
+    sigma = np.asarray(sigma, dtype=np.float64)
+
+    k = max(1, int(n_paths * alpha))
+    drift = mu * horizon
+    diffusion = sigma * np.sqrt(horizon)
+
+    rng = np.random.default_rng(seed)
+    worst = np.empty((0, len(mu)))
+    total = np.zeros(len(mu))
+
+    for start in range(0, n_paths, chunk_paths):
+        m = min(chunk_paths, n_paths - start)
+        simulated = np.expm1(drift + diffusion * rng.standard_normal((m, 1)))
+        total += simulated.sum(axis=0)
+
+        candidates = np.concatenate([worst, simulated])
+        if len(candidates) > k:
+            candidates = np.partition(candidates, k - 1, axis=0)[:k]
+        worst = candidates
+
+    return -worst.mean(axis=0), total / n_paths
+
+
+def normalize_mc_tail(es: np.ndarray, mean_return: np.ndarray) -> np.ndarray:
+    """
+    Canon normalization: ES / |mean return|, clamped to [0,1].
+    """
+    scale = np.abs(mean_return)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(scale > 0, es / scale, np.where(es > 0, 1.0, 0.0))
+    return np.clip(ratio, 0.0, 1.0)
 
 
 def tail_risk_signal(
     price_series: List[float],
     alpha: float = 0.05,
+    method: str = "historical",
+    n_paths: int = MC_PATHS,
+    horizon: int = MC_HORIZON,
+    seed: int = MC_SEED,
 ) -> float:
     """
     Compute tail risk signal via Expected Shortfall.
@@ -33,24 +124,79 @@ def tail_risk_signal(
     Args:
         price_series: Ordered price series
         alpha: Tail probability (default 5%)
+        method: "historical" (fast fallback) or "monte_carlo" (canon)
+        n_paths: Monte Carlo paths
+        horizon: Monte Carlo horizon in trading days
+        seed: Monte Carlo seed
 
     Returns:
         Normalized tail risk signal ∈ [0,1]
     """
     returns = _log_returns(price_series)
-    if len(returns) < 10:
+    if len(returns) < MIN_RETURNS:
         return 0.0
 
-    sorted_returns = sorted(returns)
-    cutoff_index = int(len(sorted_returns) * alpha)
+    if method == "historical":
+        # Normalize into [0,1] (canonical clamp)
+        return min(max(_historical_es(returns, alpha), 0.0), 1.0)
 
-    if cutoff_index == 0:
-        return 0.0
+    if method != "monte_carlo":
+        raise ValueError(f"Unknown tail risk method: {method}")
+
+    es, mean_return = monte_carlo_expected_shortfall(
+        np.array([returns.mean()]),
+        np.array([returns.std(ddof=1)]),
+        alpha=alpha,
+        n_paths=n_paths,
+        horizon=horizon,
+        seed=seed,
+    )
+    return float(normalize_mc_tail(es, mean_return)[0])
+
+
+def tail_risk_panel(
+    prices: Union[PricePanel, Dict[str, List[float]]],
+    alpha: float = 0.05,
+    method: str = "monte_carlo",
+    n_paths: int = MC_PATHS,
+    horizon: int = MC_HORIZON,
+    seed: int = MC_SEED,
+    chunk_paths: int = MC_CHUNK_PATHS,
+) -> Dict[str, float]:
+    """
+    Tail risk signal for every asset, simulated in one batch.
+
+    Assets with fewer than MIN_RETURNS log returns score 0.0.
+
+    Returns:
+        Mapping asset -> normalized tail risk signal ∈ [0,1]
+    """
+    returns = {t: _log_returns(p) for t, p in prices.items()}
+    eligible = [t for t, r in returns.items() if len(r) >= MIN_RETURNS]
+
+    result = {t: 0.0 for t in returns}
+    if not eligible:
+        return result
+
+    if method == "historical":
+        for t in eligible:
+            result[t] = min(max(_historical_es(returns[t], alpha), 0.0), 1.0)
+        return result
+
+    if method != "monte_carlo":
+        raise ValueError(f"Unknown tail risk method: {method}")
 
-    tail_losses = sorted_returns[:cutoff_index]
+    es, mean_return = monte_carlo_expected_shortfall(
+        np.array([returns[t].mean() for t in eligible]),
+        np.array([returns[t].std(ddof=1) for t in eligible]),
+        alpha=alpha,
+        n_paths=n_paths,
+        horizon=horizon,
+        seed=seed,
+        chunk_paths=chunk_paths,
+    )
 
-    # Expected Shortfall is the mean of the worst alpha returns
-    es = abs(sum(tail_losses) / len(tail_losses))
+    for t, value in zip(eligible, normalize_mc_tail(es, mean_return).tolist()):
+        result[t] = value
 
-    # Normalize into [0,1] (canonical clamp)
-    return min(max(es, 0.0), 1.0)
+    return result
@@ -0,0 +1,101 @@
+"""
+Sparse Cross-Asset Topology
+
+Replaces the dense N×N correlation dict with a thresholded graph:
+- Per-asset top-k neighbours with |corr| above the threshold
+- Connected-component clusters of the thresholded graph
+
+Correlations are produced in row blocks, so peak memory is
+O(block × N) and output size is O(N·k), not O(N²).
+"""
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from utils.math import find_roots, standardize_columns, union_edges
+
+TOPOLOGY_THRESHOLD = 0.6
+TOPOLOGY_TOP_K = 10
+BLOCK_ROWS = 256
+
+
+def sparse_topology(
+    returns: np.ndarray,
+    tickers: Sequence[str],
+    threshold: float = TOPOLOGY_THRESHOLD,
+    top_k: int = TOPOLOGY_TOP_K,
+    block_rows: int = BLOCK_ROWS,
+) -> Dict:
+    """
+    Thresholded correlation graph of a fully-populated return matrix.
+
+    Args:
+        returns: (T, N) returns, no missing values
+        tickers: Column labels
+        threshold: Edge when |corr| > threshold
+        top_k: Neighbours kept per asset (strongest first)
+        block_rows: Assets correlated per block
+
+    Returns:
+        {
+          threshold, top_k,
+          neighbours: ticker -> [[neighbour, corr], ...],
+          clusters: connected components of size ≥ 2 (sorted lists),
+        }
+    """
+    N = returns.shape[1]
+    tickers = list(tickers)
+
+    neighbours: Dict[str, List] = {t: [] for t in tickers}
+    parent = np.arange(N)
+
+    if N > 1 and len(returns) > 1:
+        z, valid = standardize_columns(returns)
+
+        for start in range(0, N, block_rows):
+            stop = min(start + block_rows, N)
+            corr = z[:, start:stop].T @ z
+
+            strength = np.abs(corr)
+            strength[:, ~valid] = 0.0
+            strength[~valid[start:stop]] = 0.0
+            strength[np.arange(stop - start), np.arange(start, stop)] = 0.0
+
+            edges = strength > threshold
+
+            # ---- Union on the upper triangle of this block ----
+            rows, cols = np.nonzero(edges)
+            rows = rows + start
+            upper = cols > rows
+            parent = union_edges(parent, rows[upper], cols[upper])
+
+            # ---- Top-k neighbours per row ----
+            k = min(top_k, N - 1)
+            if k <= 0:
+                continue
+            ranked = np.argpartition(-strength, k - 1, axis=1)[:, :k]
+
+            for r in np.nonzero(edges.any(axis=1))[0]:
+                picks = ranked[r][edges[r, ranked[r]]]
+                picks = picks[np.argsort(-strength[r, picks], kind="stable")]
+                neighbours[tickers[start + r]] = [
+                    [tickers[c], round(float(corr[r, c]), 6)] for c in picks
+                ]
+
+    roots = find_roots(parent)
+    members: Dict[int, List[str]] = {}
+    for idx, root in enumerate(roots.tolist()):
+        members.setdefault(root, []).append(tickers[idx])
+
+    clusters = sorted(
+        (sorted(m) for m in members.values() if len(m) >= 2),
+        key=lambda m: (-len(m), m[0]),
+    )
+
+    return {
+        "threshold": threshold,
+        "top_k": top_k,
+        "neighbours": neighbours,
+        "clusters": clusters,
+    }
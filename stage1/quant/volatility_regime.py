@@ -6,29 +6,92 @@ realized volatility and EMA-smoothed volatility.
 
 Canon reference:
 - Volatility regime shift via realized vs EMA divergence
+- Regime flag: Δσ > 0.4 → expansion, Δσ < −0.3 → compression
 - All outputs ∈ [0,1]
 - Deterministic, missing data excluded
+
+The realized-vol series of every asset is produced in one O(T)
+prefix-sum pass over the right-aligned log-return panel, and the
+EMA is applied as a single weighted reduction.
 """
 
-from typing import List
-import math
-import statistics
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from stage1.ingestion.price_panel import PricePanel
+from stage1.quant.panel_ops import ema_weights, log_returns, right_align, rolling_std
+
+EXPANSION_THRESHOLD = 0.4
+COMPRESSION_THRESHOLD = -0.3
+
 
+def _regime(delta_sigma: float) -> str:
+    if delta_sigma > EXPANSION_THRESHOLD:
+        return "expansion"
+    if delta_sigma < COMPRESSION_THRESHOLD:
+        return "compression"
+    return "normal"
 
-def _log_returns(prices: List[float]) -> List[float]:
-    returns = []
-    for i in range(1, len(prices)):
-        if prices[i - 1] <= 0 or prices[i] <= 0:
-            continue
-        returns.append(math.log(prices[i] / prices[i - 1]))
-    return returns
 
+def volatility_regime_matrix(
+    log_rets: np.ndarray,
+    price_counts: np.ndarray,
+    realized_window: int,
+    ema_window: int,
+    rolling_vol: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Volatility regime statistics for every column of a returns panel.
+
+    Realized vol at each step is the population std of the preceding
+    `realized_window` returns (the latest return opens the next
+    window); the trailing vol is the EMA of the last `ema_window`
+    realized values.
+
+    Args:
+        log_rets: (T, N) right-aligned log returns
+        price_counts: (N,) number of prices behind each column
+        realized_window: Window for realized volatility
+        ema_window: Window for EMA volatility smoothing
+        rolling_vol: Optional precomputed rolling_std(log_rets, realized_window)
+
+    Returns:
+        {signal, delta_sigma, valid} arrays of shape (N,)
+    """
+    T, N = log_rets.shape
+    n_returns = (~np.isnan(log_rets)).sum(axis=0)
+
+    signal = np.zeros(N)
+    delta_sigma = np.full(N, np.nan)
 
-def _ema(values: List[float], alpha: float) -> float:
-    ema = values[0]
-    for v in values[1:]:
-        ema = alpha * v + (1 - alpha) * ema
-    return ema
+    valid = (
+        (price_counts > max(realized_window, ema_window) + 1)
+        & (n_returns - realized_window >= ema_window)
+    )
+    if T < realized_window + ema_window or not valid.any():
+        return {"signal": signal, "delta_sigma": delta_sigma, "valid": np.zeros(N, dtype=bool)}
+
+    # realized[t] = pstdev(returns[t-w : t]) → rolling std ending one row earlier
+    if rolling_vol is None:
+        rolling_vol = rolling_std(log_rets, realized_window, ddof=0)
+    realized = rolling_vol[:-1]
+
+    recent = realized[-ema_window:]
+    alpha = 2 / (ema_window + 1)
+    # Column-wise weighted sum (not a BLAS product) keeps each asset's
+    # result independent of how many columns are in the batch
+    ema_vol = (ema_weights(ema_window, alpha)[:, None] * np.nan_to_num(recent)).sum(axis=0)
+    current = recent[-1]
+
+    valid = valid & (ema_vol > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = (current - ema_vol) / ema_vol
+
+    delta_sigma = np.where(valid, delta, np.nan)
+    signal = np.where(valid, np.clip(np.abs(delta), 0.0, 1.0), 0.0)
+
+    return {"signal": signal, "delta_sigma": delta_sigma, "valid": valid}
 
 
 def volatility_regime_signal(
@@ -47,32 +110,43 @@ def volatility_regime_signal(
     Returns:
         Normalized volatility regime signal ∈ [0,1]
     """
-    if len(price_series) <= max(realized_window, ema_window) + 1:
-        return 0.0
-
-    returns = _log_returns(price_series)
-    if len(returns) <= realized_window:
-        return 0.0
-
-    realized_vols = []
-    for i in range(realized_window, len(returns)):
-        window = returns[i - realized_window:i]
-        try:
-            realized_vols.append(statistics.pstdev(window))
-        except statistics.StatisticsError:
-            continue
+    returns = log_returns(price_series)[:, None]
+    stats = volatility_regime_matrix(
+        returns, np.array([len(price_series)]), realized_window, ema_window
+    )
+    return float(stats["signal"][0])
 
-    if len(realized_vols) < ema_window:
-        return 0.0
 
-    alpha = 2 / (ema_window + 1)
-    ema_vol = _ema(realized_vols[-ema_window:], alpha)
-    current_vol = realized_vols[-1]
-
-    if ema_vol <= 0:
-        return 0.0
-
-    divergence = abs(current_vol - ema_vol) / ema_vol
+def volatility_regime_panel(
+    prices: Union[PricePanel, Dict[str, List[float]]],
+    realized_window: int,
+    ema_window: int,
+) -> Dict[str, dict]:
+    """
+    Volatility regime signal and canon regime flag for every asset.
 
-    # Canon normalization: clamp to [0,1]
-    return min(max(divergence, 0.0), 1.0)
+    Returns:
+        Mapping asset -> {signal ∈ [0,1], delta_sigma, regime}
+        (regime is None where the asset lacks enough history)
+    """
+    if not isinstance(prices, PricePanel):
+        prices = PricePanel.from_lists(prices)
+
+    stats = volatility_regime_matrix(
+        right_align(prices.log_returns()),
+        prices.counts(),
+        realized_window,
+        ema_window,
+    )
+
+    result = {}
+    for j, ticker in enumerate(prices.tickers):
+        valid = bool(stats["valid"][j])
+        delta = float(stats["delta_sigma"][j]) if valid else None
+        result[ticker] = {
+            "signal": float(stats["signal"][j]),
+            "delta_sigma": delta,
+            "regime": _regime(delta) if valid else None,
+        }
+
+    return result
@@ -8,83 +8,184 @@ This runner is intentionally INTELLIGENCE-DENSE.
 import json
 import logging
 from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
+from stage1.dag import StageGraph
+from stage1.ingestion.documents import ingest_documents, load_documents
 from stage1.ingestion.universe_loader import load_universe_from_google_sheets
-from stage1.ingestion.market_prices import load_market_prices
+from stage1.ingestion.market_prices import load_market_data
+from stage1.ingestion.price_cache import PriceCache
+from stage1.ingestion.price_panel import PricePanel
 from stage1.quant.quant_engine import run_quant_analysis
-from stage1.nlp.nlp_engine import run_nlp_analysis
+from stage1.quant.signal_registry import run_signal_pipeline
+from stage1.nlp.burst import BurstDetector
+from stage1.nlp.corpus_store import CorpusStore
+from stage1.nlp.nlp_engine import add_stress, document_signals, run_nlp_analysis
+from stage1.nlp.topics import TopicModel
 from stage1.synthesis.nti import compute_nti
 
 logging.basicConfig(level=logging.INFO)
 LOGGER = logging.getLogger("stage1-runner")
 
 
-def main() -> None:
-    LOGGER.info("Stage 1 started")
-
-    # ------------------------------------------------------------------
-    # 1. Universe resolution (STRUCTURED, AUTHORITATIVE)
-    # ------------------------------------------------------------------
-    universe = load_universe_from_google_sheets()
-    if not universe:
-        raise RuntimeError("Universe resolution failed")
+def build_graph(
+    downloader: Optional[Callable[..., Any]] = None,
+    cache: Optional[PriceCache] = None,
+    burst_detector: Optional[BurstDetector] = None,
+    corpus: Optional[CorpusStore] = None,
+    documents: Optional[Sequence[str]] = None,
+    topic_model: Optional[TopicModel] = None,
+) -> StageGraph:
+    """
+    Steps 2–5 of Stage 1 as a stage graph over the "universe" input.
 
-    tickers = [u["ticker"] for u in universe]
+    NLP depends only on the universe, so it overlaps the price
+    download; quant, the signal pipeline and sentiment stress (NLP
+    document signals × σ_real) overlap each other once the panel
+    exists. All stages run on threads: ingestion is network bound and
+    the kernels are NumPy (GIL released).
+    """
+    graph = StageGraph()
 
     # ------------------------------------------------------------------
     # 2. Market ingestion (NO SILENT DROPS)
     # ------------------------------------------------------------------
-    market = load_market_prices(tickers)
+    def prices(universe: List[Dict[str, str]]) -> Tuple[Dict, PricePanel]:
+        tickers = [u["ticker"] for u in universe]
+        market, panel = load_market_data(tickers, downloader=downloader, cache=cache)
+        if not len(panel):
+            LOGGER.error("No valid price series available — proceeding with full penalty")
+        return market, panel
 
-    prices = {
-        ticker: data["price_series"]
-        for ticker, data in market.items()
-        if data["status"] == "ok" and data["price_series"] is not None
-    }
-
-    if not prices:
-        LOGGER.error("No valid price series available — proceeding with full penalty")
+    graph.add("prices", prices, ["universe"])
 
     # ------------------------------------------------------------------
     # 3. Quant engine (multi-resolution, topology-aware)
     # ------------------------------------------------------------------
-    quant = run_quant_analysis(
-        prices=prices,
-        windows=[5, 20, 60],
-        detect_regimes=True,
-        detect_anomalies=True,
-        build_cross_asset_stats=True,
+    graph.add(
+        "quant",
+        lambda prices: run_quant_analysis(
+            prices=prices[1],
+            windows=[5, 20, 60],
+            detect_regimes=True,
+            detect_anomalies=True,
+            build_cross_asset_stats=True,
+        ),
+        ["prices"],
     )
 
+    # Canon Q components (shared intermediates, one batch)
+    graph.add("signals", lambda prices: run_signal_pipeline(prices[1]), ["prices"])
+
     # ------------------------------------------------------------------
     # 4. NLP engine (STRUCTURED UNIVERSE — FIXED)
     # ------------------------------------------------------------------
-    nlp = run_nlp_analysis(
-        universe=universe,
-        short_horizon_days=7,
-        long_horizon_days=45,
-        detect_sentiment_shifts=True,
-        cluster_topics=True,
+    def nlp(universe: List[Dict[str, str]]) -> Tuple[Dict, Optional[Dict]]:
+        signals = document_signals(universe, documents) if documents is not None else None
+        result = run_nlp_analysis(
+            universe=universe,
+            short_horizon_days=7,
+            long_horizon_days=45,
+            detect_sentiment_shifts=True,
+            cluster_topics=True,
+            topic_model=topic_model,
+            corpus=corpus,
+            signals=signals,
+            burst_detector=burst_detector,
+        )
+        return result, signals
+
+    graph.add("nlp", nlp, ["universe"])
+
+    # N_sent needs σ_real: applied once prices arrive
+    graph.add(
+        "stress",
+        lambda nlp, prices: add_stress(nlp[0], nlp[1], prices[1]),
+        ["nlp", "prices"],
     )
 
     # ------------------------------------------------------------------
     # 5. NTI synthesis — HARD GATED
     # ------------------------------------------------------------------
-    nti = compute_nti(
+    graph.add(
+        "nti",
+        lambda quant, nlp, prices: synthesize_nti(quant, nlp, prices[0], prices[1]),
+        ["quant", "stress", "prices"],
+    )
+    return graph
+
+
+def run_pipeline(
+    universe: List[Dict[str, str]],
+    downloader: Optional[Callable[..., Any]] = None,
+    cache: Optional[PriceCache] = None,
+    burst_detector: Optional[BurstDetector] = None,
+    corpus: Optional[CorpusStore] = None,
+    documents: Optional[Sequence[str]] = None,
+    topic_model: Optional[TopicModel] = None,
+) -> Dict[str, Any]:
+    """
+    Steps 2–5 of Stage 1 for a resolved universe.
+
+    Args:
+        burst_detector: Persistent N_burst state, updated in place
+        corpus: Local document store backing the NLP windows
+        documents: The run's raw documents (mentions, burst, stress)
+        topic_model: Persistent N_conflict state, updated in place
+
+    Returns:
+        {market, panel, quant, signals, nlp, nti, dag}
+    """
+    results, report = build_graph(
+        downloader, cache, burst_detector, corpus, documents, topic_model
+    ).run({"universe": universe})
+
+    LOGGER.info("Quant kernel timings (s): %s", results["signals"]["timings"])
+    LOGGER.info(
+        "Critical path %s: %.3fs of %.3fs wall",
+        " -> ".join(report["critical_path"]),
+        report["critical_path_s"],
+        report["wall_s"],
+    )
+
+    market, panel = results["prices"]
+    return {
+        "market": market,
+        "panel": panel,
+        "quant": results["quant"],
+        "signals": results["signals"],
+        "nlp": results["stress"],
+        "nti": results["nti"],
+        "dag": report,
+    }
+
+
+def synthesize_nti(quant: Dict, nlp: Dict, market: Dict, panel: PricePanel) -> Dict:
+    return compute_nti(
         quant_results=quant,
         nlp_results=nlp,
         market_metadata=market,
         enforce_cross_asset_coherence=True,
         enforce_multi_resolution_agreement=True,
         enable_temporal_dynamics=True,
+        price_panel=panel,
     )
 
-    # ------------------------------------------------------------------
-    # 6. Emission (ALWAYS)
-    # ------------------------------------------------------------------
+
+def emit_artifacts(
+    universe: List[Dict[str, str]],
+    result: Dict[str, Any],
+    out_dir: str = ".",
+) -> None:
+    """
+    6. Emission (ALWAYS): trigger_context.json and stage1_debug.json.
+    """
     timestamp = datetime.now(timezone.utc).isoformat()
+    nti = result["nti"]
+    out = Path(out_dir)
 
-    with open("trigger_context.json", "w") as f:
+    with open(out / "trigger_context.json", "w") as f:
         json.dump(
             {
                 "timestamp": timestamp,
@@ -98,21 +199,57 @@ def main() -> None:
             indent=2,
         )
 
-    with open("stage1_debug.json", "w") as f:
+    with open(out / "stage1_debug.json", "w") as f:
         json.dump(
             {
                 "timestamp": timestamp,
                 "universe": universe,
-                "market": market,
-                "prices": prices,
-                "quant": quant,
-                "nlp": nlp,
+                "market": result["market"],
+                "prices": result["panel"].describe(),
+                "quant": result["quant"],
+                "quant_signals": result["signals"],
+                "nlp": result["nlp"],
                 "nti_full": nti,
+                "stage_timings": result.get("dag"),
             },
             f,
             indent=2,
         )
 
+
+def main() -> None:
+    LOGGER.info("Stage 1 started")
+
+    # ------------------------------------------------------------------
+    # 1. Universe resolution (STRUCTURED, AUTHORITATIVE)
+    # ------------------------------------------------------------------
+    universe = load_universe_from_google_sheets()
+    if not universe:
+        raise RuntimeError("Universe resolution failed")
+
+    # The run's documents enter the corpus store before NLP reads it
+    corpus = CorpusStore()
+    records = load_documents()
+    LOGGER.info("Stored %d of %d inbox documents", ingest_documents(corpus, universe, records), len(records))
+
+    burst_detector = BurstDetector.load()
+    topic_model = TopicModel.load()
+    result = run_pipeline(
+        universe,
+        cache=PriceCache(),
+        burst_detector=burst_detector,
+        corpus=corpus if corpus.days() else None,
+        documents=[r["text"] for r in records] or None,
+        topic_model=topic_model,
+    )
+    burst_detector.save()
+    topic_model.save()
+
+    # Enforce the 30d + 7d retention window
+    corpus.compact()
+
+    emit_artifacts(universe, result)
+
     LOGGER.info("Stage 1 completed successfully")
 
 
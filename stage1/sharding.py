@@ -0,0 +1,443 @@
+"""
+Stage 1 Sharding — Multi-Node Execution + Merge
+
+Splits Stage 1 into independent shard jobs over a fixed universe
+manifest, then recombines their partial artifacts before NTI
+synthesis. NTI semantics are unchanged: the merged inputs to
+compute_nti are identical to a single-job run.
+
+Flow:
+- plan:  resolve the universe once, write manifest.json
+- run:   shard i ingests its contiguous universe slice and writes
+         shard-XXXX/{partial.json, prices.npz}
+- merge: validate every shard, concatenate per-asset results and
+         price panels, compute cross-shard statistics (topology,
+         Q_corr) on the full panel, then run compute_nti
+- local: plan + one subprocess per shard + merge, on one machine
+
+Per-shard work is everything that depends only on an asset's own
+data (ingestion, regimes, per-asset Q kernels, NLP and sentiment
+stress). Only the cross-asset correlation steps run at merge time.
+
+NLP state: plan ingests the document inbox into the corpus store
+(the single writer); every shard reads the store, the inbox texts
+and the persisted burst / topic state, and saves its advanced copy
+of that state in its shard directory. merge recombines each shard's
+assets into one state, saves it and compacts the store. Shards on
+other nodes need the same corpus, inbox and state files.
+
+Usage:
+    python -m stage1.sharding plan  --out DIR --shards N
+    python -m stage1.sharding run   --out DIR --shard I
+    python -m stage1.sharding merge --out DIR [--emit-dir .]
+    python -m stage1.sharding local --out DIR --shards N
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import argparse
+import json
+import logging
+import subprocess
+import sys
+
+import numpy as np
+
+from stage1.ingestion.documents import ingest_documents, load_documents
+from stage1.ingestion.market_prices import load_market_data
+from stage1.ingestion.price_cache import PriceCache
+from stage1.ingestion.price_panel import PricePanel
+from stage1.nlp.burst import BurstDetector
+from stage1.nlp.corpus_store import CorpusStore
+from stage1.nlp.nlp_engine import add_stress, document_signals, run_nlp_analysis, summarize_nlp
+from stage1.nlp.topics import TopicModel
+from stage1.quant.quant_engine import (
+    WINDOWS,
+    cross_asset_topology,
+    eligible_panel,
+    per_asset_regimes,
+)
+from stage1.quant.signal_registry import KERNELS, run_signal_pipeline
+from stage1.runner import emit_artifacts, synthesize_nti
+from stage1.synthesis.quant_aggregate import aggregate_q_batch
+
+LOGGER = logging.getLogger("stage1-sharding")
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+PARTIAL_FILE = "partial.json"
+PRICES_FILE = "prices.npz"
+BURST_STATE_FILE = "burst_state.npz"
+TOPIC_STATE_FILE = "topic_state.npz"
+
+# Kernels needing the whole universe; recomputed at merge time
+CROSS_ASSET_KERNELS = ["Q_corr"]
+
+
+# -------------------------
+# Manifest
+# -------------------------
+
+def shard_dir(out_dir: Path, index: int) -> Path:
+    return Path(out_dir) / f"shard-{index:04d}"
+
+
+def plan_shards(universe: List[Dict[str, str]], shards: int, out_dir: Path) -> Dict:
+    """
+    Write the shard manifest: the frozen universe and each shard's
+    contiguous [start, stop) slice of it.
+    """
+    if not universe:
+        raise RuntimeError("Cannot shard an empty universe")
+    if shards < 1:
+        raise RuntimeError(f"Invalid shard count: {shards}")
+
+    shards = min(shards, len(universe))
+    edges = np.linspace(0, len(universe), shards + 1).astype(int).tolist()
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "shards": shards,
+        "universe": universe,
+        "assignments": [[edges[i], edges[i + 1]] for i in range(shards)],
+    }
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with open(out_dir / MANIFEST_FILE, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
+
+
+def load_manifest(out_dir: Path) -> Dict:
+    path = Path(out_dir) / MANIFEST_FILE
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except Exception as e:
+        raise RuntimeError(f"Failed to load shard manifest: {path}") from e
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise RuntimeError(f"Unsupported shard manifest version: {manifest.get('version')}")
+
+    return manifest
+
+
+def _shard_universe(manifest: Dict, index: int) -> List[Dict[str, str]]:
+    if not 0 <= index < manifest["shards"]:
+        raise RuntimeError(f"Shard {index} out of range (0..{manifest['shards'] - 1})")
+
+    start, stop = manifest["assignments"][index]
+    return manifest["universe"][start:stop]
+
+
+# -------------------------
+# Shard job
+# -------------------------
+
+def run_shard(
+    out_dir: Path,
+    index: int,
+    downloader: Optional[Callable[..., Any]] = None,
+    cache: Optional[PriceCache] = None,
+    corpus: Optional[CorpusStore] = None,
+    documents: Optional[Sequence[str]] = None,
+    burst_detector: Optional[BurstDetector] = None,
+    topic_model: Optional[TopicModel] = None,
+) -> Path:
+    """
+    Run the per-asset part of Stage 1 for one shard and write its
+    partial artifact.
+
+    Args:
+        corpus: Local document store backing the NLP windows
+        documents: The run's raw documents (mentions, burst, stress)
+        burst_detector: Persisted N_burst state, advanced and saved
+            in the shard directory
+        topic_model: Persisted N_conflict state, likewise
+
+    Returns:
+        The shard's artifact directory
+    """
+    manifest = load_manifest(out_dir)
+    universe = _shard_universe(manifest, index)
+    tickers = [u["ticker"] for u in universe]
+
+    market, panel = load_market_data(tickers, downloader=downloader, cache=cache)
+
+    regimes = per_asset_regimes(eligible_panel(panel, WINDOWS), WINDOWS, True)
+
+    local_kernels = [k for k in KERNELS if k not in CROSS_ASSET_KERNELS]
+    signals = run_signal_pipeline(panel, kernels=local_kernels)
+
+    # Same NLP inputs as the single-job graph; every shard uses the
+    # run day fixed in the manifest
+    doc_signals = document_signals(universe, documents) if documents is not None else None
+    nlp = run_nlp_analysis(
+        universe=universe,
+        short_horizon_days=7,
+        long_horizon_days=45,
+        detect_sentiment_shifts=True,
+        cluster_topics=True,
+        topic_model=topic_model,
+        corpus=corpus,
+        signals=doc_signals,
+        burst_detector=burst_detector,
+        day=manifest["created"],
+    )
+    nlp = add_stress(nlp, doc_signals, panel)
+
+    target = shard_dir(out_dir, index)
+    target.mkdir(parents=True, exist_ok=True)
+
+    if burst_detector is not None:
+        burst_detector.save(target / BURST_STATE_FILE)
+    if topic_model is not None:
+        topic_model.save(target / TOPIC_STATE_FILE)
+
+    np.savez(
+        target / PRICES_FILE,
+        dates=panel.dates,
+        tickers=np.array(panel.tickers, dtype=str),
+        values=panel.values,
+    )
+
+    with open(target / PARTIAL_FILE, "w") as f:
+        json.dump(
+            {
+                "shard": index,
+                "shards": manifest["shards"],
+                "tickers": tickers,
+                "market": market,
+                "quant_per_asset": regimes,
+                "signals": signals,
+                "nlp": {
+                    "per_asset": nlp["per_asset"],
+                    "topic_clusters": nlp["topic_clusters"],
+                },
+            },
+            f,
+        )
+
+    LOGGER.info("Shard %d/%d wrote %d assets", index, manifest["shards"], len(tickers))
+    return target
+
+
+# -------------------------
+# Merge
+# -------------------------
+
+def _load_partial(out_dir: Path, manifest: Dict, index: int):
+    target = shard_dir(out_dir, index)
+    try:
+        with open(target / PARTIAL_FILE) as f:
+            partial = json.load(f)
+        with np.load(target / PRICES_FILE, allow_pickle=False) as data:
+            panel = PricePanel(
+                data["dates"], data["tickers"].tolist(), data["values"]
+            )
+    except Exception as e:
+        raise RuntimeError(f"Missing or unreadable shard {index}: {target}") from e
+
+    expected = [u["ticker"] for u in _shard_universe(manifest, index)]
+    if partial["shards"] != manifest["shards"] or partial["tickers"] != expected:
+        raise RuntimeError(f"Shard {index} does not match the manifest")
+
+    return partial, panel
+
+
+def _merge_signals(partials: List[Dict], panel: PricePanel) -> Dict:
+    """
+    Combine per-shard Q components, add the cross-asset kernels over
+    the full panel, and re-aggregate Q per asset.
+    """
+    per_asset = {}
+    timings: Dict[str, float] = {}
+    for partial in partials:
+        per_asset.update(partial["signals"]["per_asset"])
+        for name, seconds in partial["signals"]["timings"].items():
+            # Shards run concurrently: wall-clock is the slowest shard
+            timings[name] = max(timings.get(name, 0.0), seconds)
+
+    cross = run_signal_pipeline(panel, kernels=CROSS_ASSET_KERNELS)
+    timings.update(cross["timings"])
+
+    names = list(KERNELS)
+    sources = {
+        name: cross["per_asset"] if name in CROSS_ASSET_KERNELS else per_asset
+        for name in names
+    }
+    components = {
+        name: np.array(
+            [sources[name][t]["components"][name] for t in panel.tickers],
+            dtype=np.float64,
+        )
+        for name in names
+    }
+    q = aggregate_q_batch(components)
+
+    return {
+        "per_asset": {
+            t: {
+                "components": {
+                    name: None if np.isnan(components[name][j]) else float(components[name][j])
+                    for name in names
+                },
+                "q": float(q[j]),
+            }
+            for j, t in enumerate(panel.tickers)
+        },
+        "timings": timings,
+    }
+
+
+def merge_shards(out_dir: Path) -> Dict[str, Any]:
+    """
+    Recombine every shard listed in the manifest and synthesize NTI.
+
+    Returns:
+        {universe, market, panel, quant, signals, nlp, nti} — the same
+        structure as runner.run_pipeline plus the universe
+    """
+    manifest = load_manifest(out_dir)
+    loaded = [_load_partial(out_dir, manifest, i) for i in range(manifest["shards"])]
+    partials = [p for p, _ in loaded]
+
+    market: Dict[str, dict] = {}
+    per_asset: Dict[str, dict] = {}
+    nlp_per_asset: Dict[str, dict] = {}
+    topic_clusters: Dict[str, List[str]] = {}
+
+    for partial in partials:
+        market.update(partial["market"])
+        per_asset.update(partial["quant_per_asset"])
+        nlp_per_asset.update(partial["nlp"]["per_asset"])
+        for topic, members in partial["nlp"]["topic_clusters"].items():
+            topic_clusters.setdefault(topic, []).extend(members)
+
+    panel = PricePanel.concat([p for _, p in loaded])
+
+    # ---- Cross-shard statistics on the full universe ----
+    quant = {
+        "per_asset": per_asset,
+        "topology": cross_asset_topology(eligible_panel(panel, WINDOWS)),
+    }
+    signals = _merge_signals(partials, panel)
+    nlp = summarize_nlp(nlp_per_asset, topic_clusters)
+
+    return {
+        "universe": manifest["universe"],
+        "market": market,
+        "panel": panel,
+        "quant": quant,
+        "signals": signals,
+        "nlp": nlp,
+        "nti": synthesize_nti(quant, nlp, market, panel),
+    }
+
+
+def merge_nlp_state(out_dir: Path) -> Tuple[Optional[BurstDetector], Optional[TopicModel]]:
+    """
+    Recombine the burst / topic state each shard advanced for its own
+    assets (None where the shards ran without that state).
+    """
+    manifest = load_manifest(out_dir)
+    merged: List[Any] = []
+
+    for name, cls in ((BURST_STATE_FILE, BurstDetector), (TOPIC_STATE_FILE, TopicModel)):
+        paths = [shard_dir(out_dir, i) / name for i in range(manifest["shards"])]
+        if not all(path.exists() for path in paths):
+            merged.append(None)
+            continue
+
+        state = cls.load(paths[0])
+        for i, path in enumerate(paths[1:], 1):
+            tickers = [u["ticker"] for u in _shard_universe(manifest, i)]
+            state.adopt(cls.load(path), tickers)
+        merged.append(state)
+
+    return merged[0], merged[1]
+
+
+# -------------------------
+# Local multi-process driver
+# -------------------------
+
+def run_local(out_dir: Path, shards: int, universe: List[Dict[str, str]]) -> Dict[str, Any]:
+    """
+    Plan, run every shard as its own process, and merge.
+    """
+    manifest = plan_shards(universe, shards, out_dir)
+
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-m", "stage1.sharding", "run",
+             "--out", str(out_dir), "--shard", str(i)]
+        )
+        for i in range(manifest["shards"])
+    ]
+    failed = [i for i, p in enumerate(procs) if p.wait() != 0]
+    if failed:
+        raise RuntimeError(f"Shard jobs failed: {failed}")
+
+    return merge_shards(out_dir)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="stage1.sharding")
+    parser.add_argument("command", choices=["plan", "run", "merge", "local"])
+    parser.add_argument("--out", required=True, help="Shard artifact directory")
+    parser.add_argument("--shards", type=int, default=1)
+    parser.add_argument("--shard", type=int)
+    parser.add_argument("--emit-dir", default=".")
+    args = parser.parse_args(argv)
+
+    out_dir = Path(args.out)
+
+    if args.command == "run":
+        if args.shard is None:
+            parser.error("run requires --shard")
+        corpus = CorpusStore()
+        run_shard(
+            out_dir,
+            args.shard,
+            cache=PriceCache(),
+            corpus=corpus if corpus.days() else None,
+            documents=[r["text"] for r in load_documents()] or None,
+            burst_detector=BurstDetector.load(),
+            topic_model=TopicModel.load(),
+        )
+        return
+
+    if args.command in ("plan", "local"):
+        from stage1.ingestion.universe_loader import load_universe_from_google_sheets
+
+        universe = load_universe_from_google_sheets()
+        if not universe:
+            raise RuntimeError("Universe resolution failed")
+
+        # Single writer: the inbox enters the corpus before any shard runs
+        ingest_documents(CorpusStore(), universe, load_documents())
+
+        if args.command == "plan":
+            plan_shards(universe, args.shards, out_dir)
+            return
+
+        result = run_local(out_dir, args.shards, universe)
+    else:
+        result = merge_shards(out_dir)
+
+    for state in merge_nlp_state(out_dir):
+        if state is not None:
+            state.save()
+    CorpusStore().compact()
+
+    emit_artifacts(result["universe"], result, args.emit_dir)
+    LOGGER.info("Stage 1 merged %d shards", load_manifest(out_dir)["shards"])
+
+
+if __name__ == "__main__":
+    main()
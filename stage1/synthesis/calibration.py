@@ -0,0 +1,314 @@
+"""
+Threshold Calibration — Vectorized Parameter Sweep
+
+Evaluates many nt_thresholds.yaml configurations in one broadcast
+NumPy computation (configurations × runs), instead of re-running the
+pipeline per configuration.
+
+Trigger sweep (stage1.backtest output): calibrates the parameters
+the live NTI trigger and the backtest actually consume:
+- trigger = nti > nti_trigger and delta > 0 and delta2 > 0
+- persistent = consecutive triggers ≥ required_persistence
+
+Threshold model sweep (external Q / N component histories). Note:
+compute_nti does not evaluate this model (it triggers on NTI level
+only) and the backtest does not emit Q / N histories, so this sweep
+studies the documented threshold model, not the live trigger.
+
+Threshold model (config/nt_thresholds.yaml):
+- q = clip((Q − quant.min) / (quant.max − quant.min), 0, 1)
+- n = clip((N − nlp.min) / (nlp.max − nlp.min), 0, 1)
+- A run qualifies when q ≥ quant.qualify_min and n ≥ nlp.qualify_min
+- persistence = consecutive qualifying runs
+- p = min(persistence, persistence.max) / persistence.max
+- score = weights.quant·q + weights.nlp·n + weights.persistence·p
+- trigger when score ≥ trigger_threshold and
+  persistence ≥ required_persistence
+
+Parameters are addressed by dotted config paths
+("weights.quant", "quant.qualify_min", "trigger_threshold", ...).
+
+Usage:
+    python -m stage1.synthesis.calibration backtest.csv \\
+        --grid nti_trigger=1,2,3 --grid required_persistence=2,3,4
+    python -m stage1.synthesis.calibration HISTORY.csv \\
+        --grid trigger_threshold=0.6,0.7,0.8 --grid required_persistence=2,3,4
+"""
+
+from typing import Dict, Iterable, Optional, Sequence
+import argparse
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from stage1.synthesis.nti import NTI_TRIGGER, THRESHOLDS_CONFIG
+from utils.io import load_yaml_config
+from utils.math import run_length
+
+# Configurations evaluated per broadcast block (bounds C×T memory)
+SWEEP_CHUNK = 4096
+
+# Parameters of the NTI trigger consumed by compute_nti / the backtest
+TRIGGER_PARAMS = ("nti_trigger", "required_persistence")
+
+
+def flatten_thresholds(config: Dict, prefix: str = "") -> Dict[str, float]:
+    """
+    Nested thresholds config -> {dotted path: value}.
+    """
+    flat: Dict[str, float] = {}
+    for key, value in config.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_thresholds(value, f"{path}."))
+        else:
+            flat[path] = float(value)
+    return flat
+
+
+def config_grid(
+    base: Dict[str, float],
+    grid: Dict[str, Sequence[float]],
+) -> Dict[str, np.ndarray]:
+    """
+    Cartesian product of swept values over the base configuration.
+
+    Returns:
+        {dotted path: (C,) values}, one entry per configuration
+    """
+    unknown = set(grid) - set(base)
+    if unknown:
+        raise RuntimeError(f"Unknown threshold parameters: {sorted(unknown)}")
+
+    swept = list(grid)
+    combos = list(itertools.product(*(grid[k] for k in swept))) or [()]
+
+    params = {k: np.full(len(combos), v, dtype=np.float64) for k, v in base.items()}
+    for j, key in enumerate(swept):
+        params[key] = np.array([c[j] for c in combos], dtype=np.float64)
+    return params
+
+
+def _normalize(values: np.ndarray, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    span = high - low
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scaled = np.where(span > 0, (values - low) / span, 0.0)
+    return np.clip(scaled, 0.0, 1.0)
+
+
+def evaluate_thresholds(
+    q_history: np.ndarray,
+    n_history: np.ndarray,
+    params: Dict[str, np.ndarray],
+) -> Dict[str, np.ndarray]:
+    """
+    Apply the threshold model for every configuration and run.
+
+    Args:
+        q_history: (T,) Q per run
+        n_history: (T,) N per run
+        params: {dotted path: (C,) values} (see config_grid)
+
+    Returns:
+        {score, qualified, persistence, trigger}, each (C, T)
+    """
+    q_raw = np.asarray(q_history, dtype=np.float64)[None, :]
+    n_raw = np.asarray(n_history, dtype=np.float64)[None, :]
+    p = {k: np.asarray(v, dtype=np.float64)[:, None] for k, v in params.items()}
+
+    q = _normalize(q_raw, p["quant.min"], p["quant.max"])
+    n = _normalize(n_raw, p["nlp.min"], p["nlp.max"])
+
+    qualified = (q >= p["quant.qualify_min"]) & (n >= p["nlp.qualify_min"])
+    persistence = run_length(qualified, axis=1)
+
+    cap = p["persistence.max"]
+    p_norm = np.divide(
+        np.minimum(persistence, cap),
+        cap,
+        out=np.zeros(persistence.shape),
+        where=cap > 0,
+    )
+
+    score = (
+        p["weights.quant"] * q
+        + p["weights.nlp"] * n
+        + p["weights.persistence"] * p_norm
+    )
+    trigger = (score >= p["trigger_threshold"]) & (persistence >= p["required_persistence"])
+
+    return {
+        "score": score,
+        "qualified": qualified,
+        "persistence": persistence,
+        "trigger": trigger,
+    }
+
+
+def evaluate_trigger(
+    nti: np.ndarray,
+    delta: np.ndarray,
+    delta2: np.ndarray,
+    params: Dict[str, np.ndarray],
+) -> Dict[str, np.ndarray]:
+    """
+    Apply the NTI trigger for every configuration and date.
+
+    Args:
+        nti, delta, delta2: (T,) backtest series
+        params: {"nti_trigger", "required_persistence": (C,) values}
+
+    Returns:
+        {score (nti), qualified (raw trigger), persistence,
+         trigger (persistent)}, each (C, T)
+    """
+    nti = np.asarray(nti, dtype=np.float64)[None, :]
+    accelerating = (np.asarray(delta) > 0) & (np.asarray(delta2) > 0)
+
+    qualified = (nti > np.asarray(params["nti_trigger"], dtype=np.float64)[:, None]) & accelerating
+    persistence = run_length(qualified, axis=1)
+    required = np.asarray(params["required_persistence"], dtype=np.float64)[:, None]
+
+    return {
+        "score": np.broadcast_to(nti, qualified.shape),
+        "qualified": qualified,
+        "persistence": persistence,
+        "trigger": persistence >= required,
+    }
+
+
+def _statistics(result: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    trigger = result["trigger"]
+    persistence = result["persistence"]
+
+    onsets = trigger & ~np.pad(trigger, ((0, 0), (1, 0)))[:, :-1]
+    episodes = onsets.sum(axis=1)
+    triggered = trigger.sum(axis=1)
+
+    return {
+        "trigger_rate": trigger.mean(axis=1),
+        "trigger_episodes": episodes,
+        "mean_episode_length": np.divide(
+            triggered, episodes, out=np.zeros(len(episodes)), where=episodes > 0
+        ),
+        "qualify_rate": result["qualified"].mean(axis=1),
+        "mean_persistence": persistence.mean(axis=1),
+        "max_persistence": persistence.max(axis=1, initial=0),
+        "mean_score": result["score"].mean(axis=1),
+    }
+
+
+def sweep_thresholds(
+    q_history: Iterable[float],
+    n_history: Iterable[float],
+    grid: Dict[str, Sequence[float]],
+    base: Optional[Dict] = None,
+    chunk: int = SWEEP_CHUNK,
+) -> pd.DataFrame:
+    """
+    Trigger frequency and persistence statistics per configuration.
+
+    Args:
+        q_history: Q per run, oldest first
+        n_history: N per run, aligned with q_history
+        grid: {dotted path: values to sweep}
+        base: Nested thresholds config (default: nt_thresholds.yaml)
+        chunk: Configurations evaluated per broadcast block
+
+    Returns:
+        One row per configuration: swept parameters, then
+        trigger_rate, trigger_episodes, mean_episode_length,
+        qualify_rate, mean_persistence, max_persistence, mean_score
+    """
+    q_history = np.asarray(list(q_history), dtype=np.float64)
+    n_history = np.asarray(list(n_history), dtype=np.float64)
+    if q_history.shape != n_history.shape:
+        raise ValueError("Q and N histories must have the same length")
+
+    base = flatten_thresholds(base if base is not None else load_yaml_config(THRESHOLDS_CONFIG))
+    params = config_grid(base, grid)
+    total = len(next(iter(params.values())))
+
+    blocks = []
+    for start in range(0, total, chunk):
+        block = {k: v[start:start + chunk] for k, v in params.items()}
+        blocks.append(_statistics(evaluate_thresholds(q_history, n_history, block)))
+
+    stats = {k: np.concatenate([b[k] for b in blocks]) for k in blocks[0]}
+
+    frame = pd.DataFrame({k: params[k] for k in grid})
+    for key, values in stats.items():
+        frame[key] = values
+    return frame
+
+
+def sweep_trigger(
+    backtest: pd.DataFrame,
+    grid: Dict[str, Sequence[float]],
+    base: Optional[Dict] = None,
+    chunk: int = SWEEP_CHUNK,
+) -> pd.DataFrame:
+    """
+    Persistent-trigger statistics per (nti_trigger, required_persistence).
+
+    Args:
+        backtest: stage1.backtest frame (columns nti, delta, delta2)
+        grid: {parameter: values}, parameters from TRIGGER_PARAMS
+        base: Nested thresholds config (default: nt_thresholds.yaml)
+        chunk: Configurations evaluated per broadcast block
+
+    Returns:
+        One row per configuration, columns as sweep_thresholds;
+        qualify_rate is the raw (non-persistent) trigger rate
+    """
+    config = base if base is not None else load_yaml_config(THRESHOLDS_CONFIG)
+    defaults = {"nti_trigger": NTI_TRIGGER, **flatten_thresholds(config)}
+    params = config_grid({k: defaults[k] for k in TRIGGER_PARAMS}, grid)
+    total = len(next(iter(params.values())))
+
+    series = [backtest[c].to_numpy(dtype=np.float64) for c in ("nti", "delta", "delta2")]
+
+    blocks = []
+    for start in range(0, total, chunk):
+        block = {k: v[start:start + chunk] for k, v in params.items()}
+        blocks.append(_statistics(evaluate_trigger(*series, block)))
+
+    stats = {k: np.concatenate([b[k] for b in blocks]) for k in blocks[0]}
+
+    frame = pd.DataFrame({k: params[k] for k in grid})
+    for key, values in stats.items():
+        frame[key] = values
+    return frame
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="stage1.synthesis.calibration")
+    parser.add_argument(
+        "history",
+        help="stage1.backtest CSV (nti, delta, delta2) or one row per run with columns Q, N",
+    )
+    parser.add_argument(
+        "--grid",
+        action="append",
+        default=[],
+        help="path=v1,v2,... (repeatable), e.g. trigger_threshold=0.6,0.7",
+    )
+    parser.add_argument("--out", default="calibration.csv")
+    args = parser.parse_args(argv)
+
+    grid = {}
+    for spec in args.grid:
+        key, _, values = spec.partition("=")
+        grid[key.strip()] = [float(v) for v in values.split(",") if v.strip()]
+
+    history = pd.read_csv(args.history)
+    if {"nti", "delta", "delta2"} <= set(history.columns):
+        frame = sweep_trigger(history, grid)
+    else:
+        frame = sweep_thresholds(history["Q"], history["N"], grid)
+    frame.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
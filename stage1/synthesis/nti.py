@@ -10,7 +10,24 @@ Implements:
 - Deterministic, sparse, high-entropy output
 """
 
-from typing import Dict
+from typing import Dict, Optional
+
+import numpy as np
+
+from stage1.ingestion.price_panel import PricePanel
+from utils.io import load_yaml_config
+
+THRESHOLDS_CONFIG = "config/nt_thresholds.yaml"
+
+# NTI level above which an accelerating reading triggers
+NTI_TRIGGER = 2.0
+
+
+def trigger_level(path: str = THRESHOLDS_CONFIG) -> float:
+    """
+    Configured NTI trigger level (nt_thresholds.yaml nti_trigger).
+    """
+    return float(load_yaml_config(path).get("nti_trigger", NTI_TRIGGER))
 
 
 def _resolution_bucket(regimes: Dict, bucket: str) -> Dict:
@@ -29,6 +46,39 @@ def _regime_agreement(regimes: Dict) -> bool:
     return len(trends) == 1 if regimes else False
 
 
+def nti_scores(short, medium, long, penalties, topology_bonus, level: float = NTI_TRIGGER) -> Dict:
+    """
+    NTI arithmetic from resolution levels, penalties and topology bonus.
+
+    Elementwise: accepts floats or equally-shaped arrays (one entry
+    per date in a backtest), so batch replays share the exact formulas.
+    Triggers when nti > level with positive delta and delta2.
+    """
+    nti_short = short - penalties * 0.5
+    nti_medium = medium - penalties * 0.75
+    nti_long = long - penalties
+
+    nti = nti_long + topology_bonus
+
+    delta = nti_short - nti_medium
+    delta2 = nti_short - 2 * nti_medium + nti_long
+
+    confidence = nti / (1.0 + penalties)
+
+    return {
+        "nti": nti,
+        "nti_short": nti_short,
+        "nti_medium": nti_medium,
+        "nti_long": nti_long,
+        "delta": delta,
+        "delta2": delta2,
+        "confidence": np.where(confidence > 0.0, confidence, 0.0),
+        "trigger": (nti > level) & (delta > 0) & (delta2 > 0),
+        "cross_asset_coherent": topology_bonus > 0,
+        "penalized": penalties > 0,
+    }
+
+
 def compute_nti(
     quant_results: Dict,
     nlp_results: Dict,
@@ -36,6 +86,7 @@ def compute_nti(
     enforce_cross_asset_coherence: bool = True,
     enforce_multi_resolution_agreement: bool = True,
     enable_temporal_dynamics: bool = True,
+    price_panel: Optional[PricePanel] = None,
 ) -> Dict:
 
     nti_levels = {"short": 0.0, "medium": 0.0, "long": 0.0}
@@ -55,7 +106,13 @@ def compute_nti(
             diagnostics["assets"][asset] = asset_diag
             continue
 
-        if market["status"] != "ok":
+        market_ok = market["status"] in ("ok", "stale")
+        if market["status"] == "stale":
+            asset_diag["stale_since"] = market["last_date"]
+        if price_panel is not None:
+            market_ok = market_ok and asset in price_panel
+
+        if not market_ok:
             penalties += 1.5
             asset_diag["penalty"] = "market_failed"
             diagnostics["assets"][asset] = asset_diag
@@ -82,37 +139,36 @@ def compute_nti(
 
     topology_bonus = 0.0
     if enforce_cross_asset_coherence:
-        clusters = quant_results.get("topology", {}).get("coherent_clusters", {})
-        topology_bonus = sum(1.0 for v in clusters.values() if v >= 2)
-
-    nti_short = nti_levels["short"] - penalties * 0.5
-    nti_medium = nti_levels["medium"] - penalties * 0.75
-    nti_long = nti_levels["long"] - penalties
-
-    nti = nti_long + topology_bonus
-
-    delta = nti_short - nti_medium
-    delta2 = nti_short - 2 * nti_medium + nti_long
+        topology = quant_results.get("topology", {})
+        if "clusters" in topology:
+            # One point per asset linked to at least one other asset
+            topology_bonus = float(sum(len(c) for c in topology["clusters"]))
+        else:
+            degrees = topology.get("coherent_clusters", {})
+            topology_bonus = sum(1.0 for v in degrees.values() if v >= 2)
+
+    scores = nti_scores(
+        nti_levels["short"],
+        nti_levels["medium"],
+        nti_levels["long"],
+        penalties,
+        topology_bonus,
+        trigger_level(),
+    )
 
     regime_flags = {
-        "trigger": nti > 2.0 and delta > 0 and delta2 > 0,
-        "cross_asset_coherent": topology_bonus > 0,
-        "penalized": penalties > 0,
+        flag: bool(scores[flag])
+        for flag in ("trigger", "cross_asset_coherent", "penalized")
     }
 
-    confidence = max(
-        0.0,
-        nti / (1.0 + penalties)
-    )
-
     return {
-        "nti": round(nti, 4),
-        "nti_short": round(nti_short, 4),
-        "nti_medium": round(nti_medium, 4),
-        "nti_long": round(nti_long, 4),
-        "delta": round(delta, 4),
-        "delta2": round(delta2, 4),
-        "confidence": round(confidence, 4),
+        **{
+            key: round(float(scores[key]), 4)
+            for key in (
+                "nti", "nti_short", "nti_medium", "nti_long",
+                "delta", "delta2", "confidence",
+            )
+        },
         "regime_flags": regime_flags,
         "diagnostics": diagnostics,
     }
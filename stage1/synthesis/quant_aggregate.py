@@ -12,6 +12,8 @@ Canon reference:
 
 from typing import Dict
 
+import numpy as np
+
 
 def aggregate_q(components: Dict[str, float]) -> float:
     """
@@ -33,3 +35,29 @@ def aggregate_q(components: Dict[str, float]) -> float:
         return 0.0
 
     return sum(values) / len(values)
+
+
+def aggregate_q_batch(components: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Aggregate quantitative components into Q for many assets at once.
+
+    Same rule as aggregate_q, applied column-wise: values outside
+    [0,1] or non-finite are excluded; assets with no valid
+    component score 0.0.
+
+    Args:
+        components: Mapping of component name -> (N,) values
+
+    Returns:
+        (N,) aggregated Q scores ∈ [0,1]
+    """
+    if not components:
+        return np.zeros(0)
+
+    stacked = np.vstack([np.asarray(v, dtype=np.float64) for v in components.values()])
+    valid = np.isfinite(stacked) & (stacked >= 0.0) & (stacked <= 1.0)
+
+    total = np.where(valid, stacked, 0.0).sum(axis=0)
+    count = valid.sum(axis=0)
+
+    return np.divide(total, count, out=np.zeros_like(total), where=count > 0)
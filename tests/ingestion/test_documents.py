@@ -0,0 +1,37 @@
+"""
+Document Inbox Ingestion
+
+Verifies that inbox records are loaded (incomplete ones dropped),
+linked to the universe and appended to their publication-day corpus
+partitions, and that re-ingesting stored ids writes nothing.
+"""
+
+import json
+from datetime import date
+
+from stage1.ingestion.documents import ingest_documents, load_documents
+from stage1.nlp.corpus_store import CorpusStore
+
+UNIVERSE = [{"ticker": "AAPL", "asset_name": "Apple Inc."}, {"ticker": "MSFT", "asset_name": "Microsoft"}]
+
+
+def test_inbox_documents_enter_the_corpus(tmp_path):
+    inbox = tmp_path / "documents.jsonl"
+    records = [
+        {"id": "a", "timestamp": "2024-01-02T13:30:00Z", "text": "Apple shares rally on earnings"},
+        {"id": "b", "timestamp": "2024-01-03T09:00:00Z", "text": "$MSFT and $AAPL cloud deal"},
+        {"id": "c", "timestamp": "2024-01-03T10:00:00Z"},
+    ]
+    inbox.write_text("\n".join(json.dumps(r) for r in records) + "\n")
+
+    loaded = load_documents(inbox)
+    assert [r["id"] for r in loaded] == ["a", "b"]
+    assert load_documents(tmp_path / "missing.jsonl") == []
+
+    corpus = CorpusStore(tmp_path / "corpus")
+    assert ingest_documents(corpus, UNIVERSE, loaded) == 2
+    assert corpus.days() == [date(2024, 1, 2), date(2024, 1, 3)]
+    assert [m["entities"] for m in corpus.metadata()] == [["AAPL"], ["AAPL", "MSFT"]]
+
+    # The next run's inbox repeats stored ids
+    assert ingest_documents(corpus, UNIVERSE, loaded) == 0
@@ -0,0 +1,73 @@
+"""
+Market Ingestion Batching
+
+Verifies the batched download path against a local fake downloader:
+- One request per batch
+- Per-ticker records identical in shape to the serial path
+- Failing tickers reported individually, never dropped
+- Failed batches bisected so good tickers survive a bad symbol
+"""
+
+import numpy as np
+import pandas as pd
+
+from stage1.ingestion.market_prices import load_market_prices
+
+
+DATES = pd.date_range("2024-01-01", periods=30, freq="B")
+
+
+def _frame(tickers):
+    columns = pd.MultiIndex.from_product([tickers, ["Open", "Close"]])
+    data = np.tile(np.linspace(100.0, 130.0, len(DATES))[:, None], (1, len(columns)))
+    return pd.DataFrame(data, index=DATES, columns=columns)
+
+
+class FakeDownloader:
+    def __init__(self, missing=(), broken=()):
+        self.missing = set(missing)
+        self.broken = set(broken)
+        self.calls = []
+
+    def __call__(self, tickers, **kwargs):
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        self.calls.append(tickers)
+        if self.broken & set(tickers):
+            raise RuntimeError("batch_failed")
+        return _frame([t for t in tickers if t not in self.missing])
+
+
+def test_batched_requests_split_per_ticker():
+    fake = FakeDownloader(missing={"CCC"})
+    universe = ["aaa", {"ticker": "BBB"}, "CCC", "DDD", "EEE"]
+
+    results = load_market_prices(universe, batch_size=2, downloader=fake)
+
+    assert fake.calls == [["AAA", "BBB"], ["CCC", "DDD"], ["EEE"]]
+    assert list(results) == ["AAA", "BBB", "CCC", "DDD", "EEE"]
+
+    assert results["AAA"]["status"] == "ok"
+    assert results["AAA"]["latest_price"] == 130.0
+    assert len(results["AAA"]["price_series"]) == len(DATES)
+
+    assert results["CCC"] == {
+        "status": "failed",
+        "reason": "no_price_data",
+        "price_series": None,
+    }
+
+
+def test_failed_batch_reports_each_ticker():
+    fake = FakeDownloader(broken={"BBB"})
+
+    results = load_market_prices(["AAA", "BBB", "CCC", "DDD"], batch_size=4, downloader=fake)
+
+    assert fake.calls == [
+        ["AAA", "BBB", "CCC", "DDD"],
+        ["AAA", "BBB"],
+        ["AAA"],
+        ["BBB"],
+        ["CCC", "DDD"],
+    ]
+    assert results["BBB"]["reason"] == "batch_failed"
+    assert all(results[t]["status"] == "ok" for t in ["AAA", "CCC", "DDD"])
@@ -0,0 +1,83 @@
+"""
+Price Cache Replay
+
+Verifies cache-fronted ingestion against a local fake downloader:
+- First run seeds full history
+- Later runs fetch only the missing range and append
+- Re-adjusted history invalidates and rewrites the ticker
+- A failed refresh serves the cache flagged stale, never as "ok"
+"""
+
+import numpy as np
+import pandas as pd
+
+from stage1.ingestion.market_prices import load_market_prices
+from stage1.ingestion.price_cache import PriceCache
+
+
+TODAY = pd.Timestamp.now(tz="UTC").tz_localize(None).normalize()
+HISTORY = pd.date_range(end=TODAY - pd.Timedelta(days=1), periods=300, freq="D")
+
+
+class FakeDownloader:
+    def __init__(self, closes):
+        self.closes = closes
+        self.calls = []
+
+    def __call__(self, tickers, start=None, period=None, **kwargs):
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        self.calls.append({"tickers": tickers, "start": start, "period": period})
+        frame = self.closes if start is None else self.closes[self.closes.index >= start]
+        columns = pd.MultiIndex.from_product([tickers, ["Close"]])
+        return pd.DataFrame(frame[tickers].to_numpy(), index=frame.index, columns=columns)
+
+
+def _closes(index):
+    base = np.linspace(100.0, 200.0, len(index))
+    return pd.DataFrame({"AAA": base, "BBB": base * 2.0}, index=index)
+
+
+def test_incremental_append_and_invalidation(tmp_path):
+    cache = PriceCache(str(tmp_path))
+
+    fake = FakeDownloader(_closes(HISTORY[:-5]))
+    first = load_market_prices(["AAA", "BBB"], downloader=fake, cache=cache)
+    assert fake.calls[0]["period"] == "max"
+    assert len(cache.load("AAA")) == 295
+
+    fake = FakeDownloader(_closes(HISTORY))
+    fake.closes.iloc[:295] = _closes(HISTORY[:-5]).to_numpy()
+    second = load_market_prices(["AAA", "BBB"], downloader=fake, cache=cache)
+
+    assert [c["period"] for c in fake.calls] == [None]
+    assert fake.calls[0]["start"] is not None
+    assert len(cache.load("AAA")) == 300
+    assert second["AAA"]["latest_price"] == 200.0
+    assert len(second["AAA"]["price_series"]) > len(first["AAA"]["price_series"]) - 5
+
+    # Split-style re-adjustment of BBB history
+    adjusted = fake.closes.copy()
+    adjusted["BBB"] = adjusted["BBB"] / 2.0
+    fake = FakeDownloader(adjusted)
+    load_market_prices(["AAA", "BBB"], downloader=fake, cache=cache)
+
+    assert fake.calls[-1] == {"tickers": ["BBB"], "start": None, "period": "max"}
+    assert np.allclose(cache.load("BBB").to_numpy(), adjusted["BBB"].to_numpy())
+
+
+def test_failed_refresh_is_flagged_stale(tmp_path):
+    cache = PriceCache(str(tmp_path))
+    load_market_prices(["AAA", "BBB"], downloader=FakeDownloader(_closes(HISTORY[:-5])), cache=cache)
+
+    def broken(tickers, start=None, **kwargs):
+        if "BBB" in ([tickers] if isinstance(tickers, str) else tickers):
+            raise RuntimeError("timeout")
+        return FakeDownloader(_closes(HISTORY))(tickers, start=start, **kwargs)
+
+    results = load_market_prices(["AAA", "BBB"], downloader=broken, cache=cache)
+
+    assert results["AAA"]["status"] == "ok"
+    assert results["BBB"]["status"] == "stale"
+    assert results["BBB"]["reason"] == "timeout"
+    assert results["BBB"]["last_date"] == HISTORY[-6].strftime("%Y-%m-%d")
+    assert results["BBB"]["latest_price"] == cache.load("BBB").iloc[-1]
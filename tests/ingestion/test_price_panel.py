@@ -0,0 +1,37 @@
+"""
+Price Panel Alignment
+
+Verifies date alignment across assets with different calendars
+and that returns are taken against each asset's previous valid close.
+"""
+
+import numpy as np
+import pandas as pd
+
+from stage1.ingestion.price_panel import PricePanel
+
+
+def test_union_calendar_and_returns():
+    a = pd.Series([100.0, 101.0, 102.0], index=pd.to_datetime(["2024-01-02", "2024-01-03", "2024-01-04"]))
+    b = pd.Series([50.0, 55.0], index=pd.to_datetime(["2024-01-02", "2024-01-04"]))
+
+    panel = PricePanel.from_series({"A": a, "B": b})
+
+    assert panel.values.flags["C_CONTIGUOUS"]
+    assert panel.values.shape == (3, 2)
+    assert panel.mask[:, 1].tolist() == [True, False, True]
+    assert panel.series("B").tolist() == [50.0, 55.0]
+
+    r = panel.returns()
+    assert np.isnan(r[0]).all()
+    assert np.isclose(r[2, 0], 102.0 / 101.0 - 1.0)
+    assert np.isnan(r[1, 1])
+    assert np.isclose(r[2, 1], 0.1)
+
+
+def test_undated_lists_are_right_aligned():
+    panel = PricePanel.from_lists({"A": [1.0, 2.0, 3.0], "B": [5.0]})
+
+    assert panel.column("B").tolist()[-1] == 5.0
+    assert panel.counts().tolist() == [3, 1]
+    assert "B" in panel and "C" not in panel
@@ -0,0 +1,155 @@
+"""
+Day-Partitioned Corpus Store
+
+Verifies that windows read back from the memory-mapped partitions
+match the appended documents (and counts built from raw tokens),
+that re-fetched ids and torn writes do not corrupt the store, that
+syndicated copies are stored once and weighted, that the BM25 index
+is maintained incrementally across runs, and that compaction drops
+expired days.
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from stage1.nlp.corpus_store import CorpusStore, entity_windows
+from stage1.nlp.hashing import HashingVectorizer
+from stage1.nlp.relevance_index import InvertedIndex
+from stage1.nlp.token_counts import TokenCounts, default_vocabulary
+
+WORDS = ["gain", "loss", "up", "down", "fed", "cpi", "earnings", "rally", "crash", "oil"]
+
+
+def _batch(rng, day, n):
+    docs = [list(rng.choice(WORDS, size=rng.integers(0, 8))) for _ in range(n)]
+    stamps = [f"{day.isoformat()}T{rng.integers(24):02d}:00:00Z" for _ in range(n)]
+    entities = [list(rng.choice(["AAA", "BBB"], size=rng.integers(0, 3), replace=False)) for _ in range(n)]
+    return docs, stamps, entities
+
+
+def _fill(root, days=45, seed=0):
+    rng = np.random.default_rng(seed)
+    store = CorpusStore(root)
+    history = {}
+    start = date(2024, 1, 1)
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        for _ in range(2):  # two runs per day append to the same partition
+            docs, stamps, entities = _batch(rng, day, 20)
+            store.append(docs, stamps, entities, dedup=False)
+            history.setdefault(day, []).extend(zip(docs, entities))
+    return store, history
+
+
+def test_windows_match_appended_documents(tmp_path):
+    store, history = _fill(tmp_path / "corpus")
+    end = max(history)
+    window = [end - timedelta(days=k) for k in range(29, -1, -1)]
+
+    expected = [doc for day in window for doc, _ in history[day]]
+    assert store.documents(30) == expected
+
+    aaa = [doc for day in window[-7:] for doc, ents in history[day] if "AAA" in ents]
+    assert store.documents(7, entity="AAA") == aaa
+
+    # A fresh process reads the same windows through its own vocabulary,
+    # leaving the process-wide one untouched
+    shared = len(default_vocabulary())
+    reopened = CorpusStore(tmp_path / "corpus")
+    assert reopened.vocab is not store.vocab and len(default_vocabulary()) == shared
+    counts = reopened.counts(7, entity="AAA")
+    reference = TokenCounts.from_documents(aaa, reopened.vocab)
+    assert (counts.n_docs, counts.pos, counts.neg) == (reference.n_docs, reference.pos, reference.neg)
+    np.testing.assert_array_equal(counts.ids, reference.ids)
+    np.testing.assert_array_equal(counts.tf, reference.tf)
+
+    # The batched per-entity windows agree with one-entity reads
+    windows = entity_windows(reopened, ["AAA", "BBB", "ZZZ"])
+    for entity, (recent, prior) in windows.items():
+        prior_end = end - timedelta(days=7)
+        for batched, single in ((recent, reopened.counts(7, end, entity)),
+                                (prior, reopened.counts(30, prior_end, entity))):
+            assert batched.n_docs == single.n_docs
+            np.testing.assert_array_equal(batched.ids, single.ids)
+            np.testing.assert_array_equal(batched.tf, single.tf)
+    assert windows["ZZZ"][0].n_docs == 0
+
+
+def test_refetched_ids_and_torn_writes(tmp_path):
+    store = CorpusStore(tmp_path)
+    stamps = ["2024-05-01T09:00:00Z", "2024-05-01T10:00:00Z"]
+    assert store.append(["Stocks rally", "Oil drops"], stamps, doc_ids=["a", "b"]) == 2
+    assert store.append(["Stocks rally", "Gold up"], stamps, doc_ids=["a", "c"]) == 1
+
+    # Simulate a crash midway through an append
+    partition = tmp_path / "2024-05-01"
+    with open(partition / "tokens.i32", "ab") as f:
+        f.write(b"\x07\x00")
+    with open(partition / "docs.jsonl", "ab") as f:
+        f.write(b'{"id": "tor')
+
+    store = CorpusStore(tmp_path)
+    assert [m["id"] for m in store.metadata()] == ["a", "b", "c"]
+    store.append(["Rates down"], ["2024-05-01T12:00:00Z"], doc_ids=["d"])
+    assert CorpusStore(tmp_path).documents() == [
+        ["stocks", "rally"], ["oil", "drops"], ["gold", "up"], ["rates", "down"],
+    ]
+
+
+def test_syndicated_copies_stored_once_and_weighted(tmp_path):
+    store = CorpusStore(tmp_path)
+    headline = "Apple beats earnings estimates as iPhone sales surge in China"
+    docs = [headline, headline.upper() + "!", headline + " - Reuters", "Fed holds rates steady"]
+    stamps = ["2024-05-01T09:00:00Z"] * 4
+    entities = [["AAPL"], ["AAPL", "QQQ"], [], ["FED"]]
+
+    assert store.append(docs, stamps, entities) == 2
+    meta = store.metadata()
+    assert [(m["entities"], m["copies"]) for m in meta] == [(["AAPL", "QQQ"], 3), (["FED"], 1)]
+
+    stored = store.documents()
+    reference = TokenCounts.from_documents(stored, store.vocab, weights=[3, 1])
+    counts = store.counts()
+    assert counts.n_docs == 4
+    np.testing.assert_array_equal(counts.tf, reference.tf)
+
+    recent, _ = entity_windows(store, ["QQQ"])["QQQ"]
+    assert recent.n_docs == 3
+
+
+@pytest.mark.parametrize("hashing", [None, HashingVectorizer(1 << 10)])
+def test_relevance_index_vectorizes_only_new_partitions(tmp_path, monkeypatch, hashing):
+    store, history = _fill(tmp_path, days=35)
+    store.relevance_index(hashing=hashing)
+
+    rng = np.random.default_rng(1)
+    day = max(history) + timedelta(days=1)
+    docs, stamps, entities = _batch(rng, day, 20)
+    store.append(docs, stamps, entities, dedup=False)
+    history[day] = list(zip(docs, entities))
+
+    vectorized = []
+    terms = InvertedIndex._terms
+    monkeypatch.setattr(InvertedIndex, "_terms", lambda self, doc: vectorized.append(doc) or terms(self, doc))
+
+    # The next run (a new process) re-reads the saved day partitions
+    index = CorpusStore(tmp_path).relevance_index(hashing=hashing)
+    assert vectorized == docs
+
+    reference = InvertedIndex(hashing=hashing)
+    for d in sorted(history)[-30:]:
+        reference.add_documents(d, [doc for doc, _ in history[d]])
+    assert index.days == reference.days
+    assert (index.n_docs, index.avg_length) == (reference.n_docs, reference.avg_length)
+    for query in (["gain", "fed"], ["crash"], ["oil", "rally", "up"]):
+        np.testing.assert_allclose(index.score(query)[1], reference.score(query)[1])
+
+
+def test_compaction_drops_expired_partitions(tmp_path):
+    store, history = _fill(tmp_path, days=45)
+    removed = store.compact()
+    assert len(removed) == 8
+    assert store.days() == sorted(history)[8:]
+    assert len(store.days()) == store.retention_days
@@ -0,0 +1,82 @@
+"""
+MinHash / LSH Deduplication
+
+Verifies syndicated near-duplicates collapse with counts, distinct
+headlines survive, and weighted counts match the expanded corpus.
+"""
+
+import numpy as np
+
+from stage1.nlp.dedup import deduplicate, minhash_signatures, shingle_hashes
+from stage1.nlp.token_counts import TokenCounts
+
+STORIES = [
+    "Fed holds rates steady, signals two cuts later this year",
+    "Oil jumps as OPEC+ extends production cuts into next quarter",
+    "Apple shares slide after iPhone sales miss analyst estimates",
+    "Bank earnings beat expectations on strong trading revenue",
+    "Treasury yields climb after hotter than expected inflation data",
+]
+SUFFIXES = ["", " - Reuters", " | Bloomberg", " (AP)", ": report", " - MarketWatch"]
+
+
+def _batch(seed=2):
+    rng = np.random.default_rng(seed)
+    texts, truth = [], []
+    for _ in range(300):
+        s = int(rng.integers(len(STORIES)))
+        text = STORIES[s] + SUFFIXES[int(rng.integers(len(SUFFIXES)))]
+        texts.append(text.upper() if rng.random() < 0.2 else text)
+        truth.append(s)
+    return texts, truth
+
+
+def _jaccard(a, b, k=5):
+    def grams(t):
+        t = " ".join(t.lower().replace(",", " ").split())
+        return {t[i:i + k] for i in range(len(t) - k + 1)}
+    ga, gb = grams(a), grams(b)
+    return len(ga & gb) / len(ga | gb)
+
+
+def test_syndicated_copies_collapse_to_stories():
+    texts, truth = _batch()
+    result = deduplicate(texts)
+
+    assert len(result["representatives"]) == len(STORIES)
+    assert sum(result["counts"]) == len(texts)
+
+    for i, label in enumerate(result["labels"]):
+        assert truth[label] == truth[i]
+        assert label <= i
+
+
+def test_signature_agreement_estimates_jaccard():
+    a = STORIES[0]
+    b = STORIES[0].replace("two", "three")
+    sig = minhash_signatures([a, b, STORIES[1]])
+
+    estimate = (sig[0] == sig[1]).mean()
+    assert abs(estimate - _jaccard(a, b)) < 0.15
+    assert (sig[0] == sig[2]).mean() < 0.1
+
+    hashes, starts = shingle_hashes(["ab", "hello world"])
+    assert starts.tolist() == [0, 1] and len(hashes) == 1 + len("hello world") - 4
+
+
+def test_weights_equal_replicated_documents():
+    texts, _ = _batch(seed=5)
+    result = deduplicate(texts)
+
+    tokens = [t.lower().split() for t in texts]
+    reps = [tokens[i] for i in result["representatives"]]
+
+    weighted = TokenCounts.from_documents(reps, weights=result["counts"])
+    replicated = TokenCounts.from_documents(
+        [doc for doc, c in zip(reps, result["counts"]) for _ in range(c)]
+    )
+
+    assert weighted.n_docs == replicated.n_docs == len(texts)
+    assert (weighted.pos, weighted.neg) == (replicated.pos, replicated.neg)
+    np.testing.assert_array_equal(weighted.ids, replicated.ids)
+    np.testing.assert_array_equal(weighted.tf, replicated.tf)
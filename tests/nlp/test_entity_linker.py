@@ -0,0 +1,65 @@
+"""
+Aho-Corasick Entity Linker
+
+Verifies automaton links against a naive per-asset regex scan over
+random headlines, and that linkers are reused until the universe
+changes.
+"""
+
+import re
+
+import numpy as np
+
+from stage1.nlp.entity_linker import get_linker
+
+UNIVERSE = [
+    {"ticker": "AAPL", "asset_name": "Apple Inc."},
+    {"ticker": "XOM", "asset_name": "Exxon Mobil Corporation"},
+    {"ticker": "BAC", "asset_name": "Bank of America Corp", "aliases": "BofA"},
+    {"ticker": "ON", "asset_name": "ON Semiconductor Corp"},
+    {"ticker": "F", "asset_name": "Ford Motor Co", "aliases": "Ford"},
+]
+
+FILLER = ["shares", "rally", "on", "pineapple", "america", "xomx", "down", "f", "semis"]
+MENTIONS = [
+    "Apple", "apple inc.", "AAPL", "$aapl", "aapl", "Exxon Mobil", "XOM",
+    "bank of america", "BofA", "ON", "on semiconductor", "Ford", "$F", "F",
+]
+
+
+def _naive(text):
+    patterns = {
+        "AAPL": [r"(?i:apple inc)", r"(?i:apple)", r"AAPL", r"(?i:\$aapl)"],
+        "XOM": [r"(?i:exxon mobil)", r"XOM", r"(?i:\$xom)"],
+        "BAC": [r"(?i:bank of america)", r"(?i:bofa)", r"BAC", r"(?i:\$bac)"],
+        "ON": [r"(?i:on semiconductor)", r"ON", r"(?i:\$on)"],
+        "F": [r"(?i:ford motor)", r"(?i:ford)", r"(?i:\$f)"],
+    }
+    return [
+        ticker
+        for ticker, regexes in patterns.items()
+        if any(re.search(rf"(?<![^\W_]){p}(?![^\W_])", text) for p in regexes)
+    ]
+
+
+def test_links_match_naive_scan():
+    rng = np.random.default_rng(5)
+    words = FILLER + MENTIONS
+    docs = [" ".join(rng.choice(words, size=rng.integers(0, 8))) for _ in range(2000)]
+    docs += ["Apple's rally", "($AAPL)", "Pineapple up", "turned on", "F-150 recall"]
+
+    linker = get_linker(UNIVERSE)
+    assert linker.link(docs) == [_naive(d) for d in docs]
+
+    postings = linker.postings(docs)
+    for ticker, rows in postings.items():
+        assert rows.tolist() == [i for i, d in enumerate(docs) if ticker in _naive(d)]
+
+
+def test_linker_rebuilt_only_on_universe_change():
+    first = get_linker(UNIVERSE)
+    assert get_linker([dict(a) for a in reversed(UNIVERSE)]) is first
+
+    changed = UNIVERSE + [{"ticker": "MSFT", "asset_name": "Microsoft Corp"}]
+    assert get_linker(changed) is not first
+    assert get_linker(changed).link(["Microsoft beats"]) == [["MSFT"]]
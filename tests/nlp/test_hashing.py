@@ -0,0 +1,94 @@
+"""
+Feature Hashing Mode
+
+Verifies the signed hashed counts against a per-term reference,
+streamed chunks and the running IDF sketch against one-shot
+vectorization, that hashed relevance and topic modes reproduce
+the vocabulary modes when the width leaves no collisions, and that
+the topic model refuses widths above its cap.
+"""
+
+from collections import Counter
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+from scipy.sparse import vstack
+
+from stage1.nlp.hashing import HashingVectorizer, IdfSketch
+from stage1.nlp.relevance_index import InvertedIndex, analyze
+from stage1.nlp.topics import TOPIC_MAX_FEATURES, TopicModel
+
+WORDS = "apple iphone revenue chips tariff rally bank rates crude oil opec guidance".split()
+
+
+def _docs(seed, n):
+    rng = np.random.default_rng(seed)
+    return [" ".join(rng.choice(WORDS, size=rng.integers(0, 12))) for _ in range(n)]
+
+
+def test_signed_counts_match_reference():
+    vectorizer = HashingVectorizer(n_features=64)
+    docs = _docs(0, 200)
+    X = vectorizer.transform(docs).toarray()
+
+    expected = np.zeros_like(X)
+    for i, doc in enumerate(docs):
+        for term, count in Counter(analyze(doc)).items():
+            (bucket,), (sign,) = vectorizer.buckets([term])
+            expected[i, bucket] += sign * count
+    np.testing.assert_array_equal(X, expected)
+
+
+def test_streamed_chunks_and_idf_sketch():
+    vectorizer = HashingVectorizer(n_features=256)
+    docs = _docs(1, 1000)
+
+    whole = vectorizer.transform(docs)
+    chunks = list(vectorizer.stream(iter(docs), chunk_size=128))
+    assert len(chunks) == 8
+    assert (vstack(chunks) != whole).nnz == 0
+
+    streamed, once = IdfSketch(256), IdfSketch(256)
+    for chunk in chunks:
+        streamed.update(chunk)
+    once.update(whole)
+    np.testing.assert_array_equal(streamed.df, once.df)
+
+    # Subtracting a chunk restores the sketch of the rest
+    streamed.subtract(chunks[0])
+    rest = IdfSketch(256)
+    rest.update(vstack(chunks[1:]).tocsr())
+    np.testing.assert_array_equal(streamed.df, rest.df)
+    assert streamed.n_docs == rest.n_docs == 872
+
+
+def test_hashed_modes_match_vocabulary_modes_without_collisions():
+    vectorizer = HashingVectorizer(n_features=1 << 20)
+    start = date(2024, 3, 1)
+
+    exact, hashed = InvertedIndex(), InvertedIndex(hashing=vectorizer)
+    for d in range(35):
+        docs = _docs(d, 5)
+        exact.add_documents(start + timedelta(days=d), docs)
+        hashed.add_documents(start + timedelta(days=d), docs)
+    # The hashed index keeps its window df as a running IDF sketch
+    assert hashed.df.n_docs == exact.n_docs
+    assert hashed.df.df.sum() == sum(exact.df.values())
+    for query in ["apple revenue", "crude oil opec", "bank rates tariff"]:
+        np.testing.assert_allclose(hashed.score(query)[1], exact.score(query)[1])
+
+    # Topic conflict separates a narrative shift in hashed mode too
+    topics = TopicModel(k=3, hashing=HashingVectorizer(n_features=1 << 12))
+    for d in range(40):
+        shifted = d >= 33
+        aaa = ["crude oil opec rates" if shifted else "apple iphone revenue chips"] * 4
+        topics.update(start + timedelta(days=d), aaa + ["bank rates guidance"] * 4, [["AAA"]] * 4 + [["BBB"]] * 4)
+    conflict = topics.conflict()
+    assert conflict["AAA"] > 0.9 and conflict["BBB"] < 0.1
+
+
+def test_topic_model_refuses_wide_feature_spaces():
+    with pytest.raises(ValueError):
+        TopicModel(hashing=HashingVectorizer(n_features=TOPIC_MAX_FEATURES * 2))
+    assert TopicModel(hashing=HashingVectorizer(n_features=TOPIC_MAX_FEATURES)).centroids.shape[1] == TOPIC_MAX_FEATURES
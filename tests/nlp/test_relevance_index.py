@@ -0,0 +1,108 @@
+"""
+BM25 Relevance Index
+
+Verifies incremental day-by-day maintenance against a fresh build
+of the same window, scores against a brute-force BM25, and batch
+tokenization against per-document tokenization.
+"""
+
+from collections import Counter
+from datetime import date, timedelta
+
+import numpy as np
+
+from stage1.nlp.nlp_engine import run_nlp_analysis
+from stage1.nlp.relevance_index import InvertedIndex, analyze, entity_query, tokenize, tokenize_batch
+
+WORDS = "apple iphone revenue chips tariff rally bank rates crude oil opec guidance".split()
+
+
+def _corpus(days=40, seed=9):
+    rng = np.random.default_rng(seed)
+    start = date(2024, 3, 1)
+    return [
+        (
+            start + timedelta(days=d),
+            [
+                " ".join(rng.choice(WORDS, size=rng.integers(3, 12)))
+                for _ in range(rng.integers(0, 6))
+            ],
+        )
+        for d in range(days)
+    ]
+
+
+def _reference(days, query, k1=1.5, b=0.75):
+    docs = [Counter(analyze(doc)) for _, texts in days for doc in texts]
+    lengths = np.array([sum(d.values()) for d in docs], dtype=float)
+    n, avg = len(docs), lengths.mean()
+
+    terms = set(analyze(query))
+    idf = {}
+    for t in terms:
+        df = sum(1 for d in docs if t in d)
+        if df:
+            idf[t] = np.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    bound = sum(idf.values()) * (k1 + 1)
+    scores = np.zeros(n)
+    for i, d in enumerate(docs):
+        for t, w in idf.items():
+            tf = d.get(t, 0)
+            scores[i] += w * tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths[i] / avg))
+    return scores / bound
+
+
+def test_incremental_window_matches_fresh_build():
+    corpus = _corpus()
+
+    rolling = InvertedIndex(window_days=30)
+    for day, texts in corpus:
+        rolling.add_documents(day, texts)
+
+    window = [(d, t) for d, t in corpus if d > corpus[-1][0] - timedelta(days=30)]
+    fresh = InvertedIndex(window_days=30)
+    for day, texts in window:
+        fresh.add_documents(day, texts)
+
+    assert rolling.days == fresh.days == [d for d, _ in window]
+    assert rolling.n_docs == fresh.n_docs
+    assert rolling.df == fresh.df
+
+    for query in ["apple iphone", "crude oil opec", "bank rates"]:
+        ids, scores = rolling.score(query)
+        expected = _reference(window, query)
+
+        assert ids == fresh.score(query)[0]
+        assert np.allclose(scores, expected, rtol=1e-12, atol=0)
+        assert ((scores >= 0) & (scores <= 1)).all()
+
+        top = np.sort(expected)[::-1][:10]
+        assert np.isclose(rolling.relevance(query), top.mean())
+
+
+def test_nlp_engine_reports_relevance():
+    index = InvertedIndex()
+    index.add_documents("2024-05-02", ["$AAPL apple iphone sales beat", "crude oil slides"])
+
+    universe = [
+        {"ticker": "AAPL", "asset_name": "Apple Inc"},
+        {"ticker": "XOM", "asset_name": "Exxon Mobil"},
+    ]
+    assert entity_query(universe[0]) == ["aapl", "apple", "inc"]
+    result = run_nlp_analysis(universe, relevance_index=index)["per_asset"]
+
+    assert result["AAPL"]["relevance"] > 0
+    assert result["XOM"]["relevance"] == 0.0
+    assert "relevance" not in run_nlp_analysis(universe)["per_asset"]["AAPL"]
+
+
+def test_batch_tokenization_matches_per_document():
+    docs = [
+        "Apple's Q3 beat... $AAPL up 3.5%!", "", "Fed\nholds rates",
+        "--- $ ...", "U.S. oil & gas", "the and of",
+    ]
+    tokens, lengths = tokenize_batch(docs)
+    per_doc = [tokenize(d) for d in docs]
+    assert lengths == [len(t) for t in per_doc]
+    assert tokens == [t for doc in per_doc for t in doc]
@@ -0,0 +1,84 @@
+"""
+Weighted-Lexicon Sentiment
+
+Verifies sparse batch polarity against a per-document token walk,
+lexicon file loading, and the canon vol-adjusted S / N_sent.
+"""
+
+import numpy as np
+import pytest
+
+from stage1.ingestion.price_panel import PricePanel
+from stage1.nlp.sentiment import (
+    NEGATIVE_WORDS,
+    POSITIVE_WORDS,
+    LexiconScorer,
+    load_lexicon,
+    realized_volatility,
+    sentiment_stress,
+)
+
+LEXICON_CSV = """term,weight
+# finance terms
+beat,0.8
+downgrade,-0.7
+Guidance Cut,-1.0
+record,0.4
+default,-0.9
+"""
+
+WORDS = ["beat", "downgrade", "guidance", "cut", "record", "default", "shares", "fed", "rates"]
+
+
+def _reference(doc, lexicon):
+    tokens = doc.lower().split()
+    hits = [lexicon[t] for t in tokens if t in lexicon]
+    hits += [lexicon[" ".join(p)] for p in zip(tokens, tokens[1:]) if " ".join(p) in lexicon]
+    mass = sum(abs(w) for w in hits)
+    return sum(hits) / mass if mass else np.nan
+
+
+def test_batch_polarity_matches_token_walk(tmp_path):
+    path = tmp_path / "lexicon.csv"
+    path.write_text(LEXICON_CSV)
+    lexicon = load_lexicon(str(path))
+    assert lexicon["guidance cut"] == -1.0 and len(lexicon) == 5
+
+    rng = np.random.default_rng(3)
+    docs = [" ".join(rng.choice(WORDS, size=rng.integers(0, 10))) for _ in range(3000)]
+
+    polarity = LexiconScorer(lexicon).polarity(docs)
+    expected = np.array([_reference(d, lexicon) for d in docs])
+    np.testing.assert_allclose(polarity, expected, atol=1e-12, equal_nan=True)
+
+
+def test_builtin_lexicon_and_invalid_weights(tmp_path):
+    lexicon = load_lexicon()
+    assert {t for t, w in lexicon.items() if w > 0} == POSITIVE_WORDS
+    assert {t for t, w in lexicon.items() if w < 0} == NEGATIVE_WORDS
+
+    path = tmp_path / "bad.csv"
+    path.write_text("term,weight\nrally,1.5\n")
+    with pytest.raises(RuntimeError):
+        load_lexicon(str(path))
+
+
+def test_vol_adjusted_stress():
+    rng = np.random.default_rng(8)
+    prices = {
+        "AAA": 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 60))),
+        "BBB": 50 * np.exp(np.cumsum(rng.normal(0, 0.05, 60))),
+        "CCC": [10.0] * 15,  # too short for σ_real
+    }
+    panel = PricePanel.from_lists(prices)
+    sigma = realized_volatility(panel)
+    assert set(sigma) == {"AAA", "BBB"}
+    assert sigma["AAA"] == pytest.approx(np.diff(np.log(prices["AAA"]))[-20:].std())
+
+    polarity = np.array([0.5, -1.0, np.nan, 1.0, 0.25])
+    postings = {"AAA": np.array([0, 1, 2]), "BBB": np.array([3, 4]), "CCC": np.array([0])}
+    stress = sentiment_stress(polarity, postings, sigma)
+
+    assert set(stress) == {"AAA", "BBB"}
+    assert stress["AAA"]["S"] == pytest.approx(-0.25 * sigma["AAA"])
+    assert stress["BBB"]["N_sent"] == pytest.approx(min(abs(0.625 * sigma["BBB"]) / 2, 1.0))
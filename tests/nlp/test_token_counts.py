@@ -0,0 +1,65 @@
+"""
+Single-Pass Token Counts
+
+Verifies sentiment, conflict and burst computed from one shared
+TokenCounts record match the original per-component token walks.
+"""
+
+from collections import Counter
+
+import numpy as np
+
+from stage1.nlp.conflict import conflict_signal
+from stage1.nlp.relevance_burst import relevance_burst_signal
+from stage1.nlp.sentiment import NEGATIVE_WORDS, POSITIVE_WORDS, sentiment_signal
+from stage1.nlp.token_counts import TokenCounts
+
+WORDS = sorted(POSITIVE_WORDS | NEGATIVE_WORDS) + ["fed", "cpi", "earnings", "guidance", "oil"]
+
+
+def _docs(seed, n):
+    rng = np.random.default_rng(seed)
+    return [list(rng.choice(WORDS, size=rng.integers(0, 15))) for _ in range(n)]
+
+
+def _polarity(docs):
+    tokens = [t for d in docs for t in d]
+    pos = sum(t in POSITIVE_WORDS for t in tokens)
+    neg = sum(t in NEGATIVE_WORDS for t in tokens)
+    return pos, neg
+
+
+def _reference_burst(docs, baseline):
+    current, base = Counter(t for d in docs for t in d), Counter(t for d in baseline for t in d)
+    ratios = [c / base[t] for t, c in current.items() if base.get(t)]
+    return min(max(sum(ratios) / len(ratios), 0.0), 1.0) if ratios else 0.0
+
+
+def test_components_from_shared_record_match_token_walks():
+    for seed in range(20):
+        docs, baseline = _docs(seed, 12), _docs(seed + 100, 40)
+        counts = TokenCounts.from_documents(docs)
+        base_counts = TokenCounts.from_documents(baseline)
+
+        pos, neg = _polarity(docs)
+        assert (counts.pos, counts.neg) == (pos, neg)
+        assert counts.n_docs == 12
+        assert counts.n_tokens == sum(len(d) for d in docs)
+        assert {counts.vocab.tokens[i]: int(c) for i, c in zip(counts.ids, counts.tf)} == Counter(
+            t for d in docs for t in d
+        )
+
+        total = pos + neg
+        assert sentiment_signal(counts) == sentiment_signal(docs) == (abs(pos - neg) / total if total else 0.0)
+        assert conflict_signal(counts) == conflict_signal(docs) == (1 - abs(pos - neg) / total if total else 0.0)
+        assert np.isclose(relevance_burst_signal(counts, base_counts), _reference_burst(docs, baseline))
+        assert relevance_burst_signal(counts, baseline) == relevance_burst_signal(counts, base_counts)
+
+
+def test_empty_inputs_score_zero():
+    empty = TokenCounts.from_documents([])
+
+    assert sentiment_signal([]) == sentiment_signal(empty) == 0.0
+    assert conflict_signal([[]]) == 0.0
+    assert relevance_burst_signal(empty, [["gain"]]) == 0.0
+    assert relevance_burst_signal([["gain"]], [[]]) == 0.0
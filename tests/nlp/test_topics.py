@@ -0,0 +1,80 @@
+"""
+Incremental Topic Clustering
+
+Verifies that narrative conflict separates an entity whose topics
+shift in the last 7 days from one whose coverage stays steady, that
+entities without both windows are excluded, and that saved state
+resumes identically.
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+
+from stage1.nlp.topics import TopicModel
+
+NARRATIVES = {
+    "earnings": "quarterly earnings beat revenue guidance margin profit outlook",
+    "lawsuit": "regulator lawsuit fraud probe court settlement investigation",
+    "rates": "central bank rates inflation yields hike treasury policy",
+}
+
+
+def _headlines(rng, topic, n):
+    words = NARRATIVES[topic].split()
+    return [" ".join(rng.choice(words, size=6)) for _ in range(n)]
+
+
+def _feed(model, start, days, rng, tail=None):
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        shifted = tail is not None and offset >= days - 7
+        aaa = _headlines(rng, "lawsuit" if shifted else "earnings", 5)
+        bbb = _headlines(rng, "rates", 5)
+        model.update(day, aaa + bbb, [["AAA"]] * 5 + [["BBB"]] * 5)
+
+
+def test_topic_shift_raises_conflict():
+    rng = np.random.default_rng(0)
+    model = TopicModel(k=4)
+    _feed(model, date(2024, 1, 1), 40, rng, tail=True)
+
+    conflict = model.conflict()
+    assert conflict["AAA"] > 0.9
+    assert conflict["BBB"] < 0.1
+    assert all(0.0 <= v <= 1.0 for v in conflict.values())
+
+    # Snapshots beyond the 37-day window are evicted
+    assert len(model._snapshots) == 37
+
+
+def test_missing_window_is_excluded():
+    rng = np.random.default_rng(1)
+    model = TopicModel(k=3)
+    _feed(model, date(2024, 1, 1), 10, rng)
+    model.update(date(2024, 1, 11), _headlines(rng, "rates", 3), [["NEW"]] * 3)
+
+    conflict = model.conflict()
+    assert conflict["NEW"] is None
+    assert conflict["BBB"] is not None
+
+
+def test_saved_state_resumes_identically(tmp_path):
+    rng_a, rng_b = np.random.default_rng(2), np.random.default_rng(2)
+    start = date(2024, 3, 1)
+
+    straight = TopicModel(k=4)
+    _feed(straight, start, 40, rng_a, tail=True)
+
+    resumed = TopicModel(k=4)
+    _feed(resumed, start, 20, rng_b)
+    resumed.save(tmp_path / "topics.npz")
+    resumed = TopicModel.load(tmp_path / "topics.npz")
+    for offset in range(20, 40):
+        day = start + timedelta(days=offset)
+        aaa = _headlines(rng_b, "lawsuit" if offset >= 33 else "earnings", 5)
+        bbb = _headlines(rng_b, "rates", 5)
+        resumed.update(day, aaa + bbb, [["AAA"]] * 5 + [["BBB"]] * 5)
+
+    assert resumed.conflict() == straight.conflict()
+    np.testing.assert_array_equal(resumed.centroids, straight.centroids)
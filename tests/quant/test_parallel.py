@@ -0,0 +1,41 @@
+"""
+Sharded Quant Execution
+
+Verifies process-pool sharded execution over the memory-mapped
+panel is byte-identical to the serial path.
+"""
+
+import json
+
+import numpy as np
+
+from stage1.ingestion.price_panel import PricePanel
+from stage1.quant.parallel import map_panel_shards
+from stage1.quant.quant_engine import run_quant_analysis
+from stage1.quant.tail_risk import tail_risk_panel
+from stage1.quant.volatility_regime import volatility_regime_panel
+
+
+def _panel():
+    rng = np.random.default_rng(12)
+    values = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (140, 23)), axis=0))
+    values[:50, 5] = np.nan
+    return PricePanel(np.arange(140), [f"A{i}" for i in range(23)], values)
+
+
+def test_sharded_quant_matches_serial():
+    panel = _panel()
+
+    serial = run_quant_analysis(panel)
+    sharded = run_quant_analysis(panel, workers=3)
+
+    assert json.dumps(serial, sort_keys=False) == json.dumps(sharded, sort_keys=False)
+
+
+def test_sharded_modules_match_serial():
+    panel = _panel()
+
+    assert map_panel_shards(tail_risk_panel, panel, 4) == tail_risk_panel(panel)
+    assert map_panel_shards(
+        volatility_regime_panel, panel, 4, realized_window=20, ema_window=60
+    ) == volatility_regime_panel(panel, 20, 60)
@@ -0,0 +1,53 @@
+"""
+Price Z-Score Equivalence
+
+Verifies the shared prefix-sum kernel against the per-horizon
+statistics reference, for the latest value and the full history.
+"""
+
+import statistics
+
+import numpy as np
+
+from stage1.ingestion.price_panel import PricePanel
+from stage1.quant.price_zscore import (
+    CANON_HORIZONS,
+    price_zscore_history,
+    price_zscore_signal,
+)
+
+
+def _reference(series, horizons):
+    scores = []
+    for h in horizons:
+        if len(series) <= h:
+            continue
+        window = series[-(h + 1):]
+        stdev = statistics.pstdev(window[:-1])
+        if stdev == 0:
+            continue
+        z = (window[-1] - statistics.mean(window[:-1])) / stdev
+        scores.append(min(max(abs(z) / 4.0, 0.0), 1.0))
+    return sum(scores) / len(scores) if scores else 0.0
+
+
+def test_latest_and_history_match_reference():
+    rng = np.random.default_rng(9)
+    prices = {
+        "A": list(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 120)))),
+        "B": list(50 * np.exp(np.cumsum(rng.normal(0, 0.01, 40)))),
+        "FLAT": [10.0] * 30,
+    }
+
+    for series in prices.values():
+        assert np.isclose(
+            price_zscore_signal(series, CANON_HORIZONS),
+            _reference(series, CANON_HORIZONS),
+            rtol=1e-8,
+        )
+
+    history = price_zscore_history(PricePanel.from_lists(prices))
+    series = prices["A"]
+    for t in (10, 61, 119):
+        assert np.isclose(history[t, 0], _reference(series[: t + 1], CANON_HORIZONS), rtol=1e-8)
+    assert np.isnan(history[0, 1])
@@ -0,0 +1,54 @@
+"""
+Quant Engine Regime Equivalence
+
+Verifies the vectorized whole-panel regime pass reproduces the
+per-asset pandas rolling computation it replaced.
+"""
+
+import numpy as np
+import pandas as pd
+
+from stage1.quant.quant_engine import run_quant_analysis
+
+
+def _reference_regime(r: pd.Series, w: int) -> dict:
+    if len(r) < w:
+        return {"valid": False}
+
+    rw = r.rolling(w)
+    mean = rw.mean().iloc[-1]
+    return {
+        "valid": True,
+        "mean": float(mean),
+        "vol": float(rw.std().iloc[-1]),
+        "trend": int(np.sign(mean)),
+        "zscore": float((r.iloc[-1] - r.mean()) / (r.std() + 1e-9)),
+    }
+
+
+def test_regimes_match_pandas_reference():
+    rng = np.random.default_rng(7)
+    prices = {
+        f"A{i}": list(100 * np.exp(np.cumsum(rng.normal(0, 0.02, n))))
+        for i, n in enumerate([60, 61, 90, 130, 200])
+    }
+
+    result = run_quant_analysis(prices)["per_asset"]
+
+    for ticker, series in prices.items():
+        r = pd.Series(series).pct_change().dropna()
+        regimes = result[ticker]["regimes"]
+
+        for w in [5, 20, 60]:
+            expected = _reference_regime(r, w)
+            actual = regimes[f"{w}d"]
+
+            assert actual.keys() == expected.keys()
+            assert actual["valid"] == expected["valid"]
+            if expected["valid"]:
+                assert actual["trend"] == expected["trend"]
+                for key in ("mean", "vol", "zscore"):
+                    assert np.isclose(actual[key], expected[key], rtol=1e-9, atol=1e-12)
+
+        trends = {v["trend"] for v in regimes.values() if v["valid"]}
+        assert result[ticker]["trend_break"] == (len(trends) > 1)
@@ -0,0 +1,44 @@
+"""
+Signal Registry
+
+Verifies the shared-intermediate pipeline reproduces the standalone
+module outputs and the scalar Q aggregation per asset.
+"""
+
+import numpy as np
+
+from stage1.ingestion.price_panel import PricePanel
+from stage1.quant.mean_reversion import mean_reversion_signal
+from stage1.quant.price_zscore import CANON_HORIZONS, price_zscore_signal
+from stage1.quant.signal_registry import KERNELS, run_signal_pipeline
+from stage1.quant.volatility_regime import volatility_regime_signal
+from stage1.synthesis.quant_aggregate import aggregate_q
+
+
+def test_pipeline_matches_standalone_modules():
+    rng = np.random.default_rng(4)
+    prices = {
+        f"A{i}": list(100 * np.exp(np.cumsum(rng.normal(0, 0.015, n))))
+        for i, n in enumerate([130, 130, 70, 130])
+    }
+
+    out = run_signal_pipeline(PricePanel.from_lists(prices))
+
+    assert set(out["timings"]) == set(KERNELS)
+
+    for ticker, series in prices.items():
+        asset = out["per_asset"][ticker]
+        components = asset["components"]
+
+        assert np.isclose(components["Q_price"], price_zscore_signal(series, CANON_HORIZONS))
+        assert np.isclose(components["Q_mr"], mean_reversion_signal(series, 60))
+
+        if len(series) > 81:
+            assert np.isclose(components["Q_vol"], volatility_regime_signal(series, 20, 60))
+        else:
+            assert components["Q_vol"] is None
+
+        present = {k: v for k, v in components.items() if v is not None}
+        assert np.isclose(asset["q"], aggregate_q(present))
+
+    assert out["per_asset"]["A2"]["components"]["Q_corr"] is None
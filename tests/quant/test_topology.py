@@ -0,0 +1,40 @@
+"""
+Sparse Topology Equivalence
+
+Verifies clusters and neighbour lists against the dense correlation
+matrix, and that the NTI topology bonus is unchanged.
+"""
+
+import numpy as np
+
+from stage1.quant.topology import sparse_topology
+
+
+def test_matches_dense_threshold_graph():
+    rng = np.random.default_rng(8)
+    base = rng.normal(0, 0.01, (120, 3))
+    returns = np.column_stack([
+        base[:, 0], base[:, 0] + rng.normal(0, 0.002, 120),
+        base[:, 1], base[:, 1] * -1 + rng.normal(0, 0.002, 120),
+        base[:, 0] + rng.normal(0, 0.003, 120),
+        base[:, 2], np.zeros(120),
+    ])
+    tickers = list("ABCDEFG")
+
+    topo = sparse_topology(returns, tickers, top_k=1, block_rows=3)
+
+    assert topo["clusters"] == [["A", "B", "E"], ["C", "D"]]
+
+    dense = np.corrcoef(returns[:, :6].T)
+    np.fill_diagonal(dense, 0.0)
+    for i, t in enumerate(tickers[:6]):
+        linked = np.abs(dense[i]) > 0.6
+        if linked.any():
+            j = int(np.argmax(np.abs(dense[i])))
+            assert topo["neighbours"][t] == [[tickers[j], round(float(dense[i, j]), 6)]]
+        else:
+            assert topo["neighbours"][t] == []
+
+    # Legacy bonus: assets with (|corr| > 0.6) degree ≥ 2 including self
+    legacy = int(((np.abs(dense) > 0.6).sum(axis=1) >= 1).sum())
+    assert legacy == sum(len(c) for c in topo["clusters"])
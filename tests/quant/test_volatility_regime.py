@@ -0,0 +1,50 @@
+"""
+Volatility Regime Equivalence
+
+Verifies the prefix-sum realized-vol kernel and vectorized EMA
+against the per-window statistics.pstdev reference.
+"""
+
+import math
+import statistics
+
+import numpy as np
+
+from stage1.quant.volatility_regime import (
+    volatility_regime_panel,
+    volatility_regime_signal,
+)
+
+
+def _reference(prices, realized_window, ema_window):
+    if len(prices) <= max(realized_window, ema_window) + 1:
+        return 0.0
+    r = [math.log(prices[i] / prices[i - 1]) for i in range(1, len(prices))]
+    if len(r) <= realized_window:
+        return 0.0
+    vols = [statistics.pstdev(r[i - realized_window:i]) for i in range(realized_window, len(r))]
+    if len(vols) < ema_window:
+        return 0.0
+    alpha = 2 / (ema_window + 1)
+    ema = vols[-ema_window]
+    for v in vols[-ema_window + 1:]:
+        ema = alpha * v + (1 - alpha) * ema
+    return min(max(abs(vols[-1] - ema) / ema, 0.0), 1.0)
+
+
+def test_matches_reference_and_flags_regimes():
+    rng = np.random.default_rng(2)
+    prices = {}
+    for i, n in enumerate([50, 81, 82, 130, 200]):
+        scale = np.where(np.arange(n) > n - 15, 0.05, 0.01)
+        prices[f"A{i}"] = list(100 * np.exp(np.cumsum(rng.normal(0, 1, n) * scale)))
+
+    panel = volatility_regime_panel(prices, realized_window=20, ema_window=60)
+
+    for ticker, series in prices.items():
+        expected = _reference(series, 20, 60)
+        assert np.isclose(volatility_regime_signal(series, 20, 60), expected, rtol=1e-9, atol=1e-12)
+        assert np.isclose(panel[ticker]["signal"], expected, rtol=1e-9, atol=1e-12)
+
+    assert panel["A0"]["regime"] is None
+    assert panel["A4"]["regime"] == "expansion"
@@ -0,0 +1,90 @@
+"""
+Threshold Sweep Equivalence
+
+Verifies the broadcast sweeps against per-configuration scalar
+replays of the threshold model and of the NTI trigger.
+"""
+
+import numpy as np
+import pandas as pd
+
+from stage1.synthesis.calibration import flatten_thresholds, sweep_thresholds, sweep_trigger
+from stage1.synthesis.nti import nti_scores
+from utils.io import load_yaml_config
+
+
+def _reference(q_hist, n_hist, cfg):
+    def norm(v, lo, hi):
+        return min(max((v - lo) / (hi - lo), 0.0), 1.0)
+
+    persistence, triggers, runs = 0, [], []
+    for q_raw, n_raw in zip(q_hist, n_hist):
+        q = norm(q_raw, cfg["quant.min"], cfg["quant.max"])
+        n = norm(n_raw, cfg["nlp.min"], cfg["nlp.max"])
+
+        qualified = q >= cfg["quant.qualify_min"] and n >= cfg["nlp.qualify_min"]
+        persistence = persistence + 1 if qualified else 0
+
+        p = min(persistence, cfg["persistence.max"]) / cfg["persistence.max"]
+        score = (
+            cfg["weights.quant"] * q
+            + cfg["weights.nlp"] * n
+            + cfg["weights.persistence"] * p
+        )
+        triggers.append(score >= cfg["trigger_threshold"] and persistence >= cfg["required_persistence"])
+        runs.append(persistence)
+
+    return np.array(triggers), np.array(runs)
+
+
+def test_sweep_matches_scalar_model():
+    rng = np.random.default_rng(5)
+    q_hist = np.clip(0.04 + 0.03 * np.sin(np.arange(300) / 11) + rng.normal(0, 0.01, 300), 0, None)
+    n_hist = rng.uniform(0.3, 0.9, 300)
+
+    grid = {
+        "weights.quant": [0.35, 0.45],
+        "quant.qualify_min": [0.4, 0.6],
+        "nlp.qualify_min": [0.45, 0.55],
+        "trigger_threshold": [0.6, 0.75],
+        "required_persistence": [1, 3],
+    }
+    base = load_yaml_config("config/nt_thresholds.yaml")
+
+    frame = sweep_thresholds(q_hist, n_hist, grid, chunk=5)
+    assert len(frame) == 32
+    assert frame["trigger_rate"].max() > 0
+
+    flat = flatten_thresholds(base)
+    for _, row in frame.iterrows():
+        cfg = {**flat, **{k: row[k] for k in grid}}
+        triggers, runs = _reference(q_hist, n_hist, cfg)
+
+        assert np.isclose(row["trigger_rate"], triggers.mean())
+        assert row["trigger_episodes"] == np.sum(triggers & ~np.r_[False, triggers[:-1]])
+        assert row["max_persistence"] == runs.max()
+        assert np.isclose(row["mean_persistence"], runs.mean())
+
+
+def test_trigger_sweep_matches_nti_trigger():
+    rng = np.random.default_rng(6)
+    levels = np.cumsum(rng.normal(0, 1, (3, 250)), axis=1) + 3
+    penalties = rng.integers(0, 2, 250).astype(float)
+    scores = nti_scores(levels[0], levels[1], levels[2], penalties, 0.0)
+    backtest = pd.DataFrame({k: scores[k] for k in ("nti", "delta", "delta2")})
+
+    grid = {"nti_trigger": [0.0, 2.0, 4.0], "required_persistence": [1, 2, 3]}
+    frame = sweep_trigger(backtest, grid)
+    assert len(frame) == 9
+
+    for _, row in frame.iterrows():
+        raw = nti_scores(levels[0], levels[1], levels[2], penalties, 0.0, row["nti_trigger"])["trigger"]
+        runs, run = [], 0
+        for t in raw:
+            run = run + 1 if t else 0
+            runs.append(run)
+        persistent = np.array(runs) >= row["required_persistence"]
+
+        assert np.isclose(row["qualify_rate"], raw.mean())
+        assert np.isclose(row["trigger_rate"], persistent.mean())
+        assert row["max_persistence"] == max(runs)
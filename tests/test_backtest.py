@@ -0,0 +1,61 @@
+"""
+Backtest Equivalence
+
+Verifies the walk-forward replay reproduces compute_nti on each
+date's trailing analysis window, and the persistence counter.
+"""
+
+import numpy as np
+
+from stage1.backtest import run_backtest
+from stage1.ingestion.price_panel import PricePanel
+from stage1.nlp.nlp_engine import run_nlp_analysis
+from stage1.quant.quant_engine import run_quant_analysis
+from stage1.synthesis.nti import compute_nti
+from utils.math import run_length
+
+
+LOOKBACK = 80
+
+
+def _panel():
+    rng = np.random.default_rng(3)
+    T, N = 260, 14
+    common = rng.normal(0, 0.02, (T, 1))
+    noise = rng.normal(0, 0.02, (T, N))
+    loading = np.r_[np.full(6, 1.5), np.zeros(N - 6)]
+    values = 100 * np.exp(np.cumsum(common * loading + noise, axis=0))
+    values[:150, -1] = np.nan  # late listing
+    return PricePanel(np.arange(T), [f"A{i:02d}" for i in range(N)], values)
+
+
+def _snapshot(panel, nlp, t):
+    start = max(0, t - LOOKBACK + 1)
+    window = PricePanel(
+        panel.dates[start:t + 1], panel.tickers, panel.values[start:t + 1]
+    )
+    market = {ticker: {"status": "ok"} for ticker in panel.tickers}
+    return compute_nti(run_quant_analysis(window), nlp, market, price_panel=window)
+
+
+def test_backtest_matches_snapshot_runs():
+    panel = _panel()
+    nlp = run_nlp_analysis([{"ticker": t} for t in panel.tickers])
+
+    frame = run_backtest(panel, nlp, lookback=LOOKBACK, required_persistence=3)
+
+    # Late asset ineligible (t < 209) or complete over the window (t ≥ 229)
+    for t in [0, 30, 59, 61, 79, 80, 120, 208, 229, 259]:
+        expected = _snapshot(panel, nlp, t)
+        row = frame.iloc[t]
+
+        for key in ("nti", "nti_short", "nti_medium", "nti_long", "delta", "delta2", "confidence"):
+            assert row[key] == expected[key], (t, key)
+        for flag, value in expected["regime_flags"].items():
+            assert row[flag] == value, (t, flag)
+
+
+def test_persistence_counts_consecutive_triggers():
+    trigger = np.array([0, 1, 1, 0, 1, 1, 1, 1, 0, 0, 1], dtype=bool)
+
+    assert run_length(trigger).tolist() == [0, 1, 2, 0, 1, 2, 3, 4, 0, 0, 1]
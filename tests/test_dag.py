@@ -0,0 +1,112 @@
+"""
+Stage Graph Executor
+
+Verifies that independent stages overlap on threads and processes,
+that the critical path is the longest duration chain, that invalid
+graphs and stage failures are raised, that the runner applies
+sentiment stress once prices arrive without holding NLP back, and
+that it feeds the topic model for narrative conflict.
+"""
+
+from datetime import timedelta
+import time
+
+import pandas as pd
+import pytest
+
+from stage1.dag import PROCESS, StageGraph
+from stage1.nlp.topics import TopicModel
+from stage1.runner import run_pipeline
+from tests.test_sharding import FakeDownloader
+
+
+def _sleep_then(value, seconds):
+    def stage(*_):
+        time.sleep(seconds)
+        return value
+
+    return stage
+
+
+def _square(x):
+    return x * x
+
+
+def test_independent_stages_overlap_and_critical_path():
+    graph = (
+        StageGraph()
+        .add("prices", _sleep_then("P", 0.3), ["universe"])
+        .add("nlp", _sleep_then("N", 0.3), ["universe"])
+        .add("quant", _sleep_then("Q", 0.1), ["prices"])
+        .add("nti", lambda q, n, p: q + n + p, ["quant", "nlp", "prices"])
+    )
+    results, report = graph.run({"universe": ["AAA"]})
+    assert results["nti"] == "QNP"
+
+    # prices and nlp ran concurrently: each started before the other ended
+    stages = report["stages"]
+    assert stages["nlp"]["start_s"] < stages["prices"]["end_s"]
+    assert stages["prices"]["start_s"] < stages["nlp"]["end_s"]
+
+    # Dependents start only after their inputs end
+    assert stages["quant"]["start_s"] >= stages["prices"]["end_s"]
+    assert stages["nti"]["start_s"] >= max(stages[s]["end_s"] for s in ("quant", "nlp", "prices"))
+
+    assert report["critical_path"] == ["prices", "quant", "nti"]
+    assert report["critical_path_s"] == pytest.approx(
+        sum(stages[s]["duration_s"] for s in report["critical_path"]), abs=1e-3
+    )
+
+
+def test_process_stages_and_invalid_graphs():
+    graph = StageGraph().add("square", _square, ["seed"], kind=PROCESS)
+    graph.add("cube", lambda s, x: s * x, ["square", "seed"])
+    assert graph.run({"seed": 3})[0]["cube"] == 27
+
+    cyclic = StageGraph().add("a", _square, ["b"]).add("b", _square, ["a"])
+    with pytest.raises(ValueError, match="cycle"):
+        cyclic.run()
+
+    with pytest.raises(ValueError, match="unknown inputs"):
+        StageGraph().add("a", _square, ["missing"]).run()
+
+    def fail(_):
+        raise RuntimeError("download failed")
+
+    failing = StageGraph().add("prices", fail, ["universe"]).add("quant", _square, ["prices"])
+    with pytest.raises(RuntimeError, match="download failed"):
+        failing.run({"universe": []})
+
+
+def test_runner_stress_stage_follows_prices():
+    universe = [{"ticker": "T01", "asset_name": "Tango One"}, {"ticker": "T02"}]
+    documents = ["$T01 shares surge on strong growth", "Tango One weak outlook, stock drops", "$T02 flat"]
+
+    result = run_pipeline(universe, downloader=FakeDownloader(), documents=documents)
+    stages = result["dag"]["stages"]
+
+    assert stages["stress"]["start_s"] >= stages["prices"]["end_s"]
+    assert stages["stress"]["start_s"] >= stages["nlp"]["end_s"]
+    assert "stress" in result["nlp"]["per_asset"]["T01"]
+    assert result["nlp"]["per_asset"]["T01"]["mentions"] == 2
+    assert "stress" not in run_pipeline(universe, downloader=FakeDownloader())["nlp"]["per_asset"]["T01"]
+
+
+def test_runner_feeds_topic_model_for_conflict():
+    universe = [{"ticker": "T01"}, {"ticker": "T02"}]
+    today = pd.Timestamp.now(tz="UTC").date()
+
+    model = TopicModel(k=3)
+    model.update(
+        today - timedelta(days=10),
+        ["$T01 quarterly earnings beat revenue guidance", "$T01 profit margin outlook raised",
+         "$T02 central bank rates hike", "$T02 treasury yields rise on inflation"],
+        [["T01"], ["T01"], ["T02"], ["T02"]],
+    )
+    documents = ["$T01 regulator lawsuit fraud probe", "$T01 court settlement investigation",
+                 "$T02 central bank policy rates inflation"]
+
+    nlp = run_pipeline(universe, downloader=FakeDownloader(), documents=documents, topic_model=model)["nlp"]
+
+    assert model.day == today
+    assert nlp["per_asset"]["T01"]["conflict"] > nlp["per_asset"]["T02"]["conflict"]
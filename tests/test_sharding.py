@@ -0,0 +1,170 @@
+"""
+Sharded Stage 1 Equivalence
+
+Verifies plan → run (per shard) → merge reproduces the single-job
+pipeline: identical quant, NLP and NTI outputs, and Q components
+equal up to rounding, also when the run has documents, a corpus and
+burst / topic state (the merged state matches the single job's).
+"""
+
+from collections import Counter
+from datetime import timedelta
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stage1.nlp.burst import BurstDetector
+from stage1.nlp.corpus_store import CorpusStore
+from stage1.nlp.entity_linker import get_linker
+from stage1.nlp.topics import TopicModel
+from stage1.runner import run_pipeline
+from stage1.sharding import merge_nlp_state, merge_shards, plan_shards, run_shard, shard_dir
+
+
+DATES = pd.bdate_range("2024-01-01", periods=130)
+TODAY = pd.Timestamp.now(tz="UTC").date()
+WORDS = (
+    "strong growth rally gain surge weak loss drop decline crash earnings "
+    "lawsuit rates guidance merger probe yields dividend outlook margin"
+).split()
+
+
+class FakeDownloader:
+    def __call__(self, tickers, **kwargs):
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        frames = {}
+        for t in tickers:
+            if t == "MISS":
+                continue
+            seed = sum(map(ord, t))
+            rng = np.random.default_rng(seed)
+            drift = 0.01 * np.sin(np.arange(len(DATES)) / 9.0)
+            close = 100 * np.exp(np.cumsum(drift + rng.normal(0, 0.02, len(DATES))))
+            # Stagger listing dates so the date union matters
+            close[: seed % 40] = np.nan
+            frames[(t, "Close")] = close
+        columns = pd.MultiIndex.from_tuples(list(frames))
+        return pd.DataFrame(frames, index=DATES, columns=columns)
+
+
+def _universe():
+    names = [f"T{i:02d}" for i in range(17)] + ["MISS"]
+    return [{"ticker": t} for t in names]
+
+
+def test_sharded_run_matches_single_job(tmp_path):
+    universe = _universe()
+    fake = FakeDownloader()
+
+    single = run_pipeline(universe, downloader=fake)
+
+    manifest = plan_shards(universe, 4, tmp_path)
+    for i in range(manifest["shards"]):
+        run_shard(tmp_path, i, downloader=fake)
+    merged = merge_shards(tmp_path)
+
+    assert merged["panel"].tickers == single["panel"].tickers
+    np.testing.assert_array_equal(merged["panel"].dates, single["panel"].dates)
+    np.testing.assert_array_equal(merged["panel"].values, single["panel"].values)
+
+    for key in ("market", "quant", "nlp", "nti"):
+        assert json.dumps(merged[key]) == json.dumps(single[key]), key
+
+    for t, expected in single["signals"]["per_asset"].items():
+        actual = merged["signals"]["per_asset"][t]
+        assert np.isclose(actual["q"], expected["q"], rtol=1e-12)
+        for name, value in expected["components"].items():
+            if value is None:
+                assert actual["components"][name] is None
+            else:
+                assert np.isclose(actual["components"][name], value, rtol=1e-12)
+
+
+def _documents(rng, n):
+    tickers = [f"T{i:02d}" for i in range(17)]
+    return [
+        f"${t} " + " ".join(rng.choice(WORDS, size=10))
+        for t in rng.choice(tickers, size=n)
+    ]
+
+
+def _history(universe):
+    """
+    Twelve prior days of documents with their linked entities.
+    """
+    rng = np.random.default_rng(7)
+    linker = get_linker(universe)
+    days = []
+    for back in range(12, 0, -1):
+        docs = _documents(rng, 30)
+        days.append((TODAY - timedelta(days=back), docs, linker.link(docs)))
+    return days
+
+
+def _state(history):
+    detector, model = BurstDetector(), TopicModel(k=3)
+    for day, docs, linked in history:
+        detector.update(day, Counter(e for entities in linked for e in entities))
+        model.update(day, docs, linked)
+    return detector, model
+
+
+@pytest.mark.parametrize("with_corpus", [False, True])
+def test_sharded_run_with_documents_matches_single_job(tmp_path, with_corpus):
+    universe = _universe()
+    fake = FakeDownloader()
+    history = _history(universe)
+    documents = _documents(np.random.default_rng(8), 40)
+
+    corpus = None
+    if with_corpus:
+        corpus = CorpusStore(tmp_path / "corpus")
+        for day, docs, linked in history + [(TODAY, documents, get_linker(universe).link(documents))]:
+            corpus.append(docs, [f"{day.isoformat()}T12:00:00Z"] * len(docs), linked)
+
+    def state():
+        return (BurstDetector(), TopicModel(k=3)) if with_corpus else _state(history)
+
+    detector, model = state()
+    single = run_pipeline(
+        universe, downloader=fake, corpus=corpus, documents=documents,
+        burst_detector=detector, topic_model=model,
+    )
+    fields = {k for values in single["nlp"]["per_asset"].values() for k in values}
+    assert {"mentions", "stress", "burst", "conflict"} <= fields
+    if with_corpus:
+        assert {"relevance", "sentiment"} <= fields
+
+    out = tmp_path / "shards"
+    manifest = plan_shards(universe, 4, out)
+    for i in range(manifest["shards"]):
+        shard_detector, shard_model = state()
+        run_shard(
+            out, i, downloader=fake, corpus=corpus, documents=documents,
+            burst_detector=shard_detector, topic_model=shard_model,
+        )
+    merged = merge_shards(out)
+
+    for key in ("market", "quant", "nlp", "nti"):
+        assert json.dumps(merged[key]) == json.dumps(single[key]), key
+
+    # One recombined state, as if a single job had advanced it
+    merged_detector, merged_model = merge_nlp_state(out)
+    tickers = [u["ticker"] for u in universe]
+    expected, actual = detector.scores(), merged_detector.scores()
+    assert {t: actual.get(t) for t in tickers} == {t: expected.get(t) for t in tickers}
+    expected, actual = model.conflict(), merged_model.conflict()
+    assert {t: actual.get(t) for t in tickers} == {t: expected.get(t) for t in tickers}
+
+
+def test_merge_rejects_missing_shard(tmp_path):
+    plan_shards(_universe(), 3, tmp_path)
+    run_shard(tmp_path, 0, downloader=FakeDownloader())
+    run_shard(tmp_path, 2, downloader=FakeDownloader())
+
+    with pytest.raises(RuntimeError, match="shard 1"):
+        merge_shards(tmp_path)
+
+    assert not shard_dir(tmp_path, 1).exists()
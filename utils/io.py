@@ -15,8 +15,6 @@ from typing import Any, Dict
 from datetime import datetime
 import uuid
 
-from utils.state import save_last_run_id
-
 
 # -------------------------
 # Internal helpers
@@ -151,4 +149,7 @@ def write_trigger_context(
         json.dump(context, f, indent=2)
 
     # HARD LINKAGE: persist run_id for auditability
+    # (imported here: utils.state requires Supabase credentials)
+    from utils.state import save_last_run_id
+
     save_last_run_id(run_id)
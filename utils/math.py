@@ -15,3 +15,77 @@ def safe_mean(values: Iterable[float]) -> float:
 
 def clip(value: float, low: float = 0.0, high: float = 1.0) -> float:
     return float(np.clip(value, low, high))
+
+
+# Relative tolerance below which a column's spread counts as zero variance
+ZERO_VARIANCE_RTOL = 1e-12
+
+
+def standardize_columns(window: np.ndarray):
+    """
+    Center and scale each column to unit norm.
+
+    Returns:
+        (Z, valid) where Z.T @ Z is the correlation matrix and
+        valid marks columns with non-zero variance
+    """
+    centered = window - window.mean(axis=0)
+    norm = np.sqrt((centered ** 2).sum(axis=0))
+
+    scale = np.abs(window).max(axis=0, initial=0.0) * np.sqrt(len(window))
+    valid = norm > ZERO_VARIANCE_RTOL * scale
+
+    z = np.divide(centered, norm, out=np.zeros_like(centered), where=valid)
+    return z, valid
+
+
+def run_length(flags: np.ndarray, axis: int = -1) -> np.ndarray:
+    """
+    Length of the run of consecutive True values ending at each
+    position along `axis` (0 where the flag is False).
+    """
+    flags = np.asarray(flags, dtype=bool)
+    runs = np.cumsum(flags, axis=axis)
+    resets = np.maximum.accumulate(np.where(flags, 0, runs), axis=axis)
+    return runs - resets
+
+
+def find_roots(parent: np.ndarray) -> np.ndarray:
+    """
+    Fully compress a parent-pointer forest by pointer jumping.
+    """
+    while True:
+        grand = parent[parent]
+        if np.array_equal(grand, parent):
+            return parent
+        parent = grand
+
+
+def union_edges(parent: np.ndarray, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+    """
+    Vectorized union of edge endpoints; every root points at the
+    smallest index in its component.
+    """
+    while len(i):
+        parent = find_roots(parent)
+        ri, rj = parent[i], parent[j]
+        pending = ri != rj
+        if not pending.any():
+            break
+        lo = np.minimum(ri, rj)[pending]
+        hi = np.maximum(ri, rj)[pending]
+        np.minimum.at(parent, hi, lo)
+        i, j = i[pending], j[pending]
+    return parent
+
+
+def mix64(x: np.ndarray) -> np.ndarray:
+    """
+    SplitMix64 finalizer over uint64 arrays (wrapping arithmetic):
+    a deterministic, well-mixed 64-bit hash of each value.
+    """
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))